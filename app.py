@@ -1,19 +1,44 @@
 from flask_cors import CORS
-from flask_mysqldb import MySQL
-from werkzeug.security import check_password_hash
+from db_pool import PooledMySQL
+from werkzeug.security import generate_password_hash
+from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required
-from cloudinary.uploader import upload as cloudinary_upload
-from cloudinary.exceptions import Error as CloudinaryError
 import uuid
-from reciptGen import create_invoice_in_memory
+from reciptGen import write_invoices_pdf, stream_invoice_zip, INVOICE_LAYOUT_VERSION
+from invoice_cache import InvoiceCache
+from invoice_pool import InvoiceRenderPool, InvoicePoolFull
+from catalog_cache import CatalogCache
+from catalog_query import build_catalog_query, catalog_page, CatalogQueryError
+from order_summary import build_dashboard_query, dashboard_cursor, DashboardQueryError
+from order_details import (
+    build_details_query, build_tracking_query, build_invoice_batch_query, build_invoice_batch_count_query,
+    OrderDetailsQueryError,
+)
+from order_groups import parse_group_args, build_status_query, build_count_query, build_pages_query, group_orders, OrderGroupQueryError
+from keyset import encode_cursor
+from batches import assign_orders, move_orders, list_batches, BatchError, UNBATCHED
+from outbox import record_status_change, sink_from_config, OutboxDispatcher
+from tracking_cache import TrackingCache
+import metrics
+from auth import AdminCache, LoginLimiter, needs_rehash, verify_password, rehash_password
+from storage import storage_from_config
+from image_uploads import ImageUploader, UploadQueueFull, spool_upload, PENDING, FAILED
+from images import check_image, srcset, variant_file_ids, ImageProcessingError
+from product_import import ProductImporter, read_rows, detect_format, export_rows, EXPORT_SQL
+from product_delete import delete_products, delete_files, queue_for_reconciliation, drain_reconciliation
 from datetime import datetime
-from cloudinary.api import delete_resources
 from datetime import datetime, timedelta
 from datetime import datetime
 from dotenv import load_dotenv
 import platform
+import tempfile
+import zipfile
 import os
-from flask import Flask, request, jsonify, send_file
+import hmac
+from itertools import groupby, chain
+from io import BytesIO
+from MySQLdb.cursors import SSCursor
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
 
 load_dotenv()
 
@@ -28,20 +53,126 @@ app.config['MYSQL_PASSWORD'] = os.getenv('MYSQL_PASSWORD')
 app.config['MYSQL_DB'] = os.getenv('MYSQL_DB')
 app.config['MYSQL_PORT'] = int(os.getenv('MYSQL_PORT'))  # Cast port to integer
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY')
-cloudinary_config = {
-    "api_key": os.getenv("CLOUDINARY_API_KEY"),
-    "api_secret": os.getenv("CLOUDINARY_API_SECRET"),
-    "cloud_name": os.getenv("CLOUDINARY_CLOUD_NAME"),
-}
 
-# Initialize Backblaze B2 bucket (pseudo-code)
-
-
-application_key_id = os.getenv("B2_KEY_ID")
-application_key = os.getenv("B2_APPLICATION_KEY")
+mysql = PooledMySQL(app)
+# Every statement on a pooled connection is timed into db_query_duration_seconds
+mysql.pool.query_observer = metrics.observe_query
+
+# Rendered invoice cache (memory LRU, optionally written through to disk)
+invoice_cache = InvoiceCache(
+    max_bytes=int(os.getenv("INVOICE_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+    disk_dir=os.getenv("INVOICE_CACHE_DIR"),
+    version=INVOICE_LAYOUT_VERSION,
+)
+INVOICE_CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
+# Invoice rendering runs in a bounded process pool so bursts don't starve other routes
+invoice_pool = InvoiceRenderPool(
+    max_workers=int(os.getenv("INVOICE_POOL_SIZE", 2)),
+    max_queue=int(os.getenv("INVOICE_QUEUE_DEPTH", 8)),
+    timeout=float(os.getenv("INVOICE_RENDER_TIMEOUT", 30)),
+)
+INVOICE_RETRY_AFTER = os.getenv("INVOICE_RETRY_AFTER", "5")
+# A multi-page PDF is held by ReportLab until it's saved; larger exports use the ZIP format
+INVOICE_BATCH_PDF_MAX_ORDERS = int(os.getenv("INVOICE_BATCH_PDF_MAX_ORDERS", 200))
+
+# Status-change events are drained from the outbox table by a background thread
+outbox_dispatcher = None
+if os.getenv("OUTBOX_SINKS"):
+    outbox_dispatcher = OutboxDispatcher(
+        mysql.pool,
+        [sink_from_config(value.strip()) for value in os.getenv("OUTBOX_SINKS").split(",")],
+        batch_size=int(os.getenv("OUTBOX_BATCH_SIZE", 100)),
+        interval=float(os.getenv("OUTBOX_POLL_INTERVAL", 1.0)),
+    )
+
+    @app.before_request
+    def start_outbox_dispatcher():
+        # Started lazily so each (forked) worker process runs its own thread
+        outbox_dispatcher.ensure_running()
+
+# Serialized /api/orders/tracking responses, invalidated by the status-update routes
+tracking_cache = TrackingCache(
+    maxsize=int(os.getenv("TRACKING_CACHE_SIZE", 10000)),
+    ttl=int(os.getenv("TRACKING_CACHE_TTL", 10)),
+)
+
+# Serialized /api/product-list body, invalidated by the product write routes
+catalog_cache = CatalogCache(ttl=int(os.getenv("CATALOG_CACHE_TTL", 30)))
+
+# Image storage (Cloudinary, S3/B2 or local disk), chosen by STORAGE_BACKEND
+storage = storage_from_config()
+storage.observer = metrics.observe_storage
+
+# Product images are uploaded in the background after the row is written
+image_uploader = ImageUploader(
+    mysql.pool,
+    storage,
+    max_workers=int(os.getenv("IMAGE_UPLOAD_WORKERS", 2)),
+    max_queue=int(os.getenv("IMAGE_UPLOAD_QUEUE_DEPTH", 32)),
+    retries=int(os.getenv("IMAGE_UPLOAD_RETRIES", 3)),
+    backoff=float(os.getenv("IMAGE_UPLOAD_BACKOFF", 1.0)),
+    on_complete=lambda product_id: catalog_cache.invalidate(),
+)
+IMAGE_SPOOL_DIR = os.getenv("IMAGE_SPOOL_DIR")
+
+# Login: cached admin records, bounded attempt limiter and the target hash cost
+admin_cache = AdminCache(ttl=int(os.getenv("ADMIN_CACHE_TTL", 60)))
+login_limiter = LoginLimiter(
+    ip_limit=int(os.getenv("LOGIN_IP_LIMIT", 20)),
+    ip_window=int(os.getenv("LOGIN_IP_WINDOW", 300)),
+    account_limit=int(os.getenv("LOGIN_ACCOUNT_LIMIT", 5)),
+    account_window=int(os.getenv("LOGIN_ACCOUNT_WINDOW", 900)),
+    maxsize=int(os.getenv("LOGIN_LIMITER_SIZE", 10000)),
+)
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+DUMMY_PASSWORD_HASH = generate_password_hash(uuid.uuid4().hex, method=PASSWORD_HASH_METHOD)
+
+# Behind the Heroku router every request arrives from the router's address, so
+# the client IP (which the login limiter keys on) comes from X-Forwarded-For.
+# PROXY_FIX_X_FOR is the number of proxies in front of the app; set it to 0 only
+# when clients connect directly, or they could spoof the header.
+PROXY_FIX_X_FOR = int(os.getenv("PROXY_FIX_X_FOR", 1))
+if PROXY_FIX_X_FOR:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_FIX_X_FOR)
+
+# Per-route latency histograms, slow-request logging and /metrics collectors
+metrics.init_app(app, slow_request_seconds=float(os.getenv("SLOW_REQUEST_MS", 1000)) / 1000)
+metrics.registry.register_collector(metrics.stats_collector("db_pool", "MySQL connection pool", mysql.pool.stats))
+metrics.registry.register_collector(metrics.storage_collector(storage))
+if outbox_dispatcher is not None:
+    metrics.registry.register_collector(metrics.stats_collector("outbox", "Outbox dispatcher", outbox_dispatcher.stats))
+# /metrics exposes route names, pool and queue sizes; it is off unless a scrape
+# token is configured, and then needs "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def reinit_after_fork():
+    """
+    Reset the per-process resources a worker inherits from a preloading parent
+    (gunicorn ``preload_app``): pooled connections, storage client, render and
+    upload executors. Then start the outbox thread and warm the pool so the
+    first requests don't pay for connecting.
+    """
+    mysql.pool.reinit()
+    storage.reinit()
+    invoice_pool.shutdown()
+    image_uploader.shutdown(wait=False)
+    if outbox_dispatcher is not None:
+        outbox_dispatcher.ensure_running()
+    try:
+        mysql.pool.warm()
+    except Exception as e:
+        print(f"Error warming the connection pool: {e}")
 
 
-mysql = MySQL(app)
+def shutdown_worker():
+    """Let queued image uploads finish and stop background work before a worker exits."""
+    image_uploader.shutdown(wait=True)
+    invoice_pool.shutdown()
+    if outbox_dispatcher is not None:
+        outbox_dispatcher.stop()
+    mysql.pool.close_all()
 
 # Google Drive API credentials file
 CREDENTIALS_FILE = '/etc/secrets/auth.json'
@@ -69,59 +200,82 @@ def health_check():
     }), 200
 
 
-@app.route('/login', methods=['POST'])
-def login():
-    data = request.json
-    username = data['email']
-    password = data['password']
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text exposition of this worker's metrics."""
+    if not METRICS_TOKEN:
+        return jsonify({'error': 'Not found'}), 404
+    expected = f"Bearer {METRICS_TOKEN}"
+    if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected.encode()):
+        return jsonify({'error': 'Unauthorized'}), 401
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
 
+def load_admin(email):
     cursor = mysql.connection.cursor()
-    cursor.execute('SELECT * FROM admins WHERE email = %s', (username,))
+    cursor.execute('SELECT id, email, password FROM admins WHERE email = %s', (email,))
     admin = cursor.fetchone()
     cursor.close()
+    return admin
 
-    if admin and check_password_hash(admin[2], password):
-    # Set the expiration time to 1 day
-        expires = timedelta(days=1)  # 1 day expiration
-
-        # Create the access token with the specified expiration
-        token = create_access_token(identity=admin[1], expires_delta=expires)
-        return jsonify({'token': token}), 200
 
-def delete_from_cloudinary(public_id):
-    try:
-        # Deletes the resource by its public_id
-        response = delete_resources(public_id)
-        print(f"Cloudinary Delete Response: {response}")
-        return response.get("deleted", {}).get(public_id) == "deleted"
-    except CloudinaryError as e:
-        print(f"Error deleting from Cloudinary: {e}")
-        return False
+@app.route('/login', methods=['POST'])
+def login():
+    data = request.json or {}
+    username = data.get('email')
+    password = data.get('password')
+    if not username or not password:
+        return jsonify({'error': 'Email and password are required'}), 400
+
+    client_ip = request.remote_addr or 'unknown'
+    retry_after = login_limiter.retry_after(client_ip, username)
+    if retry_after:
+        response = jsonify({'error': 'Too many login attempts, please try again later'})
+        response.headers['Retry-After'] = str(retry_after)
+        return response, 429
+
+    admin = admin_cache.get(username, load_admin)
+    if not verify_password(admin, password, DUMMY_PASSWORD_HASH):
+        login_limiter.record_failure(client_ip, username)
+        return jsonify({'error': 'Invalid email or password'}), 401
+
+    login_limiter.reset(username)
+    if needs_rehash(admin[2], PASSWORD_HASH_METHOD):
+        # Upgrade the stored hash to the current cost while we have the password
+        try:
+            cursor = mysql.connection.cursor()
+            password_hash = rehash_password(cursor, admin[0], password, PASSWORD_HASH_METHOD)
+            mysql.connection.commit()
+            cursor.close()
+            admin_cache.put(username, (admin[0], admin[1], password_hash))
+        except Exception as e:
+            print(f"Error rehashing password for admin {admin[0]}: {e}")
 
+    # Set the expiration time to 1 day
+    expires = timedelta(days=1)  # 1 day expiration
 
-def upload_image_to_storage(image_file):
-    """
-    Upload an image to Cloudinary or Backblaze B2 based on the configured storage type.
+    # Create the access token with the specified expiration
+    token = create_access_token(identity=admin[1], expires_delta=expires)
+    return jsonify({'token': token}), 200
 
-    Args:
-        image_file: The uploaded file from the request.
 
-    Returns:
-        tuple: (image_url, file_id) if successful, otherwise (None, None).
+def get_invoice_date(order):
+    """
+    Derive the invoice date from the order rather than the clock, so the same order
+    always produces the same invoice (and cache key).
     """
-  # Default to Cloudinary
+    if order.get('date_created'):
+        return str(order['date_created'])
 
-    try:
+    cursor = mysql.connection.cursor()
+    cursor.execute("SELECT date_created FROM orders WHERE order_id = %s", (str(order['id']),))
+    row = cursor.fetchone()
+    cursor.close()
 
-            response = cloudinary_upload(image_file, folder="dfootprint")
-            image_url = response.get("secure_url")
-            file_id = response.get("public_id")
-            print("cloudinary", image_url, file_id)
-            return image_url, file_id
+    if row and row[0]:
+        return row[0].strftime('%Y-%m-%d %H:%M:%S')
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-    except (CloudinaryError, Exception) as e:
-        print(f"Error uploading image to Cloundinary: {e}")
-        return None, None
 
 @app.route("/api/orders/invoice", methods=["POST"])
 def generate_invoice():
@@ -131,7 +285,7 @@ def generate_invoice():
 
         # Format the data for the invoice generator
         invoice_data = {
-            'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'date': get_invoice_date(order),
             'id': str(order['id']),  # Ensure the ID is a string
             'name': order['name'],
             'email': order['email'],
@@ -155,38 +309,205 @@ def generate_invoice():
         }
 
         order_id = str(order['id'])
-        # Format your data here if needed
-        pdf_buffer = create_invoice_in_memory(invoice_data)
+        cache_key = invoice_cache.key_for(invoice_data)
+
+        # The client already holds this exact invoice
+        if request.if_none_match.contains(cache_key):
+            response = Response(status=304)
+            response.set_etag(cache_key)
+            response.headers['Cache-Control'] = INVOICE_CACHE_CONTROL
+            response.headers['Access-Control-Expose-Headers'] = 'ETag'
+            return response
+
+        pdf = invoice_cache.get(cache_key)
+        if pdf is None:
+            # Only completed renders are timed; a full pool is counted separately
+            start = time.perf_counter()
+            pdf = invoice_pool.render(invoice_data)
+            metrics.invoice_render_seconds.observe(time.perf_counter() - start, "single")
+            invoice_cache.put(cache_key, pdf)
+
         response = send_file(
-            pdf_buffer,
+            BytesIO(pdf),
             as_attachment=True,
             download_name=f"Invoice_{order_id}.pdf",
-            mimetype='application/pdf'
+            mimetype='application/pdf',
+            etag=cache_key
         )
-        response.headers['Access-Control-Expose-Headers'] = 'Content-Disposition'
+        response.headers['Cache-Control'] = INVOICE_CACHE_CONTROL
+        response.headers['Access-Control-Expose-Headers'] = 'Content-Disposition, ETag'
         response.headers['Content-Disposition'] = f'attachment; filename="Invoice_{order_id}.pdf"'
         return response
 
+    except InvoicePoolFull:
+        metrics.invoice_rejections.inc("single")
+        response = jsonify({"error": "Invoice service is busy, please retry shortly."})
+        response.headers['Retry-After'] = INVOICE_RETRY_AFTER
+        return response, 503
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 
+def build_invoice_data(order_id, date_created, lines):
+    """
+    Build invoice data for an order from its `track` rows.
+
+    The total is what the `track` rows charged. No tax or delivery details are
+    stored with an order, so the invoice leaves them out rather than guessing.
+
+    Args:
+        order_id: The order ID.
+        date_created: The order's `orders.date_created` value.
+        lines: Rows of (customer_name, customer_email, customer_contact,
+            product_name, product_size, product_quantity, total_amount).
+
+    Returns:
+        dict: Data in the format expected by the invoice generator.
+    """
+    name, email, contact = lines[0][0], lines[0][1], lines[0][2]
+    items = []
+    subtotal = 0.0
+    for line in lines:
+        quantity = int(line[5] or 1)
+        line_total = float(line[6] or 0)
+        subtotal += line_total
+        items.append({
+            'name': line[3],
+            'size': str(line[4]),
+            'unit_price': f"{line_total / quantity:.2f}",
+            'total': f"{line_total:.2f}"
+        })
+
+    return {
+        'date': date_created.strftime('%Y-%m-%d %H:%M:%S'),
+        'id': str(order_id),
+        'name': name,
+        'email': email,
+        'number': str(contact),
+        'items': items,
+        'subtotal': f"{subtotal:.2f}",
+        'tax': None,
+        'total': f"{subtotal:.2f}"
+    }
+
+
+@app.route("/api/orders/invoice/batch", methods=["POST"])
+def generate_invoice_batch():
+    """
+    Export invoices for many orders at once, as one multi-page PDF or a ZIP of PDFs.
+
+    Accepts either `order_ids` or a `batch_name` ("New Batch" selects unbatched
+    orders). All rows come from a single query on a server-side cursor and the
+    response is streamed with chunked transfer encoding.
+
+    A ZIP holds one PDF in memory at a time. A multi-page PDF is written to a
+    temporary file and streamed from there, but ReportLab keeps its pages until
+    the document is saved, so that format is limited to
+    INVOICE_BATCH_PDF_MAX_ORDERS orders.
+
+    An export holds one slot of the invoice render pool while it streams and is
+    turned away with a 503 when the pool is saturated. ZIP invoices render in
+    the pool; the multi-page PDF is a single canvas and renders here.
+    """
+    data = request.get_json() or {}
+    order_ids = data.get("order_ids", [])
+    batch_name = data.get("batch_name")
+    export_format = data.get("format", "zip")
+
+    if not isinstance(order_ids, list):
+        return jsonify({"error": "order_ids must be a list."}), 400
+    if not order_ids and not batch_name:
+        return jsonify({"error": "Order IDs or batch name are required."}), 400
+    if export_format not in ("zip", "pdf"):
+        return jsonify({"error": "Format must be 'zip' or 'pdf'."}), 400
+
+    if export_format == "pdf":
+        try:
+            cursor = mysql.connection.cursor()
+            cursor.execute(*build_invoice_batch_count_query(order_ids, batch_name))
+            order_count = cursor.fetchone()[0]
+            cursor.close()
+        except Exception as e:
+            print(f"Error counting invoices: {e}")
+            return jsonify({"error": str(e)}), 500
+        if order_count > INVOICE_BATCH_PDF_MAX_ORDERS:
+            return jsonify({"error": f"A PDF export is limited to {INVOICE_BATCH_PDF_MAX_ORDERS} orders; "
+                                     "use format 'zip' for larger batches."}), 400
+
+    try:
+        reservation = invoice_pool.reserve()
+    except InvoicePoolFull:
+        metrics.invoice_rejections.inc(f"batch_{export_format}")
+        response = jsonify({"error": "Invoice service is busy, please retry shortly."})
+        response.headers['Retry-After'] = INVOICE_RETRY_AFTER
+        return response, 503
+
+    query, params = build_invoice_batch_query(order_ids, batch_name)
+
+    def invoices():
+        cursor = mysql.connection.cursor(SSCursor)
+        try:
+            cursor.execute(query, params)
+            for order_id, rows in groupby(cursor, key=lambda row: row[0]):
+                rows = list(rows)
+                yield build_invoice_data(order_id, rows[0][1], [row[2:] for row in rows])
+        finally:
+            cursor.close()
+
+    def generate():
+        try:
+            start = time.perf_counter()
+            if export_format == "zip":
+                yield from stream_invoice_zip(invoices(), render=reservation.render)
+            else:
+                # A PDF's cross-reference table is written last, so the
+                # document is saved to disk before being sent in chunks.
+                with tempfile.TemporaryFile() as pdf_file:
+                    write_invoices_pdf(invoices(), pdf_file)
+                    pdf_file.seek(0)
+                    while True:
+                        chunk = pdf_file.read(64 * 1024)
+                        if not chunk:
+                            break
+                        yield chunk
+            metrics.invoice_render_seconds.observe(time.perf_counter() - start, f"batch_{export_format}")
+        except Exception as e:
+            print(f"Error exporting invoices: {e}")
+            raise
+
+    filename = f"Invoices.{export_format}"
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='application/zip' if export_format == "zip" else 'application/pdf'
+    )
+    # Also runs when the client disconnects before the body is read
+    response.call_on_close(reservation.release)
+    response.headers['Access-Control-Expose-Headers'] = 'Content-Disposition'
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 # Add product (with image upload to Google Drive)
 @app.route('/api/products/new', methods=['POST'])
 def add_product():
+    """
+    Create a product and queue its image for upload.
+
+    The form is validated before anything is stored. The row is written with
+    ``image_status = 'pending'`` and the image is uploaded by the background
+    uploader, which resizes it into WebP/JPEG variants and patches
+    ``image``/``file_id``/``image_variants`` when done; poll
+    /api/products/<id>/image for the outcome.
+    """
+    path = None
     try:
         # Check if the request contains the image file
-        if 'image' not in request.files:
+        if 'image' not in request.files or not request.files['image'].filename:
             return jsonify({'error': 'No image provided'}), 400
         
         image = request.files['image']
 
-        # Upload the image to the configured storage
-        image_url, file_id = upload_image_to_storage(image)
-        if not image_url or not file_id:
-            return jsonify({'error': 'Failed to upload image'}), 500
-        
         # Extract other form fields
         name = request.form.get('name')
         price = request.form.get('price')
@@ -199,20 +520,131 @@ def add_product():
         if not name or not price or not category or not size:
             return jsonify({'error': 'Missing required fields'}), 400
 
+        # Keep the image past the end of the request for the uploader
+        path = spool_upload(image, IMAGE_SPOOL_DIR)
+        try:
+            check_image(path)
+        except ImageProcessingError:
+            os.remove(path)
+            return jsonify({'error': 'Uploaded file is not a supported image'}), 400
+
         # Insert product into the database
         cursor = mysql.connection.cursor()
-        cursor.execute('''INSERT INTO productlist (name, price, category, image, size, description, disabledSizes, file_id)
-                          VALUES (%s, %s, %s, %s, %s, %s, %s, %s)''', 
-                       (name, price, category, image_url, size, description, disabledSizes, file_id))
+        cursor.execute('''INSERT INTO productlist (name, price, category, size, description, disabledSizes, image_status)
+                          VALUES (%s, %s, %s, %s, %s, %s, %s)''', 
+                       (name, price, category, size, description, disabledSizes, PENDING))
+        product_id = cursor.lastrowid
         mysql.connection.commit()
         cursor.close()
+        catalog_cache.invalidate()
+
+        try:
+            image_uploader.submit(product_id, path)
+        except UploadQueueFull:
+            cursor = mysql.connection.cursor()
+            cursor.execute("UPDATE productlist SET image_status = %s WHERE id = %s", (FAILED, product_id))
+            mysql.connection.commit()
+            cursor.close()
+            os.remove(path)
+            response = jsonify({'error': 'Image upload queue is full, please re-upload the image shortly.', 'id': product_id})
+            response.headers['Retry-After'] = '5'
+            return response, 503
 
-        return jsonify({'message': 'Product added successfully'}), 201
+        return jsonify({'message': 'Product added, image upload pending', 'id': product_id, 'image_status': PENDING}), 202
 
     except Exception as e:
         print(f"Error adding product: {e}")
+        if path and os.path.exists(path):
+            os.remove(path)
         return jsonify({'error': 'An error occurred while adding the product'}), 500
+
+
+@app.route('/api/products/<int:product_id>/image', methods=['GET'])
+def get_product_image_status(product_id):
+    try:
+        cursor = mysql.connection.cursor()
+        cursor.execute("SELECT image_status, image FROM productlist WHERE id = %s", (product_id,))
+        row = cursor.fetchone()
+        cursor.close()
+
+        if not row:
+            return jsonify({'error': 'Product not found'}), 404
+
+        return jsonify({'id': product_id, 'image_status': row[0], 'image': row[1]}), 200
+
+    except Exception as e:
+        print(f"Error fetching image status: {e}")
+        return jsonify({'error': 'An error occurred while fetching the image status'}), 500
     
+@app.route('/api/products/import', methods=['POST'])
+def import_products():
+    """
+    Bulk-create products from an uploaded CSV or JSONL ``file``, with an optional
+    ``images`` ZIP whose member names appear in the rows' ``image`` column.
+
+    Images are processed and uploaded concurrently; the rows are inserted in one
+    transaction. Invalid rows are skipped and listed in the response. Large
+    collections are better imported with ``python product_import.py import``.
+    """
+    if 'file' not in request.files:
+        return jsonify({'error': 'No import file provided'}), 400
+
+    upload = request.files['file']
+    fmt = request.form.get('format') or detect_format(upload.filename, default=None)
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify({'error': 'Import file must be .csv or .jsonl'}), 400
+
+    archive = None
+    try:
+        if 'images' in request.files:
+            try:
+                archive = zipfile.ZipFile(request.files['images'].stream)
+            except zipfile.BadZipFile:
+                return jsonify({'error': 'Images must be a ZIP archive'}), 400
+
+        importer = ProductImporter(storage, archive, workers=int(os.getenv("IMPORT_WORKERS", 8)))
+        report = importer.run(mysql.connection, read_rows(upload.stream, fmt))
+        catalog_cache.invalidate()
+
+        return jsonify(report), 200 if not report['failed'] else 207
+
+    except Exception as e:
+        print(f"Error importing products: {e}")
+        return jsonify({'error': 'An error occurred while importing products'}), 500
+    finally:
+        if archive is not None:
+            archive.close()
+
+
+@app.route('/api/products/export', methods=['GET'])
+def export_products():
+    """Stream every product as CSV (default) or JSONL (``?format=jsonl``)."""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify({'error': 'Format must be csv or jsonl'}), 400
+
+    try:
+        cursor = mysql.connection.cursor(SSCursor)
+        cursor.execute(EXPORT_SQL)
+    except Exception as e:
+        print(f"Error exporting products: {e}")
+        return jsonify({'error': 'An error occurred while exporting products'}), 500
+
+    def generate():
+        try:
+            yield from export_rows(cursor, fmt)
+        except Exception as e:
+            print(f"Error streaming product export: {e}")
+            raise
+        finally:
+            cursor.close()
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="products.{fmt}"'
+    return response
+
+
 @app.route('/api/products', methods=['GET'])
 def get_products():
     try:
@@ -310,36 +742,93 @@ def get_order_metadata():
         print(f"Error fetching order metadata: {e}")
         return jsonify({"error": "An internal server error occurred."}), 500
 
+def load_order_tracking(order_id):
+    """Fetch an order's status, ETA and line items in one query; None if it doesn't exist."""
+    cursor = mysql.connection.cursor()
+    cursor.execute(*build_tracking_query(order_id))
+    rows = cursor.fetchall()
+    cursor.close()
+
+    if not rows:
+        return None
+
+    status, date_created, estimated_time = rows[0][0], rows[0][1], rows[0][2]
+    return {
+        "order_id": order_id,
+        "status": status,
+        "date_created": date_created.strftime('%Y-%m-%d %H:%M:%S'),
+        "estimated_time": estimated_time.strftime('%Y-%m-%d %H:%M:%S') if estimated_time else None,
+        "customer": {
+            "name": rows[0][3],
+            "email": rows[0][4],
+            "contact": rows[0][5]
+        },
+        "items": [
+            {
+                "name": row[6],
+                "size": row[7],
+                "quantity": row[8],
+                "total": row[9]
+            }
+            for row in rows if row[6] is not None
+        ]
+    }
+
+
+@app.route('/api/orders/tracking', methods=['GET'])
+def get_order_tracking():
+    """
+    Order tracking in one call: status, ETA and line items, replacing the
+    /api/orders + /api/orders/metadata pair. Responses are cached briefly per
+    order and carry an ETag, so unchanged orders answer If-None-Match with 304.
+    """
+    try:
+        order_id = request.args.get('order_id')
+        if not order_id or len(order_id) != 12 or not order_id.startswith("ORD-"):
+            return jsonify({"error": "Invalid Order ID format."}), 400
+
+        entry = tracking_cache.get(order_id)
+        if entry is None:
+            tracking = load_order_tracking(order_id)
+            entry = tracking_cache.put(order_id, app.json.dumps(tracking).encode('utf-8') if tracking else None)
+        body, etag = entry
+
+        if body is None:
+            return jsonify({"error": "Order ID not found."}), 404
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['Access-Control-Expose-Headers'] = 'ETag'
+        return response
+
+    except Exception as e:
+        print(f"Error fetching order tracking: {e}")
+        return jsonify({"error": "An internal server error occurred."}), 500
+
 @app.route('/api/products/manage', methods=['GET', 'POST'])
 def manage_products():
     try:
         if request.method == 'GET':
-            # Fetch orders and restructure them to match frontend expectations
+            # Read the maintained order_summary projection; optional filters
+            # (status, batch) and keyset pagination (limit, cursor)
+            try:
+                sql, params, limit = build_dashboard_query(request.args)
+            except DashboardQueryError as e:
+                return jsonify({"error": str(e)}), 400
+
             cursor = mysql.connection.cursor()
-            cursor.execute('''
-              SELECT 
-                o.order_id AS product_id, 
-                o.status, 
-                o.batch,
-                t.customer_name, 
-                t.customer_contact, 
-                t.product_name,
-                o.date_created, 
-                t.customer_email
-            FROM orders o
-            LEFT JOIN (
-                SELECT 
-                    order_id, 
-                    MAX(customer_name) AS customer_name, 
-                    MAX(customer_contact) AS customer_contact, 
-                    MAX(product_name) AS product_name,
-                    MAX(customer_email) AS customer_email
-                FROM track
-                GROUP BY order_id
-            ) t ON o.order_id = t.order_id
-            ORDER BY o.batch IS NULL DESC, o.batch, o.date_created DESC;
-            ''')
+            cursor.execute(sql, params)
             data = cursor.fetchall()
+            cursor.close()
+
+            next_cursor = None
+            if limit and len(data) > limit:
+                data = data[:limit]
+                next_cursor = dashboard_cursor(data[-1])
 
             # Flatten and structure data
             products = [
@@ -358,8 +847,11 @@ def manage_products():
                 for row in data
             ]
 
-            cursor.close()
-            return jsonify(products), 200
+            response = jsonify(products)
+            if next_cursor:
+                response.headers['X-Next-Cursor'] = next_cursor
+                response.headers['Access-Control-Expose-Headers'] = 'X-Next-Cursor'
+            return response, 200
 
         elif request.method == 'POST':
             # Handle status updates for products
@@ -370,15 +862,15 @@ def manage_products():
             if not product_ids or not new_status:
                 return jsonify({"error": "Product IDs and status are required."}), 400
 
+            placeholders = ','.join(['%s'] * len(product_ids))
             cursor = mysql.connection.cursor()
-            cursor.execute('''
-                UPDATE orders 
-                SET status = %s 
-                WHERE order_id IN (%s)
-            ''' % (','.join(['%s'] * len(product_ids))), (new_status, *product_ids))
+            record_status_change(cursor, new_status, f"order_id IN ({placeholders})", product_ids, "manage_products")
+            cursor.execute(f"UPDATE orders SET status = %s WHERE order_id IN ({placeholders})",
+                           (new_status, *product_ids))
 
             mysql.connection.commit()
             cursor.close()
+            tracking_cache.invalidate(product_ids)
             return jsonify({"message": "Products updated successfully."}), 200
 
     except Exception as e:
@@ -396,27 +888,63 @@ def create_batch():
 
         if not batch_name or not product_ids:
             return jsonify({"message": "Batch name and product IDs are required"}), 400
+        if batch_name == UNBATCHED:
+            return jsonify({"message": f'"{UNBATCHED}" is reserved for unbatched orders; '
+                                       'use /api/products/move_batch to take orders out of a batch'}), 400
 
         cursor = mysql.connection.cursor()
 
-        # Link products to the batch in batch_products table
-        for product_id in product_ids:
-            cursor.execute(
-                """Update orders 
-                SET batch = %s
-                WHERE order_id = %s """,
-                (batch_name, product_id),
-            )
+        # Link orders to the batch with one UPDATE per chunk of IDs
+        result = assign_orders(cursor, batch_name, product_ids)
 
         mysql.connection.commit()
         cursor.close()
 
-        return jsonify({"message": "Batch created successfully"}), 201
+        return jsonify({"message": "Batch created successfully", **result}), 201
+    except BatchError as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         print(f"Error creating batch: {e}")
         return jsonify({"message": "Failed to create batch"}), 500
 
 
+# Route: Move orders between batches
+@app.route('/api/products/move_batch', methods=['POST'])
+def move_batch():
+    try:
+        from_batch = request.json.get("from_batch")
+        to_batch = request.json.get("to_batch")
+        product_ids = request.json.get("product_ids")
+
+        if not from_batch or not to_batch:
+            return jsonify({"message": "Source and target batch are required"}), 400
+
+        cursor = mysql.connection.cursor()
+        result = move_orders(cursor, from_batch, to_batch, product_ids or None)
+        mysql.connection.commit()
+        cursor.close()
+
+        return jsonify({"message": "Orders moved successfully", **result}), 200
+    except BatchError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        print(f"Error moving orders between batches: {e}")
+        return jsonify({"message": "Failed to move orders"}), 500
+
+
+# Route: List batches
+@app.route('/api/batches', methods=['GET'])
+def get_batches():
+    try:
+        cursor = mysql.connection.cursor()
+        batches = list_batches(cursor)
+        cursor.close()
+        return jsonify(batches), 200
+    except Exception as e:
+        print(f"Error fetching batches: {e}")
+        return jsonify({"message": "Failed to fetch batches"}), 500
+
+
 # Route: Update batch status
 @app.route('/api/products/update_batch_status', methods=['POST'])
 def update_batch_status():
@@ -429,16 +957,20 @@ def update_batch_status():
 
         cursor = mysql.connection.cursor()
         if batch_name == "New Batch":
+            record_status_change(cursor, status, "batch IS NULL", (), "update_batch_status")
             cursor.execute(
                 "UPDATE orders SET status = %s WHERE batch IS NULL", (status,)
             )
         else:
+            record_status_change(cursor, status, "batch = %s", (batch_name,), "update_batch_status")
             cursor.execute(
                 "UPDATE orders SET status = %s WHERE batch = %s", (status, batch_name)
             )
 
         mysql.connection.commit()
         cursor.close()
+        # Cached entries don't record their batch, so drop them all
+        tracking_cache.clear()
 
 
         return jsonify({"message": "Batch status updated successfully"}), 200
@@ -460,12 +992,14 @@ def update_product_status():
         cursor = mysql.connection.cursor()
 
         # Update the product status
+        record_status_change(cursor, status, "order_id = %s", (product_id,), "update_product_status")
         cursor.execute(
             "UPDATE orders SET status = %s WHERE order_id = %s", (status, product_id)
         )
 
         mysql.connection.commit()
         cursor.close()
+        tracking_cache.invalidate([product_id])
 
         return jsonify({"message": "Product status updated successfully"}), 200
     except Exception as e:
@@ -475,71 +1009,76 @@ def update_product_status():
 @app.route('/api/orders/details', methods=['GET'])
 def get_order_details():
     """
-    Fetch detailed order metadata, including grouped tracking information and customer details.
+    Stream detailed order metadata, including grouped tracking information and customer details.
+
+    Rows come from a server-side cursor ordered by (date_created, order_id), are
+    grouped into orders as they arrive and written out one order at a time, so
+    memory stays flat however long the order history is.
+
+    Optional query parameters: start_date / end_date (ISO dates, end inclusive),
+    limit (orders per response) and cursor (the previous response's next_cursor).
     """
     try:
-        cursor = mysql.connection.cursor()
+        query, params, limit = build_details_query(request.args)
+    except OrderDetailsQueryError as e:
+        return jsonify({"error": f"Invalid parameters: {e}"}), 400
 
-        # Query to fetch grouped order details
-        cursor.execute('''
-            SELECT 
-                o.order_id, 
-                o.status AS order_status,
-                o.date_created AS order_date, 
-                t.product_name, 
-                t.product_size, 
-                t.total_amount, 
-                t.product_quantity, 
-                t.status AS product_status, 
-                t.customer_name, 
-                t.customer_email, 
-                t.customer_contact
-            FROM 
-                orders o
-            LEFT JOIN 
-                track t ON o.order_id = t.order_id
-            ORDER BY 
-                o.date_created DESC
-        ''')
-
-        # Process query results into a grouped structure
-        rows = cursor.fetchall()
-        cursor.close()
+    try:
+        cursor = mysql.connection.cursor(SSCursor)
+        cursor.execute(query, params)
 
-        if not rows:
+        first_row = cursor.fetchone()
+        if first_row is None:
+            cursor.close()
             return jsonify({"message": "No orders found"}), 404
 
-        grouped_data = {}
-        for row in rows:
-            order_id = row['order_id']
-            if order_id not in grouped_data:
-                grouped_data[order_id] = {
-                    "order_id": order_id,
-                    "status": row['order_status'],
-                    "date_created": row['order_date'],
-                    "customer_name": row['customer_name'],
-                    "customer_email": row['customer_email'],
-                    "customer_contact": row['customer_contact'],
-                    "items": []
-                }
-
-            grouped_data[order_id]["items"].append({
-                "product_name": row['product_name'],
-                "product_size": row['product_size'],
-                "total_amount": row['total_amount'],
-                "product_quantity": row['product_quantity'],
-                "product_status": row['product_status']
-            })
-
-        # Convert grouped_data to a list of orders
-        orders = list(grouped_data.values())
-
-        return jsonify({"orders": orders}), 200
-
     except Exception as e:
         print(f"Error fetching order details: {e}")
         return jsonify({'error': 'An error occurred while fetching order details'}), 500
 
+    def generate():
+        try:
+            yield '{"orders":['
+            emitted = 0
+            last_order = None
+            next_cursor = None
+            for order_id, rows in groupby(chain([first_row], cursor), key=lambda row: row[0]):
+                if limit and emitted == limit:
+                    next_cursor = encode_cursor(last_order[1].strftime('%Y-%m-%d %H:%M:%S'), last_order[0])
+                    break
+
+                rows = list(rows)
+                order = {
+                    "order_id": order_id,
+                    "status": rows[0][1],
+                    "date_created": rows[0][2],
+                    "customer_name": rows[0][8],
+                    "customer_email": rows[0][9],
+                    "customer_contact": rows[0][10],
+                    "items": [
+                        {
+                            "product_name": row[3],
+                            "product_size": row[4],
+                            "total_amount": row[5],
+                            "product_quantity": row[6],
+                            "product_status": row[7]
+                        }
+                        for row in rows
+                    ]
+                }
+                yield ("," if emitted else "") + app.json.dumps(order)
+                emitted += 1
+                last_order = (order_id, rows[0][2])
+
+            yield '],"next_cursor":' + app.json.dumps(next_cursor) + '}'
+        except Exception as e:
+            print(f"Error streaming order details: {e}")
+            raise
+        finally:
+            cursor.close()
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
 
 # Update product
 @app.route('/api/products/<product_id>', methods=['PUT'])
@@ -552,9 +1091,6 @@ def update_product(product_id):
     size = data.get('size')
     disabledSizes = data.get('disabledSizes')
 
-    # Debugging logs to verify incoming data
-    print("Received data:", data)
-
     cursor = mysql.connection.cursor()
     cursor.execute('''UPDATE productlist
                       SET name = %s, price = %s, description = %s, category = %s, size = %s, disabledSizes = %s
@@ -562,6 +1098,7 @@ def update_product(product_id):
                    (name, price, description, category, size, disabledSizes, product_id))
     mysql.connection.commit()
     cursor.close()
+    catalog_cache.invalidate()
 
     return jsonify({'message': 'Product updated successfully'}), 200
 
@@ -572,27 +1109,23 @@ def update_product(product_id):
 def delete_product(product_id):
     try:
         # Retrieve the product from the database
-        print('ready')
         cursor = mysql.connection.cursor()
-        cursor.execute("SELECT file_id FROM productlist WHERE id = %s", (product_id,))
+        cursor.execute("SELECT file_id, image_variants FROM productlist WHERE id = %s", (product_id,))
         result = cursor.fetchone()
-        print("done", result)
         if not result:
             return jsonify({'error': 'Product not found'}), 404
         
-        file_id = result[0]
-        print(file_id)
+        file_ids = variant_file_ids(result[1]) or [result[0]]
 
-        # Delete the file from Google Drive
-        if file_id and not delete_from_cloudinary(file_id):
-            return jsonify({'error': 'Failed to delete image from Google Drive'}), 500
+        # Delete the image and its variants from storage
+        if not all(storage.delete_many(file_ids).values()):
+            return jsonify({'error': 'Failed to delete image from storage'}), 500
 
         # Delete the product from the database
-        print("running")
         cursor.execute("DELETE FROM productlist WHERE id = %s", (product_id,))
         mysql.connection.commit()
         cursor.close()
-        print("done")
+        catalog_cache.invalidate()
 
         return jsonify({'message': 'Product deleted successfully'}), 200
 
@@ -600,6 +1133,64 @@ def delete_product(product_id):
         print(f"Error deleting product: {e}")
         return jsonify({'error': 'An error occurred while deleting the product'}), 500
 
+
+@app.route('/api/products/bulk_delete', methods=['POST'])
+def bulk_delete_products():
+    """
+    Delete many products at once.
+
+    The rows are deleted in one transaction first; their images are then
+    removed from storage in batches with retries. Images that still can't be
+    deleted are queued in `storage_reconciliation` rather than failing the request.
+    """
+    try:
+        product_ids = request.json.get("product_ids") or []
+        if not isinstance(product_ids, list) or not product_ids:
+            return jsonify({'error': 'product_ids must be a non-empty list'}), 400
+        try:
+            product_ids = [int(product_id) for product_id in product_ids]
+        except (TypeError, ValueError):
+            return jsonify({'error': 'product_ids must be integers'}), 400
+
+        cursor = mysql.connection.cursor()
+        deleted, missing, file_ids = delete_products(cursor, product_ids)
+        mysql.connection.commit()
+        cursor.close()
+        if deleted:
+            catalog_cache.invalidate()
+
+        images_deleted, failed = delete_files(storage, file_ids)
+        if failed:
+            cursor = mysql.connection.cursor()
+            queue_for_reconciliation(cursor, failed, "bulk_delete")
+            mysql.connection.commit()
+            cursor.close()
+
+        return jsonify({
+            'deleted': len(deleted),
+            'not_found': missing,
+            'images_deleted': images_deleted,
+            'images_queued': len(failed),
+        }), 200
+
+    except Exception as e:
+        print(f"Error bulk deleting products: {e}")
+        return jsonify({'error': 'An error occurred while deleting the products'}), 500
+
+
+@app.route('/api/storage/reconcile', methods=['POST'])
+def reconcile_storage():
+    """Retry queued storage deletes (up to ``limit``, default 500)."""
+    try:
+        limit = int(request.args.get('limit', 500))
+        result = drain_reconciliation(mysql.connection, storage, limit=max(1, limit))
+        return jsonify(result), 200
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    except Exception as e:
+        print(f"Error reconciling storage: {e}")
+        return jsonify({'error': 'An error occurred while reconciling storage'}), 500
+
 # Update order status
 @app.route('/update-order/<order_id>', methods=['PUT'])
 @jwt_required()
@@ -609,40 +1200,127 @@ def update_order(order_id):
         status = data['status']
 
         cursor = mysql.connection.cursor()
+        record_status_change(cursor, status, "id = %s", (order_id,), "update_order")
         cursor.execute('''UPDATE orders 
                         SET status = %s, updated_at = %s 
                         WHERE id = %s''', 
                     (status, datetime.utcnow(), order_id))
         mysql.connection.commit()
         cursor.close()
+        # Keyed by numeric id here, not order_id
+        tracking_cache.clear()
 
         return jsonify({'message': 'Order updated successfully'}), 200
     except Exception as e:
-        print(e)
+        mysql.connection.rollback()
+        print(f"Error updating order: {e}")
+        return jsonify({'error': str(e)}), 500
 
-@app.route('/api/product-list', methods=['GET'])
-def get_product():
+def load_catalog():
     cursor = mysql.connection.cursor()
-    cursor.execute('SELECT id, name, price, image, description, category, size, disabledSizes FROM productlist')
+    cursor.execute('SELECT id, name, price, image, description, category, size, disabledSizes, image_status, image_variants FROM productlist')
     products = cursor.fetchall()
     cursor.close()
 
     # Convert the result to a list of dictionaries
-    products_list = [{'id': row[0], 'name': row[1], 'price': row[2], 'image': row[3], 'description': row[4], 'category': row[5], 'size': row[6], 'disabledSizes': row[7],} for row in products]
+    products_list = [{'id': row[0], 'name': row[1], 'price': row[2], 'image': row[3], 'description': row[4], 'category': row[5], 'size': row[6], 'disabledSizes': row[7], 'image_status': row[8], 'images': srcset(row[9], row[3]),} for row in products]
+
+    return app.json.dumps(products_list).encode('utf-8')
+
+
+@app.route('/api/product-list', methods=['GET'])
+def get_product():
+    body, etag = catalog_cache.get(load_catalog)
+
+    # The storefront already has this version of the catalog
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Access-Control-Expose-Headers'] = 'ETag'
+    return response
+
+@app.route('/api/catalog', methods=['GET'])
+def get_catalog():
+    """
+    Paginated product catalog.
+
+    Query parameters: category, size (available, i.e. not disabled), min_price,
+    max_price, sort (newest, price_asc, price_desc), fields (comma-separated
+    sparse fieldset), limit and cursor (the previous page's next_cursor).
+    """
+    try:
+        sql, params, fields, sort, limit, selected = build_catalog_query(request.args)
+    except CatalogQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        cursor = mysql.connection.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        cursor.close()
 
-    return jsonify(products_list), 200
+        products, next_cursor = catalog_page(selected, rows, fields, sort, limit)
+
+        return jsonify({'products': products, 'next_cursor': next_cursor}), 200
+
+    except Exception as e:
+        print(f"Error fetching catalog: {e}")
+        return jsonify({'error': 'Failed to fetch catalog'}), 500
 
 # Group orders by status
 @app.route('/orders', methods=['GET'])
 def get_orders():
-    status = request.args.get('status')
+    """Every order with the given status, as a list of row arrays (the original response)."""
+    try:
+        cursor = mysql.connection.cursor()
+        cursor.execute(*build_status_query(request.args.get('status')))
+        orders = cursor.fetchall()
+        cursor.close()
+        return jsonify(orders), 200
 
-    cursor = mysql.connection.cursor()
-    cursor.execute('SELECT * FROM orders WHERE status = %s', (status,))
-    orders = cursor.fetchall()
-    cursor.close()
+    except Exception as e:
+        print(f"Error fetching orders: {e}")
+        return jsonify({'error': 'Failed to fetch orders'}), 500
 
-    return jsonify(orders), 200
+
+@app.route('/orders/grouped', methods=['GET'])
+def get_grouped_orders():
+    """
+    Orders grouped by status for the admin kanban view: every group's count plus
+    its first page, newest first, in one request.
+
+    Query parameters: status (comma-separated; default every status), limit
+    (orders per group) and cursor (a group's next_cursor; requires exactly one
+    status).
+    """
+    try:
+        statuses, limit, after = parse_group_args(request.args)
+    except OrderGroupQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        cursor = mysql.connection.cursor()
+        sql, params = build_count_query(statuses)
+        cursor.execute(sql, params)
+        counts = dict(cursor.fetchall())
+
+        rows = []
+        if counts:
+            # Only the groups that have orders get a subquery
+            sql, params = build_pages_query(list(counts), limit, after)
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        cursor.close()
+
+        groups = group_orders(statuses or list(counts), counts, rows, limit)
+        return jsonify({'groups': groups}), 200
+
+    except Exception as e:
+        print(f"Error fetching grouped orders: {e}")
+        return jsonify({'error': 'Failed to fetch orders'}), 500
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,112 @@
+from werkzeug.security import check_password_hash, generate_password_hash
+from cachetools import TTLCache
+import threading
+import time
+
+# Stored in place of a record for emails that don't exist
+_MISSING = object()
+
+
+class AdminCache:
+    """
+    Short-TTL cache of admin login records (id, email, password hash) by email.
+
+    Unknown emails are cached too, so a flood of made-up addresses doesn't turn
+    into a flood of queries. A password rehash updates the cached record. Keys
+    are lowercased like LoginLimiter's, matching the case-insensitive lookup.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, email, loader):
+        """Return the record for ``email`` (or None), calling ``loader(email)`` on a miss."""
+        key = email.lower()
+        with self._lock:
+            record = self._cache.get(key)
+        if record is None:
+            record = loader(email) or _MISSING
+            with self._lock:
+                self._cache[key] = record
+        return None if record is _MISSING else record
+
+    def put(self, email, record):
+        with self._lock:
+            self._cache[email.lower()] = record
+
+    def invalidate(self, email):
+        with self._lock:
+            self._cache.pop(email.lower(), None)
+
+
+class LoginLimiter:
+    """
+    Fixed-window failed-login limiter per client IP and per account.
+
+    Counters live in TTL caches with a fixed ``maxsize``, so memory stays bounded
+    however many IPs or emails an attacker cycles through; when full, expired
+    entries are dropped first, then the least recently used live ones.
+    """
+
+    def __init__(self, ip_limit=20, ip_window=300, account_limit=5, account_window=900, maxsize=10000):
+        self._limits = {
+            "ip": (ip_limit, ip_window, TTLCache(maxsize=maxsize, ttl=ip_window)),
+            "account": (account_limit, account_window, TTLCache(maxsize=maxsize, ttl=account_window)),
+        }
+        self._lock = threading.Lock()
+
+    def _keys(self, ip, email):
+        return (("ip", ip), ("account", email.lower()))
+
+    def retry_after(self, ip, email):
+        """Seconds until ``ip``/``email`` may try again, or 0 if allowed now."""
+        now = time.monotonic()
+        wait = 0
+        with self._lock:
+            for kind, key in self._keys(ip, email):
+                limit, window, counters = self._limits[kind]
+                entry = counters.get(key)
+                if entry and entry[0] >= limit and now - entry[1] < window:
+                    wait = max(wait, window - (now - entry[1]))
+        return int(wait) + 1 if wait else 0
+
+    def record_failure(self, ip, email):
+        now = time.monotonic()
+        with self._lock:
+            for kind, key in self._keys(ip, email):
+                _, window, counters = self._limits[kind]
+                count, started = counters.get(key, (0, now))
+                if now - started >= window:
+                    count, started = 0, now
+                counters[key] = (count + 1, started)
+
+    def reset(self, email):
+        """Clear the account's counter after a successful login."""
+        with self._lock:
+            self._limits["account"][2].pop(email.lower(), None)
+
+
+def needs_rehash(password_hash, method):
+    """True if ``password_hash`` wasn't made with exactly ``method``."""
+    return password_hash.split("$", 1)[0] != method
+
+
+def verify_password(record, password, dummy_hash):
+    """
+    Check ``password`` against an admin record.
+
+    For unknown accounts the password is checked against ``dummy_hash`` instead,
+    so the response time doesn't reveal which emails exist.
+    """
+    if record is None:
+        check_password_hash(dummy_hash, password)
+        return False
+    return check_password_hash(record[2], password)
+
+
+def rehash_password(cursor, admin_id, password, method):
+    """Store ``password`` hashed with ``method``; returns the new hash."""
+    password_hash = generate_password_hash(password, method=method)
+    cursor.execute("UPDATE admins SET password = %s WHERE id = %s", (password_hash, admin_id))
+    return password_hash
@@ -0,0 +1,128 @@
+# Name the dashboard uses for orders that are not in any batch (orders.batch IS NULL)
+UNBATCHED = "New Batch"
+CHUNK_SIZE = 1000
+
+
+class BatchError(ValueError):
+    """Raised for invalid batch operations."""
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _unique(order_ids):
+    return list(dict.fromkeys(str(order_id) for order_id in order_ids))
+
+
+def ensure_batch(cursor, batch_name):
+    """Register ``batch_name`` in `batches` if it isn't already."""
+    if batch_name == UNBATCHED:
+        raise BatchError(f'"{UNBATCHED}" is reserved for unbatched orders.')
+    cursor.execute("INSERT IGNORE INTO batches (name) VALUES (%s)", (batch_name,))
+
+
+def _current_batches(cursor, chunk):
+    placeholders = ','.join(['%s'] * len(chunk))
+    cursor.execute(f"SELECT order_id, batch FROM orders WHERE order_id IN ({placeholders}) FOR UPDATE", chunk)
+    return dict(cursor.fetchall())
+
+
+def assign_orders(cursor, batch_name, order_ids, chunk_size=CHUNK_SIZE):
+    """
+    Put orders into a batch with one UPDATE per chunk of IDs.
+
+    Idempotent: orders already in the batch are reported as unchanged and not
+    rewritten. The caller owns the transaction and commits.
+
+    Args:
+        cursor: An open cursor.
+        batch_name: Target batch; UNBATCHED removes the orders from their batch.
+        order_ids: Order IDs to assign.
+
+    Returns:
+        dict: Counts of assigned and unchanged orders and the IDs that don't exist.
+    """
+    target = None if batch_name == UNBATCHED else batch_name
+    if target is not None:
+        ensure_batch(cursor, target)
+
+    result = {"assigned": 0, "unchanged": 0, "not_found": []}
+    for chunk in _chunks(_unique(order_ids), chunk_size):
+        current = _current_batches(cursor, chunk)
+        to_update = []
+        for order_id in chunk:
+            if order_id not in current:
+                result["not_found"].append(order_id)
+            elif current[order_id] == target:
+                result["unchanged"] += 1
+            else:
+                to_update.append(order_id)
+
+        if to_update:
+            placeholders = ','.join(['%s'] * len(to_update))
+            cursor.execute(f"UPDATE orders SET batch = %s WHERE order_id IN ({placeholders})",
+                           (target, *to_update))
+            result["assigned"] += len(to_update)
+    return result
+
+
+def move_orders(cursor, from_batch, to_batch, order_ids=None, chunk_size=CHUNK_SIZE):
+    """
+    Move orders from one batch to another.
+
+    With ``order_ids`` only those orders move, and only if they are currently in
+    ``from_batch``; without them the whole batch moves in a single UPDATE.
+
+    Returns:
+        dict: The number moved plus, for an explicit ID list, the IDs that don't
+        exist and those that belong to a different batch.
+    """
+    source = None if from_batch == UNBATCHED else from_batch
+    target = None if to_batch == UNBATCHED else to_batch
+    if source == target:
+        raise BatchError("Source and target batch are the same.")
+    if target is not None:
+        ensure_batch(cursor, target)
+
+    if order_ids is None:
+        if source is None:
+            cursor.execute("UPDATE orders SET batch = %s WHERE batch IS NULL", (target,))
+        else:
+            cursor.execute("UPDATE orders SET batch = %s WHERE batch = %s", (target, source))
+        return {"moved": cursor.rowcount}
+
+    result = {"moved": 0, "not_found": [], "not_in_source": []}
+    for chunk in _chunks(_unique(order_ids), chunk_size):
+        current = _current_batches(cursor, chunk)
+        to_move = []
+        for order_id in chunk:
+            if order_id not in current:
+                result["not_found"].append(order_id)
+            elif current[order_id] != source:
+                result["not_in_source"].append(order_id)
+            else:
+                to_move.append(order_id)
+
+        if to_move:
+            placeholders = ','.join(['%s'] * len(to_move))
+            cursor.execute(f"UPDATE orders SET batch = %s WHERE order_id IN ({placeholders})",
+                           (target, *to_move))
+            result["moved"] += len(to_move)
+    return result
+
+
+def list_batches(cursor):
+    """Return every batch with its order count, newest first."""
+    cursor.execute('''
+        SELECT b.name, b.created_at, COUNT(o.order_id)
+        FROM batches b
+        LEFT JOIN orders o ON o.batch = b.name
+        GROUP BY b.id, b.name, b.created_at
+        ORDER BY b.created_at DESC
+    ''')
+    return [
+        {"name": row[0], "created_at": row[1].strftime('%Y-%m-%d %H:%M:%S'), "orders": row[2]}
+        for row in cursor.fetchall()
+    ]
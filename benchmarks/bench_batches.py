@@ -0,0 +1,53 @@
+"""
+Batch assignment benchmark: the old one-UPDATE-per-order loop against the
+chunked set-based assign_orders, at 10, 1k and 50k order IDs.
+
+Usage:
+    python benchmarks/bench_batches.py [orders_in_table]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batches import assign_orders
+from bench_order_summary import seed
+from benchdb import connect, run_sql_file
+
+
+def legacy_assign(cursor, batch_name, order_ids):
+    # The original loop; 0010's trigger would register the name, but do it once up front
+    cursor.execute("INSERT IGNORE INTO batches (name) VALUES (%s)", (batch_name,))
+    for order_id in order_ids:
+        cursor.execute("UPDATE orders SET batch = %s WHERE order_id = %s", (batch_name, order_id))
+
+
+def timed(label, conn, fn):
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    result = fn(cursor)
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    cursor.close()
+    print(f"  {label:<28} {elapsed * 1000:10.1f} ms  {result or ''}")
+
+
+if __name__ == '__main__':
+    table_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    conn = connect()
+    seed(conn, table_size)
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS batches")
+    cursor.close()
+    run_sql_file(conn, "migrations", "0005_batches.sql")
+    run_sql_file(conn, "migrations", "0010_register_batch_names.sql")
+
+    for count in (10, 1000, 50000):
+        ids = [f"ORD-{i:08d}" for i in range(count)]
+        print(f"{count} IDs")
+        timed("legacy UPDATE per order", conn, lambda c: legacy_assign(c, f"Legacy {count}", ids) or None)
+        timed("assign_orders", conn, lambda c: assign_orders(c, f"Bulk {count}", ids)["assigned"])
+        timed("assign_orders (repeat)", conn, lambda c: assign_orders(c, f"Bulk {count}", ids)["unchanged"])
+    conn.close()
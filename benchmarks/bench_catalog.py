@@ -0,0 +1,111 @@
+"""
+Catalog query benchmark over a synthetic productlist.
+
+Seeds a throwaway database (MYSQL_BENCH_DB, default dfootprint_bench) with N
+products, then compares the full /api/product-list query plus serialization
+against keyset pages from /api/catalog: first page, a deep page reached via
+cursor, a filtered page and a sparse fieldset page.
+
+Usage:
+    python benchmarks/bench_catalog.py [products]
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchdb import BENCH_DB, connect, insert_chunks, recreate_tables, run_sql_file
+from catalog_query import build_catalog_query, catalog_page
+
+CATEGORIES = ["slides", "sandals", "sneakers", "loafers", "boots", "heels"]
+
+
+def generate_products(count):
+    rng = random.Random(42)
+    sizes = list(range(36, 47))
+    for i in range(count):
+        disabled = rng.sample(sizes, 2)
+        yield (
+            f"Product {i}",
+            rng.randint(5, 200) * 500,
+            rng.choice(CATEGORIES),
+            f"https://res.cloudinary.com/demo/image/upload/dfootprint/p{i}.jpg",
+            ",".join(map(str, sizes)),
+            "Handmade leather footwear. " * rng.randint(5, 30),
+            ",".join(map(str, disabled)),
+            f"dfootprint/p{i}",
+        )
+
+
+def seed(conn, count):
+    recreate_tables(conn, "productlist")
+    run_sql_file(conn, "migrations", "0003_catalog_indexes.sql")
+    run_sql_file(conn, "migrations", "0007_image_status.sql")
+    run_sql_file(conn, "migrations", "0008_image_variants.sql")
+    insert_chunks(conn, "INSERT INTO productlist (name, price, category, image, size, description, disabledSizes, file_id) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)", generate_products(count))
+    cursor = conn.cursor()
+    cursor.execute("ANALYZE TABLE productlist")
+    cursor.fetchall()
+    cursor.close()
+
+
+def timed(label, fn, repeat=5):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        size = fn()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"{label:<36} {elapsed:9.2f} ms  {size:>12} bytes")
+
+
+def full_list(conn):
+    cursor = conn.cursor()
+    cursor.execute('SELECT id, name, price, image, description, category, size, disabledSizes FROM productlist')
+    rows = cursor.fetchall()
+    cursor.close()
+    keys = ('id', 'name', 'price', 'image', 'description', 'category', 'size', 'disabledSizes')
+    return len(json.dumps([dict(zip(keys, row)) for row in rows], default=str))
+
+
+def fetch_page(conn, args):
+    sql, params, fields, sort, limit, selected = build_catalog_query(args)
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return catalog_page(selected, rows, fields, sort, limit)
+
+
+def page_size(conn, args):
+    products, _ = fetch_page(conn, args)
+    return len(json.dumps(products, default=str))
+
+
+def deep_cursor(conn, args, pages):
+    """Walk ``pages`` pages and return the cursor of the last one."""
+    args = dict(args)
+    for _ in range(pages):
+        args['cursor'] = fetch_page(conn, args)[1]
+    return args
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    conn = connect()
+
+    print(f"seeding {count} products into {BENCH_DB}...")
+    seed(conn, count)
+
+    timed("full /api/product-list", lambda: full_list(conn), repeat=3)
+    timed("catalog first page", lambda: page_size(conn, {}))
+    timed("catalog first page, list fields", lambda: page_size(conn, {'fields': 'id,name,price,image'}))
+    deep = deep_cursor(conn, {'sort': 'price_asc'}, 200)
+    timed("catalog page 201 (price_asc)", lambda: page_size(conn, deep))
+    timed("catalog category+price range", lambda: page_size(conn, {'category': 'boots', 'min_price': '20000', 'max_price': '60000', 'sort': 'price_asc'}))
+    timed("catalog category+size", lambda: page_size(conn, {'category': 'slides', 'size': '41'}))
+    conn.close()
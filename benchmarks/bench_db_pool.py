@@ -0,0 +1,83 @@
+"""
+Per-request database latency: a fresh connection per request (the old
+Flask-MySQLdb behaviour) against a connection borrowed from the pool.
+
+Reads MYSQL_HOST / MYSQL_PORT / MYSQL_USER / MYSQL_PASSWORD / MYSQL_DB from the
+environment (or .env), so point it at a local MySQL.
+
+Usage:
+    python benchmarks/bench_db_pool.py [requests] [threads]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import MySQLdb
+from dotenv import load_dotenv
+
+from db_pool import ConnectionPool
+from loadlib import summarize
+
+load_dotenv()
+
+CONNECT_KWARGS = {
+    "host": os.getenv("MYSQL_HOST", "127.0.0.1"),
+    "port": int(os.getenv("MYSQL_PORT", 3306)),
+    "user": os.getenv("MYSQL_USER", "root"),
+    "passwd": os.getenv("MYSQL_PASSWORD", ""),
+    "db": os.getenv("MYSQL_DB", "dfootprint"),
+}
+QUERY = "SELECT 1"
+
+
+def per_request_connection():
+    conn = MySQLdb.connect(**CONNECT_KWARGS)
+    cursor = conn.cursor()
+    cursor.execute(QUERY)
+    cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+
+def run(label, handle_request, total, threads):
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            handle_request()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    workers = [threading.Thread(target=worker, args=(total // threads,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    summarize(label, latencies, elapsed=time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    pool = ConnectionPool(min_size=threads, max_size=threads, **CONNECT_KWARGS)
+    pool.warm()
+
+    def pooled_connection():
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(QUERY)
+            cursor.fetchall()
+            cursor.close()
+
+    run("connection per request", per_request_connection, total, threads)
+    run("pooled connection", pooled_connection, total, threads)
+    print(f"pool stats: {pool.stats()}")
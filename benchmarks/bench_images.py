@@ -0,0 +1,70 @@
+"""
+Image processing benchmark.
+
+Runs images.process_image over a corpus and reports processing time and the
+bytes a shopper downloads per variant against the original upload. Without a
+corpus directory a synthetic set of camera-sized JPEGs and PNGs is generated.
+
+Usage:
+    python benchmarks/bench_images.py [corpus_dir]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from images import process_image, remove_variants, VARIANTS, FORMATS
+
+
+def generate_corpus(directory, count=8):
+    """Write photo-like test images (gradients plus shapes) at typical upload sizes."""
+    sizes = [(4032, 3024), (3000, 4000), (2048, 2048), (1200, 900)]
+    paths = []
+    for i in range(count):
+        width, height = sizes[i % len(sizes)]
+        image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+        draw = ImageDraw.Draw(image)
+        for j in range(40):
+            x, y = (j * 97 + i * 31) % width, (j * 53 + i * 17) % height
+            draw.ellipse((x, y, x + width // 6, y + height // 6), fill=((j * 40) % 256, (i * 60) % 256, 120))
+        if i % 4 == 3:
+            path = os.path.join(directory, f"sample_{i}.png")
+            image.putalpha(255)
+            image.save(path)
+        else:
+            path = os.path.join(directory, f"sample_{i}.jpg")
+            image.save(path, quality=95)
+        paths.append(path)
+    return paths
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        corpus = [os.path.join(sys.argv[1], name) for name in sorted(os.listdir(sys.argv[1]))]
+    else:
+        corpus = generate_corpus(tempfile.mkdtemp(prefix="image-corpus-"))
+
+    timings = []
+    original_bytes = 0
+    variant_bytes = {(name, fmt): 0 for name, _ in VARIANTS for fmt in FORMATS}
+    for path in corpus:
+        start = time.perf_counter()
+        out_dir, variants = process_image(path)
+        timings.append(time.perf_counter() - start)
+        original_bytes += os.path.getsize(path)
+        for name, entry in variants.items():
+            for fmt in FORMATS:
+                variant_bytes[(name, fmt)] += os.path.getsize(entry[fmt])
+        remove_variants(out_dir)
+
+    timings.sort()
+    print(f"{len(corpus)} images, process_image: "
+          f"mean={sum(timings) / len(timings) * 1000:.0f}ms max={timings[-1] * 1000:.0f}ms")
+    print(f"{'original':<14} {original_bytes / len(corpus) / 1024:9.1f} KiB/image")
+    for (name, fmt), total in variant_bytes.items():
+        saving = 100 * (1 - total / original_bytes)
+        print(f"{name + ' ' + fmt:<14} {total / len(corpus) / 1024:9.1f} KiB/image ({saving:5.1f}% smaller)")
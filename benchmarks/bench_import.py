@@ -0,0 +1,73 @@
+"""
+Bulk import benchmark: N products with camera-sized JPEGs imported through
+ProductImporter into the benchmark database, storing images on local disk.
+Compares worker counts; the old path is one add_product request per row.
+
+Usage:
+    python benchmarks/bench_import.py [products] [workers,...]
+"""
+import os
+import sys
+import tempfile
+import time
+import zipfile
+import io
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image, ImageDraw
+
+from benchdb import connect, recreate_tables, run_sql_file
+from product_import import ProductImporter, read_rows
+from storage import LocalStorage
+
+
+def build_import(directory, count, distinct_images=20):
+    """Write products.jsonl and images.zip; rows cycle through ``distinct_images`` pictures."""
+    archive_path = os.path.join(directory, "images.zip")
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for i in range(distinct_images):
+            image = Image.linear_gradient("L").resize((2400, 1800)).convert("RGB")
+            draw = ImageDraw.Draw(image)
+            draw.ellipse((100 + i * 40, 100, 1200 + i * 40, 1200), fill=(i * 12 % 256, 90, 160))
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=92)
+            archive.writestr(f"shoe_{i}.jpg", buffer.getvalue())
+
+    rows_path = os.path.join(directory, "products.jsonl")
+    with open(rows_path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({
+                "name": f"Imported Slide {i}",
+                "price": 15000 + i % 50 * 500,
+                "category": ("slides", "sandals", "sneakers")[i % 3],
+                "size": "40,41,42,43",
+                "description": "Bulk imported",
+                "image": f"shoe_{i % distinct_images}.jpg",
+            }) + "\n")
+    return rows_path, archive_path
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    worker_counts = [int(n) for n in sys.argv[2].split(",")] if len(sys.argv) > 2 else [1, 4, 8]
+
+    work_dir = tempfile.mkdtemp(prefix="bench-import-")
+    rows_path, archive_path = build_import(work_dir, count)
+    conn = connect()
+
+    for workers in worker_counts:
+        recreate_tables(conn, "productlist")
+        run_sql_file(conn, "migrations", "0007_image_status.sql")
+        run_sql_file(conn, "migrations", "0008_image_variants.sql")
+        storage = LocalStorage(os.path.join(work_dir, f"storage-{workers}"))
+        with zipfile.ZipFile(archive_path) as archive, open(rows_path, "rb") as f:
+            importer = ProductImporter(storage, archive, workers=workers)
+            start = time.perf_counter()
+            report = importer.run(conn, read_rows(f, "jsonl"))
+            elapsed = time.perf_counter() - start
+        print(f"workers={workers:<3} {report['imported']}/{report['total']} products in {elapsed:.1f}s "
+              f"({report['imported'] / elapsed:.1f}/s, projected 5000 in {5000 / (report['imported'] / elapsed) / 60:.1f} min)")
+    conn.close()
@@ -0,0 +1,64 @@
+"""
+Invoice rendering benchmark.
+
+Compares rendering with a cold template (logo decoded for every invoice, as the
+generator used to do) against the shared per-process template.
+
+Usage:
+    python benchmarks/bench_invoice.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reciptGen import InvoiceTemplate, create_invoice_in_memory
+
+
+def sample_invoice(item_count=3):
+    items = [
+        {
+            'name': f"Leather Slide {i}",
+            'size': str(38 + i % 8),
+            'unit_price': "15000.00",
+            'total': "15000.00",
+        }
+        for i in range(item_count)
+    ]
+    subtotal = 15000.00 * item_count
+    return {
+        'date': "2024-11-02 10:15:00",
+        'id': "ORD-12345678",
+        'name': "Ada Obi",
+        'email': "ada@example.com",
+        'number': "08030000000",
+        'Delivery Company': "GIG Logistics",
+        'State': "Lagos",
+        'Location': "Ikeja",
+        'Pickup Address': "12 Allen Avenue, Ikeja, Lagos, opposite the big filling station",
+        'items': items,
+        'subtotal': f"{subtotal:.2f}",
+        'tax': f"{subtotal * 0.1:.2f}",
+        'total': f"{subtotal * 1.1:.2f}",
+    }
+
+
+def bench(label, render, iterations):
+    render()  # warm up imports and font metrics
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    elapsed = time.perf_counter() - start
+    per_invoice = elapsed / iterations * 1000
+    print(f"{label:<16} {iterations} invoices in {elapsed:.2f}s ({per_invoice:.2f} ms/invoice)")
+    return per_invoice
+
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    data = sample_invoice()
+
+    cold = bench("cold template", lambda: create_invoice_in_memory(data, InvoiceTemplate()), iterations)
+    warm = bench("shared template", lambda: create_invoice_in_memory(data), iterations)
+    print(f"speedup: {cold / warm:.1f}x")
@@ -0,0 +1,31 @@
+"""
+Multi-page invoice benchmark.
+
+Renders orders with 1, 50 and 1000 line items and reports the cost per item, which
+should stay roughly constant if pagination scales linearly.
+
+Usage:
+    python benchmarks/bench_invoice_pages.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_invoice import sample_invoice
+from reciptGen import create_invoice_in_memory
+
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    create_invoice_in_memory(sample_invoice(1))  # warm up
+
+    for item_count in (1, 50, 1000):
+        data = sample_invoice(item_count)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            pdf_buffer = create_invoice_in_memory(data)
+        elapsed = (time.perf_counter() - start) / iterations * 1000
+        print(f"{item_count:>5} items: {elapsed:8.2f} ms/invoice, "
+              f"{elapsed / item_count:.3f} ms/item, {len(pdf_buffer.getvalue())} bytes")
@@ -0,0 +1,57 @@
+"""
+Memory benchmark for the streaming /api/orders/details endpoint.
+
+For each history size the bench database is seeded, then a fresh subprocess
+streams the full response through the Flask test client and reports its peak
+RSS. With streaming the peak should stay roughly flat as the history grows.
+
+Usage:
+    python benchmarks/bench_order_details_memory.py [sizes...]   (default 10000 100000 500000)
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+
+def measure():
+    """Runs in the child: stream the endpoint and print bytes, seconds and peak RSS."""
+    from app import app
+
+    client = app.test_client()
+    start = time.perf_counter()
+    response = client.get('/api/orders/details')
+    total = 0
+    for chunk in response.response:
+        total += len(chunk)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"bytes": total, "seconds": elapsed, "peak_rss_mb": peak_kb / 1024}))
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ["--child"]:
+        measure()
+        sys.exit(0)
+
+    from benchdb import BENCH_DB, connect
+    from bench_order_summary import seed
+
+    sizes = [int(a) for a in sys.argv[1:]] or [10000, 100000, 500000]
+    for count in sizes:
+        conn = connect()
+        seed(conn, count)
+        conn.close()
+
+        env = dict(os.environ, MYSQL_DB=BENCH_DB)
+        output = subprocess.run([sys.executable, __file__, "--child"], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{count:>8} orders: {result['bytes'] / 1e6:8.1f} MB streamed in "
+              f"{result['seconds']:6.2f}s, peak RSS {result['peak_rss_mb']:7.1f} MB")
@@ -0,0 +1,94 @@
+"""
+Admin dashboard benchmark: the original GROUP BY-over-track query against reads
+from the maintained order_summary projection, at several order-history sizes.
+
+Usage:
+    python benchmarks/bench_order_summary.py [sizes...]   (default 10000 100000 1000000)
+"""
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchdb import connect, insert_chunks, recreate_tables, run_sql_file
+from order_summary import build_dashboard_query, dashboard_cursor
+
+STATUSES = ["Pending", "Processing", "Shipped", "Delivered"]
+
+LEGACY_QUERY = '''
+    SELECT o.order_id AS product_id, o.status, o.batch, t.customer_name, t.customer_contact,
+           t.product_name, o.date_created, t.customer_email
+    FROM orders o
+    LEFT JOIN (
+        SELECT order_id, MAX(customer_name) AS customer_name, MAX(customer_contact) AS customer_contact,
+               MAX(product_name) AS product_name, MAX(customer_email) AS customer_email
+        FROM track
+        GROUP BY order_id
+    ) t ON o.order_id = t.order_id
+    ORDER BY o.batch IS NULL DESC, o.batch, o.date_created DESC
+'''
+
+
+def generate_orders(count, rng):
+    start = datetime.datetime(2023, 1, 1)
+    for i in range(count):
+        batch = None if rng.random() < 0.2 else f"Batch {rng.randint(1, max(1, count // 200))}"
+        yield (f"ORD-{i:08d}", rng.choice(STATUSES), batch, start + datetime.timedelta(minutes=i))
+
+
+def generate_track(count, rng):
+    for i in range(count):
+        for item in range(rng.randint(1, 3)):
+            yield (f"ORD-{i:08d}", f"Customer {i}", f"c{i}@example.com", f"0803{i:07d}",
+                   f"Product {rng.randint(1, 500)}", str(rng.randint(36, 46)), 1, 15000, "Pending")
+
+
+def seed(conn, count):
+    rng = random.Random(7)
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS order_summary")
+    cursor.close()
+    recreate_tables(conn, "orders", "track")
+    insert_chunks(conn, "INSERT INTO orders (order_id, status, batch, date_created) VALUES (%s, %s, %s, %s)",
+                  generate_orders(count, rng))
+    insert_chunks(conn, "INSERT INTO track (order_id, customer_name, customer_email, customer_contact, product_name, product_size, product_quantity, total_amount, status) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                  generate_track(count, rng))
+    # Creates the projection, its triggers and backfills it
+    run_sql_file(conn, "migrations", "0004_order_summary.sql")
+
+
+def timed(label, fn, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows = fn()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"  {label:<34} {elapsed:10.2f} ms  ({rows} rows)")
+
+
+def query(conn, sql, params=()):
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [10000, 100000, 1000000]
+    conn = connect()
+    for count in sizes:
+        print(f"{count} orders (seeding...)")
+        seed(conn, count)
+        timed("legacy GROUP BY query (all rows)", lambda: len(query(conn, LEGACY_QUERY)), repeat=1)
+        timed("order_summary (all rows)", lambda: len(query(conn, *build_dashboard_query({})[:2])), repeat=1)
+        timed("order_summary first page of 50", lambda: len(query(conn, *build_dashboard_query({'limit': 50})[:2])))
+        page = query(conn, *build_dashboard_query({'limit': 50})[:2])
+        after = dashboard_cursor(page[49])
+        timed("order_summary next page of 50", lambda: len(query(conn, *build_dashboard_query({'limit': 50, 'cursor': after})[:2])))
+        timed("order_summary status=Shipped page", lambda: len(query(conn, *build_dashboard_query({'limit': 50, 'status': 'Shipped'})[:2])))
+        timed("order_summary batch page", lambda: len(query(conn, *build_dashboard_query({'limit': 50, 'batch': 'Batch 1'})[:2])))
+    conn.close()
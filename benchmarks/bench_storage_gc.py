@@ -0,0 +1,92 @@
+"""
+Orphan GC benchmark against the local storage backend.
+
+Creates N synthetic objects (default 100k), of which a fraction is referenced
+by products, then times a dry run and a real collection and reports the peak
+memory of the referenced-ID set against holding the plain strings. With --db
+the references are seeded into the benchmark database and loaded with
+load_referenced, as the real job does.
+
+Usage:
+    python benchmarks/bench_storage_gc.py [objects] [--db]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage import LocalStorage
+from storage_gc import collect_orphans, file_id_digest, load_referenced, ReferencedIds
+
+REFERENCED_FRACTION = 0.6
+
+
+def create_objects(storage, count):
+    old = time.time() - 7 * 86400
+    file_ids = []
+    for i in range(count):
+        # Spread over subdirectories like a real bucket prefix layout
+        file_id = f"{storage.folder}/{i % 256:02x}/{i:032x}.webp"
+        path = os.path.join(storage.root, file_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb"):
+            pass
+        os.utime(path, (old, old))
+        file_ids.append(file_id)
+    return file_ids
+
+
+def seed_products(file_ids):
+    from benchdb import connect, recreate_tables, run_sql_file, insert_chunks
+
+    conn = connect()
+    recreate_tables(conn, "productlist")
+    run_sql_file(conn, "migrations", "0007_image_status.sql")
+    run_sql_file(conn, "migrations", "0008_image_variants.sql")
+    insert_chunks(conn, "INSERT INTO productlist (name, price, category, file_id) VALUES (%s, %s, %s, %s)",
+                  ((f"GC product {i}", 1000, "slides", file_id) for i, file_id in enumerate(file_ids)))
+    return conn
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 100000
+    use_db = "--db" in sys.argv
+
+    storage = LocalStorage(tempfile.mkdtemp(prefix="bench-gc-"))
+    start = time.perf_counter()
+    file_ids = create_objects(storage, count)
+    print(f"created {count} objects in {time.perf_counter() - start:.1f}s")
+    kept = file_ids[:int(count * REFERENCED_FRACTION)]
+
+    tracemalloc.start()
+    # Fresh copies, as if each ID had been read from the database
+    plain = {file_id.encode().decode() for file_id in kept}
+    plain_bytes = tracemalloc.get_traced_memory()[0]
+    del plain
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    if use_db:
+        conn = seed_products(kept)
+        referenced = load_referenced(conn)
+        conn.close()
+    else:
+        referenced = ReferencedIds(file_id_digest(file_id) for file_id in kept)
+    hashed_bytes = tracemalloc.get_traced_memory()[0]
+    hashed_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"referenced set: {len(referenced)} ids, {hashed_bytes / 1e6:.2f} MB hashed "
+          f"(peak {hashed_peak / 1e6:.1f} MB while building) vs {plain_bytes / 1e6:.1f} MB as a set of strings")
+
+    for dry_run in (True, False):
+        start = time.perf_counter()
+        report = collect_orphans(storage, referenced, dry_run=dry_run, rate=0)
+        report.pop("sample")
+        print(f"{'dry run' if dry_run else 'collect':<8} {time.perf_counter() - start:6.1f}s {report}")
+
+    remaining = sum(len(page) for page in storage.list_files())
+    print(f"remaining objects: {remaining} (expected {len(kept)})")
@@ -0,0 +1,79 @@
+"""
+Throughput per gunicorn worker class.
+
+Starts the app under gunicorn.conf.py once per worker class, against the seeded
+benchmark database (benchmarks/seed.py) with the fake storage backend, runs the
+given suite scenarios and prints p50/p95/p99 and throughput for each class.
+Worker count, threads etc. come from the usual GUNICORN_* variables, so the
+classes can also be compared at a fixed WEB_CONCURRENCY.
+
+Usage:
+    python benchmarks/bench_workers.py [sync,gthread,gevent] [--scenarios storefront,tracking]
+        [--duration 15] [--threads 32] [--port 8100]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchdb import BENCH_DB, ROOT
+from run_suite import run_scenario, scenarios
+
+
+def start_server(worker_class, port):
+    env = dict(os.environ, GUNICORN_WORKER_CLASS=worker_class, PORT=str(port),
+               MYSQL_DB=BENCH_DB, STORAGE_BACKEND="fake")
+    process = subprocess.Popen(["gunicorn", "-c", "gunicorn.conf.py", "app:app"], cwd=ROOT, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {process.returncode}")
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"gunicorn ({worker_class}) didn't become healthy")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare gunicorn worker classes")
+    parser.add_argument("worker_classes", nargs="?", default="sync,gthread,gevent")
+    parser.add_argument("--scenarios", default="storefront,tracking")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent clients per scenario")
+    parser.add_argument("--orders", type=int, default=50000, help="Order count the database was seeded with")
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    results = {}
+    for worker_class in args.worker_classes.split(','):
+        if worker_class == "gevent":
+            try:
+                import gevent  # noqa: F401
+            except ImportError:
+                # gunicorn.conf.py would quietly fall back to gthread
+                print("#### gevent: not installed, skipped ####")
+                continue
+        print(f"#### {worker_class} ####")
+        process, base_url = start_server(worker_class, args.port)
+        try:
+            available = scenarios(base_url, args.orders, args.threads, args.duration)
+            for scenario in args.scenarios.split(','):
+                endpoints = run_scenario(scenario, available[scenario](), args.threads, args.duration)
+                results[worker_class, scenario] = sum(result["rps"] or 0 for result in endpoints.values())
+        finally:
+            process.terminate()
+            process.wait(timeout=60)
+
+    print("== total throughput (req/s) ==")
+    for (worker_class, scenario), rps in results.items():
+        print(f"{worker_class:<10} {scenario:<12} {rps:8.1f}")
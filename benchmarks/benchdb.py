@@ -0,0 +1,101 @@
+"""
+Shared helpers for the database benchmarks: connections to a throwaway database
+(MYSQL_BENCH_DB, default dfootprint_bench), the base tables and migration loading.
+"""
+import os
+import re
+import sys
+
+import MySQLdb
+from dotenv import load_dotenv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from migrate import load_migrations, split_sql
+
+load_dotenv()
+
+BENCH_DB = os.getenv("MYSQL_BENCH_DB", "dfootprint_bench")
+
+MIGRATIONS = load_migrations()
+_BASE_VERSIONS = ("0001", "0002")
+_TABLE_NAME = re.compile(r"^CREATE TABLE IF NOT EXISTS (\w+)")
+_INDEX_TABLE = re.compile(r"^CREATE (?:UNIQUE )?INDEX \w+ ON (\w+)")
+
+
+def _base_statements(pattern):
+    statements = {}
+    for version, _, sql in MIGRATIONS:
+        if version in _BASE_VERSIONS:
+            for statement in split_sql(sql):
+                match = pattern.match(statement)
+                if match:
+                    statements.setdefault(match.group(1), []).append(statement)
+    return statements
+
+
+# The original tables (0001) with the lookup indexes added right after them (0002)
+BASE_TABLES = {name: statements[0] for name, statements in _base_statements(_TABLE_NAME).items()}
+BASE_INDEXES = _base_statements(_INDEX_TABLE)
+
+# Schema changes layered on the base tables, in migration order
+SCHEMA_FILES = tuple(f"{version}_{name}.sql" for version, name, _ in MIGRATIONS if version not in _BASE_VERSIONS)
+
+
+def connect(db=BENCH_DB, create=True):
+    kwargs = {
+        "host": os.getenv("MYSQL_HOST", "127.0.0.1"),
+        "port": int(os.getenv("MYSQL_PORT", 3306)),
+        "user": os.getenv("MYSQL_USER", "root"),
+        "passwd": os.getenv("MYSQL_PASSWORD", ""),
+    }
+    if db and create:
+        server = MySQLdb.connect(**kwargs)
+        server.cursor().execute(f"CREATE DATABASE IF NOT EXISTS `{db}`")
+        server.close()
+    if db:
+        kwargs["db"] = db
+    return MySQLdb.connect(**kwargs)
+
+
+def run_sql_file(conn, *path):
+    with open(os.path.join(ROOT, *path)) as f:
+        statements = split_sql(f.read())
+    cursor = conn.cursor()
+    for statement in statements:
+        cursor.execute(statement)
+    conn.commit()
+    cursor.close()
+
+
+def apply_schema(conn):
+    """Run every migration in SCHEMA_FILES against freshly created base tables."""
+    for name in SCHEMA_FILES:
+        run_sql_file(conn, "migrations", name)
+
+
+def recreate_tables(conn, *names):
+    cursor = conn.cursor()
+    for name in names:
+        cursor.execute(f"DROP TABLE IF EXISTS {name}")
+        cursor.execute(BASE_TABLES[name])
+        for statement in BASE_INDEXES.get(name, ()):
+            cursor.execute(statement)
+    conn.commit()
+    cursor.close()
+
+
+def insert_chunks(conn, sql, rows, chunk=5000):
+    """executemany ``rows`` (any iterable) in chunks, committing once at the end."""
+    cursor = conn.cursor()
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == chunk:
+            cursor.executemany(sql, batch)
+            batch = []
+    if batch:
+        cursor.executemany(sql, batch)
+    conn.commit()
+    cursor.close()
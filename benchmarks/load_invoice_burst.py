@@ -0,0 +1,68 @@
+"""
+Catalog latency under an invoice burst.
+
+Measures /api/product-list and /health latency on their own, then again while
+other clients hammer /api/orders/invoice with distinct (uncacheable) orders.
+With the render pool in place the catalog p99 should stay roughly flat and
+excess invoice requests should get 503 + Retry-After.
+
+Usage:
+    python benchmarks/load_invoice_burst.py http://127.0.0.1:8000 [duration] [invoice_threads]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_invoice import sample_invoice
+from loadlib import Workload, summarize
+
+
+def invoice_payload(i):
+    data = sample_invoice(20)
+    return {
+        'id': f"ORD-{i:08d}",
+        'date_created': data['date'],
+        'name': data['name'],
+        'email': data['email'],
+        'number': data['number'],
+        'Delivery Company': data['Delivery Company'],
+        'State': data['State'],
+        'Location': data['Location'],
+        'Pickup Address': data['Pickup Address'],
+        'items': data['items'],
+        'subtotal': data['subtotal'],
+        'tax': data['tax'],
+        'total': data['total'],
+    }
+
+
+def catalog_workloads(base_url, duration):
+    return [
+        Workload(lambda s, i: s.get(f"{base_url}/api/product-list"), threads=4, duration=duration),
+        Workload(lambda s, i: s.get(f"{base_url}/health"), threads=2, duration=duration),
+    ]
+
+
+if __name__ == '__main__':
+    base_url = sys.argv[1].rstrip('/') if len(sys.argv) > 1 else "http://127.0.0.1:8000"
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 15
+    invoice_threads = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+
+    print("== baseline (no invoices) ==")
+    catalog, health = [w.start() for w in catalog_workloads(base_url, duration)]
+    catalog.join(), health.join()
+    summarize("/api/product-list", catalog.latencies, catalog.errors, duration)
+    summarize("/health", health.latencies, health.errors, duration)
+
+    print(f"== with {invoice_threads} concurrent invoice clients ==")
+    invoices = Workload(
+        lambda s, i: s.post(f"{base_url}/api/orders/invoice", json=invoice_payload(i)),
+        threads=invoice_threads, duration=duration,
+    ).start()
+    catalog, health = [w.start() for w in catalog_workloads(base_url, duration)]
+    invoices.join(), catalog.join(), health.join()
+    summarize("/api/product-list", catalog.latencies, catalog.errors, duration)
+    summarize("/health", health.latencies, health.errors, duration)
+    summarize("/api/orders/invoice", invoices.latencies, invoices.errors, duration)
+    print(f"invoice statuses: {invoices.statuses}")
@@ -0,0 +1,82 @@
+"""
+Login under a credential-stuffing flood.
+
+Attacker threads post random email/password pairs, half from one fixed IP and
+half spread over random X-Forwarded-For addresses (the server's default
+PROXY_FIX_X_FOR=1 counts those as distinct clients). Meanwhile a legitimate
+admin logs in from its own address. Reports status counts and latency for
+both, which shows the limiter answering the flood with cheap 429s and whether
+real logins stay fast.
+
+Also prints the cost of one password check per hash method, to help choose
+PASSWORD_HASH_METHOD for the server's CPU.
+
+Usage:
+    python benchmarks/load_login_flood.py http://127.0.0.1:8000 admin@example.com PASSWORD [duration] [threads]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from loadlib import Workload, summarize
+
+HASH_METHODS = ("pbkdf2:sha256:600000", "scrypt:16384:8:1", "scrypt:32768:8:1")
+
+
+def hash_costs(rounds=5):
+    for method in HASH_METHODS:
+        password_hash = generate_password_hash("correct horse", method=method)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            check_password_hash(password_hash, "battery staple")
+        print(f"{method:<22} {(time.perf_counter() - start) / rounds * 1000:7.1f} ms per check")
+
+
+def attacker(base_url, spread_ips):
+    def make_request(session, i):
+        headers = {}
+        if spread_ips:
+            headers['X-Forwarded-For'] = f"10.{random.randrange(256)}.{random.randrange(256)}.{random.randrange(1, 255)}"
+        else:
+            headers['X-Forwarded-For'] = "203.0.113.7"
+        return session.post(f"{base_url}/login", headers=headers, json={
+            'email': f"user{random.randrange(10 ** 6)}@example.com",
+            'password': f"guess{i}",
+        })
+    return make_request
+
+
+def legitimate(base_url, email, password):
+    def make_request(session, i):
+        return session.post(f"{base_url}/login", headers={'X-Forwarded-For': "198.51.100.20"},
+                            json={'email': email, 'password': password})
+    return make_request
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 4:
+        sys.exit(__doc__)
+    base_url, email, password = sys.argv[1].rstrip('/'), sys.argv[2], sys.argv[3]
+    duration = float(sys.argv[4]) if len(sys.argv) > 4 else 15
+    threads = int(sys.argv[5]) if len(sys.argv) > 5 else 16
+
+    hash_costs()
+
+    fixed = Workload(attacker(base_url, False), threads=threads // 2, duration=duration,
+                     ok_statuses=(401, 429)).start()
+    spread = Workload(attacker(base_url, True), threads=threads - threads // 2, duration=duration,
+                      ok_statuses=(401, 429)).start()
+    admin = Workload(legitimate(base_url, email, password), threads=1, duration=duration).start()
+    fixed.join(), spread.join(), admin.join()
+
+    summarize("flood, one IP", fixed.latencies, fixed.errors, duration)
+    print(f"  statuses: {fixed.statuses}")
+    summarize("flood, spread IPs", spread.latencies, spread.errors, duration)
+    print(f"  statuses: {spread.statuses}")
+    summarize("legitimate login", admin.latencies, admin.errors, duration)
+    print(f"  statuses: {admin.statuses}")
@@ -0,0 +1,60 @@
+"""
+Order-tracking polling load.
+
+Many clients poll the same handful of order IDs, the way open tracking pages
+do. Compares the old two-call pattern (/api/orders + /api/orders/metadata) with
+/api/orders/tracking, with and without If-None-Match revalidation.
+
+Usage:
+    python benchmarks/load_tracking.py http://127.0.0.1:8000 ORD-XXXXXXXX[,ORD-...] [duration] [threads]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loadlib import Workload, summarize
+
+
+def legacy_poll(base_url, order_ids):
+    def make_request(session, i):
+        order_id = order_ids[i % len(order_ids)]
+        response = session.get(f"{base_url}/api/orders", params={'order_id': order_id})
+        if response.status_code != 200:
+            return response
+        return session.get(f"{base_url}/api/orders/metadata", params={'order_id': order_id})
+    return make_request
+
+
+def tracking_poll(base_url, order_ids, revalidate):
+    def make_request(session, i):
+        order_id = order_ids[i % len(order_ids)]
+        # Each session remembers the ETags it has seen, like a browser would
+        etags = session.__dict__.setdefault('tracking_etags', {})
+        headers = {}
+        if revalidate and order_id in etags:
+            headers['If-None-Match'] = etags[order_id]
+        response = session.get(f"{base_url}/api/orders/tracking", params={'order_id': order_id}, headers=headers)
+        if response.headers.get('ETag'):
+            etags[order_id] = response.headers['ETag']
+        return response
+    return make_request
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        sys.exit(__doc__)
+    base_url = sys.argv[1].rstrip('/')
+    order_ids = sys.argv[2].split(',')
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 15
+    threads = int(sys.argv[4]) if len(sys.argv) > 4 else 32
+
+    runs = [
+        ("legacy (2 calls)", legacy_poll(base_url, order_ids)),
+        ("tracking", tracking_poll(base_url, order_ids, revalidate=False)),
+        ("tracking + If-None-Match", tracking_poll(base_url, order_ids, revalidate=True)),
+    ]
+    for label, make_request in runs:
+        workload = Workload(make_request, threads=threads, duration=duration).start().join()
+        summarize(label, workload.latencies, workload.errors, duration)
+        print(f"  statuses: {workload.statuses}")
@@ -0,0 +1,82 @@
+"""
+Small helpers shared by the load-test scripts: a timed HTTP worker loop and
+latency percentiles.
+"""
+import threading
+import time
+
+import requests
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(label, samples, errors=0, elapsed=None):
+    line = (f"{label:<28} n={len(samples):<6} "
+            f"p50={percentile(samples, 50) * 1000:7.1f}ms "
+            f"p95={percentile(samples, 95) * 1000:7.1f}ms "
+            f"p99={percentile(samples, 99) * 1000:7.1f}ms errors={errors}")
+    if elapsed:
+        line += f" rps={len(samples) / elapsed:.1f}"
+    print(line)
+    return {
+        "count": len(samples),
+        "errors": errors,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "rps": len(samples) / elapsed if elapsed else None,
+    }
+
+
+class Workload:
+    """Run ``make_request(session, i)`` from ``threads`` threads until ``duration`` elapses."""
+
+    def __init__(self, make_request, threads=4, duration=10.0, ok_statuses=(200, 304)):
+        self.make_request = make_request
+        self.threads = threads
+        self.duration = duration
+        self.ok_statuses = ok_statuses
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _worker(self, stop_at, worker_id):
+        session = requests.Session()
+        i = worker_id
+        while time.time() < stop_at:
+            start = time.perf_counter()
+            try:
+                response = self.make_request(session, i)
+                status = response.status_code
+            except requests.RequestException:
+                status = None
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+                if status in self.ok_statuses:
+                    self.latencies.append(elapsed)
+                else:
+                    self.errors += 1
+            i += self.threads
+
+    def start(self):
+        stop_at = time.time() + self.duration
+        self._workers = [
+            threading.Thread(target=self._worker, args=(stop_at, n), daemon=True)
+            for n in range(self.threads)
+        ]
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def join(self):
+        for worker in self._workers:
+            worker.join()
+        return self
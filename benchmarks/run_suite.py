@@ -0,0 +1,175 @@
+"""
+Scripted workload suite against a running app, with results kept for comparison.
+
+Start the app against the seeded benchmark database and the fake storage
+backend, e.g.
+
+    MYSQL_DB=dfootprint_bench STORAGE_BACKEND=fake gunicorn app:app -b 127.0.0.1:8000
+
+then run the suite. Each scenario drives its endpoints concurrently for
+``--duration`` seconds and reports p50/p95/p99 and throughput per endpoint.
+Results are written to benchmarks/results/<name>.json; with ``--baseline`` the
+run is compared against an earlier file and exits non-zero if any endpoint's
+p95 or throughput regressed by more than ``--threshold``.
+
+Usage:
+    python benchmarks/run_suite.py http://127.0.0.1:8000 [--scenarios storefront,tracking,dashboard,invoices]
+        [--duration 15] [--threads 16] [--orders 50000] [--name NAME] [--baseline results/main.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_invoice_burst import invoice_payload
+from load_tracking import tracking_poll
+from loadlib import Workload, summarize
+from seed import ADMIN_EMAIL, ADMIN_PASSWORD, CATEGORIES
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def catalog_browse(base_url):
+    """Page through /api/catalog by category, following next_cursor like a shopper scrolling."""
+    def make_request(session, i):
+        state = session.__dict__.setdefault('catalog_state', {})
+        params = {'category': CATEGORIES[i % len(CATEGORIES)], 'limit': 24, 'fields': 'id,name,price,images'}
+        if state.get('cursor') and state.get('pages', 0) < 5:
+            params = dict(state['params'], cursor=state['cursor'])
+        else:
+            state['pages'] = 0
+        response = session.get(f"{base_url}/api/catalog", params=params)
+        if response.status_code == 200:
+            state.update(params=params, cursor=response.json().get('next_cursor'), pages=state['pages'] + 1)
+        return response
+    return make_request
+
+
+def login(base_url):
+    import requests
+    response = requests.post(f"{base_url}/login", json={'email': ADMIN_EMAIL, 'password': ADMIN_PASSWORD})
+    response.raise_for_status()
+    return response.json()['token']
+
+
+def scenarios(base_url, order_count, threads, duration):
+    """Each scenario: a list of (endpoint label, make_request, thread share) run together."""
+    hot_orders = [f"ORD-{i:08d}" for i in range(0, order_count, max(1, order_count // 50))]
+
+    def dashboard():
+        headers = {'Authorization': f"Bearer {login(base_url)}"}
+        statuses = ("Pending", "Processing", "Shipped")
+        return [
+            ("GET /api/products/manage",
+             lambda s, i: s.get(f"{base_url}/api/products/manage",
+                                params={'status': statuses[i % len(statuses)], 'limit': 50}, headers=headers), 0.4),
+            ("GET /orders/grouped",
+             lambda s, i: s.get(f"{base_url}/orders/grouped", params={'limit': 20}, headers=headers), 0.2),
+            ("GET /api/batches", lambda s, i: s.get(f"{base_url}/api/batches", headers=headers), 0.2),
+            ("POST /login",
+             lambda s, i: s.post(f"{base_url}/login", json={'email': ADMIN_EMAIL, 'password': ADMIN_PASSWORD}), 0.2),
+        ]
+
+    return {
+        "storefront": lambda: [
+            ("GET /api/catalog", catalog_browse(base_url), 0.6),
+            ("GET /api/product-list", lambda s, i: s.get(f"{base_url}/api/product-list"), 0.3),
+            ("GET /health", lambda s, i: s.get(f"{base_url}/health"), 0.1),
+        ],
+        "tracking": lambda: [
+            ("GET /api/orders/tracking", tracking_poll(base_url, hot_orders, revalidate=True), 1.0),
+        ],
+        "dashboard": dashboard,
+        "invoices": lambda: [
+            ("POST /api/orders/invoice",
+             lambda s, i: s.post(f"{base_url}/api/orders/invoice", json=invoice_payload(i)), 0.5),
+            ("GET /api/catalog", catalog_browse(base_url), 0.5),
+        ],
+    }
+
+
+def run_scenario(name, endpoints, threads, duration):
+    print(f"== {name} ==")
+    workloads = [
+        (label, Workload(make_request, threads=max(1, round(threads * share)), duration=duration,
+                         ok_statuses=(200, 202, 304)).start())
+        for label, make_request, share in endpoints
+    ]
+    results = {}
+    for label, workload in workloads:
+        workload.join()
+        results[label] = summarize(label, workload.latencies, workload.errors, duration)
+        results[label]["statuses"] = {str(status): count for status, count in workload.statuses.items()}
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold):
+    """Print p95/throughput deltas per endpoint; returns the regressed endpoints."""
+    regressions = []
+    print(f"== compared with baseline {baseline['meta'].get('name')} ({baseline['meta'].get('revision')}) ==")
+    for scenario, endpoints in current["scenarios"].items():
+        for label, result in endpoints.items():
+            before = baseline["scenarios"].get(scenario, {}).get(label)
+            if not before or not before["p95_ms"] or not before["rps"]:
+                continue
+            p95_change = result["p95_ms"] / before["p95_ms"] - 1
+            rps_change = (result["rps"] or 0) / before["rps"] - 1
+            regressed = p95_change > threshold or rps_change < -threshold
+            print(f"{scenario + ' ' + label:<44} p95 {before['p95_ms']:7.1f} -> {result['p95_ms']:7.1f}ms "
+                  f"({p95_change:+.0%})  rps {before['rps']:7.1f} -> {result['rps'] or 0:7.1f} "
+                  f"({rps_change:+.0%}){'  REGRESSED' if regressed else ''}")
+            if regressed:
+                regressions.append(f"{scenario} {label}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the benchmark workload suite")
+    parser.add_argument("base_url", nargs="?", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenarios", default="storefront,tracking,dashboard,invoices")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--orders", type=int, default=50000, help="Order count the database was seeded with")
+    parser.add_argument("--name", help="Results file name (default: timestamp and revision)")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip('/')
+    available = scenarios(base_url, args.orders, args.threads, args.duration)
+    revision = git_revision()
+    started = datetime.datetime.now(datetime.timezone.utc)
+    name = args.name or f"{started:%Y%m%dT%H%M%S}-{revision or 'unknown'}"
+
+    report = {
+        "meta": {"name": name, "revision": revision, "started_at": started.isoformat(),
+                 "base_url": base_url, "duration": args.duration, "threads": args.threads},
+        "scenarios": {},
+    }
+    for scenario in args.scenarios.split(','):
+        if scenario not in available:
+            sys.exit(f"Unknown scenario {scenario}; choose from {', '.join(available)}")
+        report["scenarios"][scenario] = run_scenario(scenario, available[scenario](), args.threads, args.duration)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{name}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(f"{len(regressions)} endpoint(s) regressed: {', '.join(regressions)}")
@@ -0,0 +1,85 @@
+"""
+Create and fill the benchmark database at a chosen scale.
+
+Drops and recreates productlist, orders, track and admins, bulk-loads
+deterministic data (same seed, same rows), then applies the later migrations so
+projections, indexes and backfills match production. Order IDs are
+ORD-00000000 upwards; the admin logs in as bench@example.com / benchpass.
+
+Usage:
+    python benchmarks/seed.py [--products 2000] [--orders 50000] [--admins 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.security import generate_password_hash
+
+from bench_order_summary import generate_orders, generate_track
+from benchdb import BASE_TABLES, SCHEMA_FILES, apply_schema, connect, insert_chunks, recreate_tables
+
+ADMIN_EMAIL = "bench@example.com"
+ADMIN_PASSWORD = "benchpass"
+CATEGORIES = ("slides", "sandals", "sneakers", "loafers", "boots")
+FAKE_STORAGE_URL = "https://fake.storage.local"
+
+# Tables created by the schema files, dropped before the base tables they depend on
+DERIVED_TABLES = ("order_summary", "outbox", "storage_reconciliation", "batches")
+
+
+def generate_products(count, rng):
+    for i in range(count):
+        sizes = list(range(38, 46))
+        disabled = rng.sample(sizes, rng.randint(0, 2))
+        file_id = f"dfootprint/bench-{i:06d}.jpg"
+        yield (f"Bench {CATEGORIES[i % len(CATEGORIES)].title()} {i}", rng.randint(50, 400) * 100,
+               CATEGORIES[i % len(CATEGORIES)], f"{FAKE_STORAGE_URL}/{file_id}",
+               ",".join(map(str, sizes)), "Generated for benchmarks", ",".join(map(str, disabled)), file_id)
+
+
+def generate_admins(count):
+    method = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    password_hash = generate_password_hash(ADMIN_PASSWORD, method=method)
+    yield (ADMIN_EMAIL, password_hash)
+    for i in range(1, count):
+        yield (f"admin{i}@example.com", password_hash)
+
+
+def seed_all(conn, products, orders, admins):
+    rng = random.Random(7)
+    cursor = conn.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    for name in DERIVED_TABLES:
+        cursor.execute(f"DROP TABLE IF EXISTS {name}")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cursor.close()
+    recreate_tables(conn, *BASE_TABLES)
+
+    insert_chunks(conn, "INSERT INTO productlist (name, price, category, image, size, description, disabledSizes, file_id) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+                  generate_products(products, rng))
+    insert_chunks(conn, "INSERT INTO orders (order_id, status, batch, date_created) VALUES (%s, %s, %s, %s)",
+                  generate_orders(orders, rng))
+    insert_chunks(conn, "INSERT INTO track (order_id, customer_name, customer_email, customer_contact, product_name, product_size, product_quantity, total_amount, status) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                  generate_track(orders, rng))
+    insert_chunks(conn, "INSERT INTO admins (email, password) VALUES (%s, %s)", generate_admins(admins))
+    apply_schema(conn)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--admins", type=int, default=5)
+    args = parser.parse_args()
+
+    conn = connect()
+    start = time.perf_counter()
+    seed_all(conn, args.products, args.orders, max(1, args.admins))
+    conn.close()
+    print(f"Seeded {args.products} products, {args.orders} orders and {max(1, args.admins)} admins "
+          f"with {len(SCHEMA_FILES)} migrations in {time.perf_counter() - start:.1f}s")
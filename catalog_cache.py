@@ -0,0 +1,52 @@
+import threading
+import hashlib
+import time
+
+
+class CatalogCache:
+    """
+    Versioned in-process cache of the serialized product catalog.
+
+    Holds the JSON body and its strong ETag. Writes made through this process call
+    ``invalidate()``; the TTL bounds staleness for edits made elsewhere (other
+    workers or direct database changes). Concurrent misses share a single reload.
+    """
+
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self.version = 0
+        self._body = None
+        self._etag = None
+        self._loaded_at = 0.0
+        self._loaded_version = -1
+        self._lock = threading.Lock()
+
+    def _fresh(self):
+        return (self._body is not None
+                and self._loaded_version == self.version
+                and time.monotonic() - self._loaded_at < self.ttl)
+
+    def get(self, loader):
+        """
+        Return ``(body, etag)`` for the catalog, calling ``loader()`` on a miss.
+
+        Args:
+            loader: Callable returning the serialized catalog as bytes.
+        """
+        if self._fresh():
+            return self._body, self._etag
+
+        with self._lock:
+            if self._fresh():
+                return self._body, self._etag
+            version = self.version
+            body = loader()
+            self._body = body
+            self._etag = hashlib.sha1(body).hexdigest()
+            self._loaded_at = time.monotonic()
+            self._loaded_version = version
+            return body, self._etag
+
+    def invalidate(self):
+        """Drop the cached catalog after a product write."""
+        self.version += 1
@@ -0,0 +1,146 @@
+from keyset import encode_cursor as _encode_keyset, decode_cursor as _decode_keyset, CursorError
+from images import srcset
+
+CATALOG_FIELDS = ('id', 'name', 'price', 'image', 'description', 'category', 'size', 'disabledSizes', 'images')
+
+# Fields computed from other columns rather than selected directly
+_DERIVED_FIELDS = {
+    'images': ('image_variants', 'image'),
+}
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+# Sort name -> (column, direction). Every sort also orders by id to stay unique.
+CATALOG_SORTS = {
+    'newest': ('id', 'DESC'),
+    'price_asc': ('price', 'ASC'),
+    'price_desc': ('price', 'DESC'),
+}
+
+# `size` and `disabledSizes` hold lists such as "40,41,42" or '["40","41"]'.
+# Strip the list punctuation so FIND_IN_SET can match a single size.
+_SIZE_LIST_SQL = "REPLACE(REPLACE(REPLACE(REPLACE(COALESCE({col}, ''), ' ', ''), '[', ''), ']', ''), '\"', '')"
+
+
+class CatalogQueryError(ValueError):
+    """Raised for invalid catalog query parameters."""
+
+
+def catalog_cursor(sort, row):
+    """Build the opaque cursor pointing just after ``row`` (a dict of the page's last product)."""
+    column = CATALOG_SORTS[sort][0]
+    return _encode_keyset(sort, str(row[column]), row['id'])
+
+
+def decode_cursor(cursor, sort):
+    try:
+        cursor_sort, value, last_id = _decode_keyset(cursor, 3)
+        last_id = int(last_id)
+    except (CursorError, ValueError, TypeError):
+        raise CatalogQueryError("Invalid cursor.")
+    if cursor_sort != sort:
+        raise CatalogQueryError("Cursor does not match the requested sort.")
+    return value, last_id
+
+
+def _parse_price(value, name):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise CatalogQueryError(f"Invalid {name}.")
+
+
+def build_catalog_query(args):
+    """
+    Build the keyset-paginated catalog query from request arguments.
+
+    Args:
+        args: Mapping of query parameters (category, size, min_price, max_price,
+            sort, fields, limit, cursor).
+
+    Returns:
+        tuple: (sql, params, fields, sort, limit, selected), where ``selected`` is
+        the column order of each row (derived fields such as ``images`` are
+        replaced by the columns they are built from). The query fetches ``limit + 1`` rows so the
+        caller can tell whether another page exists.
+    """
+    sort = args.get('sort') or 'newest'
+    if sort not in CATALOG_SORTS:
+        raise CatalogQueryError(f"Sort must be one of: {', '.join(CATALOG_SORTS)}.")
+    sort_column, direction = CATALOG_SORTS[sort]
+
+    try:
+        limit = int(args.get('limit') or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        raise CatalogQueryError("Invalid limit.")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    fields = list(CATALOG_FIELDS)
+    if args.get('fields'):
+        fields = [f.strip() for f in args['fields'].split(',') if f.strip()]
+        unknown = set(fields) - set(CATALOG_FIELDS)
+        if unknown:
+            raise CatalogQueryError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+    # The keyset columns are always needed to build the next cursor
+    columns = []
+    for field in fields:
+        columns.extend(_DERIVED_FIELDS.get(field, (field,)))
+    selected = list(dict.fromkeys(['id', sort_column] + columns))
+
+    where = []
+    params = []
+    if args.get('category'):
+        where.append("category = %s")
+        params.append(args['category'])
+    if args.get('min_price'):
+        where.append("price >= %s")
+        params.append(_parse_price(args['min_price'], 'min_price'))
+    if args.get('max_price'):
+        where.append("price <= %s")
+        params.append(_parse_price(args['max_price'], 'max_price'))
+    if args.get('size'):
+        where.append(f"FIND_IN_SET(%s, {_SIZE_LIST_SQL.format(col='size')}) > 0")
+        where.append(f"FIND_IN_SET(%s, {_SIZE_LIST_SQL.format(col='disabledSizes')}) = 0")
+        params.extend([args['size'], args['size']])
+
+    if args.get('cursor'):
+        value, last_id = decode_cursor(args['cursor'], sort)
+        op = '<' if direction == 'DESC' else '>'
+        if sort_column == 'id':
+            where.append(f"id {op} %s")
+            params.append(last_id)
+        else:
+            where.append(f"({sort_column} {op} %s OR ({sort_column} = %s AND id {op} %s))")
+            params.extend([value, value, last_id])
+
+    order_by = "id DESC" if sort_column == 'id' else f"{sort_column} {direction}, id {direction}"
+    sql = f"SELECT {', '.join(selected)} FROM productlist"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {order_by} LIMIT %s"
+    params.append(limit + 1)
+
+    return sql, tuple(params), fields, sort, limit, selected
+
+
+def catalog_page(selected, rows, fields, sort, limit):
+    """
+    Turn the rows of a ``build_catalog_query`` query into the response page.
+
+    Args:
+        selected: Column order of each row, as returned by build_catalog_query.
+        rows: The fetched rows (up to ``limit + 1``).
+        fields: Fields to return, including derived ones such as ``images``.
+        sort: Sort name, for the next cursor.
+        limit: Page size.
+
+    Returns:
+        tuple: (products, next_cursor), next_cursor None on the last page.
+    """
+    rows = [dict(zip(selected, row)) for row in rows]
+    next_cursor = catalog_cursor(sort, rows[limit - 1]) if len(rows) > limit else None
+    if 'images' in fields:
+        for row in rows:
+            row['images'] = srcset(row.pop('image_variants'), row.get('image'))
+    products = [{field: row[field] for field in fields} for row in rows[:limit]]
+    return products, next_cursor
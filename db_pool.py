@@ -0,0 +1,341 @@
+from collections import deque
+from contextlib import contextmanager
+from flask import g
+import threading
+import time
+import os
+import MySQLdb
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the wait timeout."""
+
+
+class TimedCursor:
+    """Cursor proxy reporting each statement's duration and row count to an observer."""
+
+    def __init__(self, cursor, observer):
+        self._cursor = cursor
+        self._observer = observer
+
+    def _timed(self, method, sql, args):
+        start = time.perf_counter()
+        try:
+            result = method(sql, args)
+        except Exception:
+            self._observer(sql, time.perf_counter() - start, None, True)
+            raise
+        self._observer(sql, time.perf_counter() - start, self._cursor.rowcount, False)
+        return result
+
+    def execute(self, sql, args=None):
+        return self._timed(self._cursor.execute, sql, args)
+
+    def executemany(self, sql, args):
+        return self._timed(self._cursor.executemany, sql, args)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class TimedConnection:
+    """Connection proxy whose cursors are TimedCursors."""
+
+    def __init__(self, conn, observer):
+        self._conn = conn
+        self._observer = observer
+
+    def cursor(self, *args):
+        return TimedCursor(self._conn.cursor(*args), self._observer)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of MySQLdb connections.
+
+    Connections are opened lazily up to ``max_size`` and kept warm down to
+    ``min_size``. On borrow, a connection past ``max_lifetime`` is replaced and one
+    idle for longer than ``ping_after`` seconds is health-checked with ``ping()``.
+    The pool notices when it has been inherited across a fork and starts afresh
+    without touching the parent's sockets.
+
+    If ``query_observer`` is set, connections are wrapped so every statement is
+    reported as ``query_observer(sql, seconds, rowcount, failed)``.
+    """
+
+    def __init__(self, min_size=1, max_size=10, max_lifetime=1800, wait_timeout=10,
+                 ping_after=5, query_observer=None, **connect_kwargs):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.wait_timeout = wait_timeout
+        self.ping_after = ping_after
+        self.query_observer = query_observer
+        self.connect_kwargs = connect_kwargs
+        self._cond = threading.Condition()
+        self._reset_state()
+
+    def _reset_state(self):
+        self._idle = deque()
+        self._size = 0
+        self._waiting = 0
+        self._pid = os.getpid()
+        self._stats = {
+            "borrows": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "created": 0,
+            "closed": 0,
+            "failed_health_checks": 0,
+        }
+
+    def reinit(self):
+        """Forget every connection without closing it; call in a freshly forked child."""
+        with self._cond:
+            self._reset_state()
+
+    def _open(self):
+        conn = MySQLdb.connect(**self.connect_kwargs)
+        if self.query_observer is not None:
+            conn = TimedConnection(conn, self.query_observer)
+        with self._cond:
+            self._stats["created"] += 1
+        return _PooledConnection(conn)
+
+    def _close(self, pooled):
+        with self._cond:
+            self._stats["closed"] += 1
+        try:
+            pooled.conn.close()
+        except MySQLdb.Error:
+            pass
+
+    def _healthy(self, pooled):
+        now = time.monotonic()
+        if self.max_lifetime and now - pooled.created_at > self.max_lifetime:
+            return False
+        if now - pooled.last_used > self.ping_after:
+            try:
+                pooled.conn.ping()
+            except MySQLdb.Error:
+                with self._cond:
+                    self._stats["failed_health_checks"] += 1
+                return False
+        return True
+
+    def acquire(self):
+        """Borrow a connection, waiting up to ``wait_timeout`` seconds for one."""
+        if self._pid != os.getpid():
+            self.reinit()
+
+        start = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                # New arrivals queue behind threads already waiting, so a busy
+                # pool can't starve them by re-borrowing on every release; they
+                # only go first when there's enough for every waiter as well
+                available = len(self._idle) + self.max_size - self._size
+                if waited or self._waiting < available:
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        # Reserve the slot, then connect outside the lock
+                        self._size += 1
+                        pooled = None
+                        break
+                if not waited:
+                    waited = True
+                    self._waiting += 1
+                remaining = self.wait_timeout - (time.monotonic() - start)
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    if not self._idle and self._size >= self.max_size:
+                        self._waiting -= 1
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(f"No database connection available after {self.wait_timeout}s")
+
+            if waited:
+                self._waiting -= 1
+            if self._waiting and (self._idle or self._size < self.max_size):
+                # A release wakes one waiter; pass the wakeup on while more is available
+                self._cond.notify()
+            wait = time.monotonic() - start
+            self._stats["borrows"] += 1
+            if waited:
+                self._stats["waits"] += 1
+            self._stats["wait_seconds_total"] += wait
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], wait)
+
+        if pooled is not None and not self._healthy(pooled):
+            self._close(pooled)
+            pooled = None
+        if pooled is None:
+            try:
+                pooled = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+        return pooled
+
+    def release(self, pooled, discard=False):
+        """Return a borrowed connection, rolling back anything left uncommitted."""
+        if self._pid != os.getpid():
+            return
+        if not discard:
+            try:
+                pooled.conn.rollback()
+            except MySQLdb.Error:
+                discard = True
+
+        with self._cond:
+            if discard:
+                self._size -= 1
+            else:
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+            self._cond.notify()
+        if discard:
+            self._close(pooled)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block."""
+        pooled = self.acquire()
+        try:
+            yield pooled.conn
+        except MySQLdb.OperationalError:
+            self.release(pooled, discard=True)
+            raise
+        except Exception:
+            self.release(pooled)
+            raise
+        else:
+            self.release(pooled)
+
+    def warm(self):
+        """Open connections until ``min_size`` are pooled."""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                pooled = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            self.release(pooled)
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, deque()
+            self._size -= len(idle)
+        for pooled in idle:
+            self._close(pooled)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update(size=self._size, idle=len(self._idle), in_use=self._size - len(self._idle))
+        return stats
+
+
+def connect_from_env():
+    """Open a plain connection from the app's MYSQL_* environment, for CLI scripts."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    kwargs = {
+        "host": os.getenv("MYSQL_HOST", "localhost"),
+        "port": int(os.getenv("MYSQL_PORT", 3306)),
+        "charset": "utf8",
+    }
+    if os.getenv("MYSQL_USER"):
+        kwargs["user"] = os.getenv("MYSQL_USER")
+    if os.getenv("MYSQL_PASSWORD"):
+        kwargs["passwd"] = os.getenv("MYSQL_PASSWORD")
+    if os.getenv("MYSQL_DB"):
+        kwargs["db"] = os.getenv("MYSQL_DB")
+    return MySQLdb.connect(**kwargs)
+
+
+class PooledMySQL:
+    """
+    Drop-in replacement for ``flask_mysqldb.MySQL`` backed by a ConnectionPool.
+
+    ``mysql.connection`` borrows one connection per app context and returns it to
+    the pool at teardown, so route handlers keep using
+    ``mysql.connection.cursor()`` / ``mysql.connection.commit()`` unchanged.
+    """
+
+    def __init__(self, app=None):
+        self.pool = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("MYSQL_HOST", "localhost")
+        app.config.setdefault("MYSQL_PORT", 3306)
+        app.config.setdefault("MYSQL_CONNECT_TIMEOUT", 10)
+        app.config.setdefault("MYSQL_CHARSET", "utf8")
+        app.config.setdefault("MYSQL_POOL_MIN_SIZE", int(os.getenv("MYSQL_POOL_MIN_SIZE", 1)))
+        app.config.setdefault("MYSQL_POOL_MAX_SIZE", int(os.getenv("MYSQL_POOL_MAX_SIZE", 10)))
+        app.config.setdefault("MYSQL_POOL_MAX_LIFETIME", int(os.getenv("MYSQL_POOL_MAX_LIFETIME", 1800)))
+        app.config.setdefault("MYSQL_POOL_WAIT_TIMEOUT", float(os.getenv("MYSQL_POOL_WAIT_TIMEOUT", 10)))
+        app.config.setdefault("MYSQL_POOL_PING_AFTER", float(os.getenv("MYSQL_POOL_PING_AFTER", 5)))
+
+        connect_kwargs = {
+            "host": app.config["MYSQL_HOST"],
+            "port": app.config["MYSQL_PORT"],
+            "connect_timeout": app.config["MYSQL_CONNECT_TIMEOUT"],
+            "charset": app.config["MYSQL_CHARSET"],
+            "use_unicode": True,
+        }
+        if app.config.get("MYSQL_USER"):
+            connect_kwargs["user"] = app.config["MYSQL_USER"]
+        if app.config.get("MYSQL_PASSWORD"):
+            connect_kwargs["passwd"] = app.config["MYSQL_PASSWORD"]
+        if app.config.get("MYSQL_DB"):
+            connect_kwargs["db"] = app.config["MYSQL_DB"]
+
+        self.pool = ConnectionPool(
+            min_size=app.config["MYSQL_POOL_MIN_SIZE"],
+            max_size=app.config["MYSQL_POOL_MAX_SIZE"],
+            max_lifetime=app.config["MYSQL_POOL_MAX_LIFETIME"],
+            wait_timeout=app.config["MYSQL_POOL_WAIT_TIMEOUT"],
+            ping_after=app.config["MYSQL_POOL_PING_AFTER"],
+            **connect_kwargs
+        )
+        app.teardown_appcontext(self.teardown)
+
+    @property
+    def connection(self):
+        """The connection borrowed for the current app context."""
+        if not hasattr(g, "mysql_pooled"):
+            g.mysql_pooled = self.pool.acquire()
+        return g.mysql_pooled.conn
+
+    def teardown(self, exception):
+        pooled = g.pop("mysql_pooled", None)
+        if pooled is not None:
+            self.pool.release(pooled, discard=isinstance(exception, MySQLdb.OperationalError))
@@ -0,0 +1,102 @@
+"""
+Gunicorn deployment profile: ``gunicorn -c gunicorn.conf.py app:app``.
+
+Worker class and count come from the environment, falling back to the CPUs
+available to this process:
+
+    GUNICORN_WORKER_CLASS  gthread (default), sync or gevent
+    WEB_CONCURRENCY        worker processes (set per dyno size on Heroku)
+    GUNICORN_THREADS       threads per gthread worker (default 4)
+    GUNICORN_WORKER_CONNECTIONS  concurrent requests per gevent worker (default 100)
+    GUNICORN_TIMEOUT       seconds before a silent worker is killed (default 120)
+    GUNICORN_MAX_REQUESTS  requests before a worker is recycled (default 1000, 0 disables)
+    GUNICORN_PRELOAD       preload the app in the master (default 1, 0 for gevent)
+
+gthread is the default: requests mostly wait on MySQL, storage and the invoice
+render pool, and threads overlap those waits without gevent's monkey-patching.
+mysqlclient is a C driver that gevent can't make cooperative, so under gevent
+every query blocks the worker's whole event loop; choose it only after
+benchmarking (benchmarks/bench_workers.py).
+
+With preload the app and its heavy imports (ReportLab, Cloudinary, MySQLdb,
+Pillow) load once in the master and are shared copy-on-write. Nothing in
+app.py connects or starts threads at import time; ``post_fork`` resets what
+each worker inherited and warms its connection pool.
+"""
+import os
+
+
+def _cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _worker_class():
+    requested = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+    if requested not in ("sync", "gthread", "gevent"):
+        raise ValueError(f"Unknown GUNICORN_WORKER_CLASS: {requested}")
+    if requested == "gevent":
+        try:
+            import gevent  # noqa: F401
+        except ImportError:
+            print("gevent is not installed; using gthread workers")
+            return "gthread"
+    return requested
+
+
+cpus = _cpu_count()
+worker_class = _worker_class()
+
+if worker_class == "sync":
+    # One request per process: enough processes to keep the CPUs busy while others wait on I/O
+    default_workers = 2 * cpus + 1
+else:
+    # Concurrency comes from threads/greenlets; processes only need to cover the CPUs
+    default_workers = max(2, cpus)
+workers = int(os.getenv("WEB_CONCURRENCY", default_workers))
+threads = int(os.getenv("GUNICORN_THREADS", 4)) if worker_class == "gthread" else 1
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 100))
+
+# Each concurrent request in a worker holds one pooled connection
+os.environ.setdefault("MYSQL_POOL_MAX_SIZE", str(max(10, threads)))
+
+bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
+# gevent must patch the stdlib before the app imports it, so it doesn't preload by default
+preload_app = bool(int(os.getenv("GUNICORN_PRELOAD", 0 if worker_class == "gevent" else 1)))
+
+# Invoice renders can take up to INVOICE_RENDER_TIMEOUT (30s) plus queueing and
+# batch ZIPs stream for longer; only sync workers are killed mid-request by this
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+# Recycle workers to bound slow leaks; jitter keeps them from restarting together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", max(1, max_requests // 10)))
+
+# Heartbeat files on tmpfs so a slow disk can't make healthy workers look dead
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+errorlog = "-"
+accesslog = os.getenv("GUNICORN_ACCESS_LOG")
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    import sys
+
+    # Without preload the worker imports the app itself and has nothing to reset
+    app_module = sys.modules.get("app")
+    if app_module is not None:
+        app_module.reinit_after_fork()
+
+
+def worker_exit(server, worker):
+    import sys
+
+    app_module = sys.modules.get("app")
+    if app_module is not None:
+        app_module.shutdown_worker()
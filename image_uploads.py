@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+from images import process_image, upload_variants, primary_image, variant_file_ids, remove_variants
+import threading
+import tempfile
+import json
+import time
+import os
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+class UploadQueueFull(Exception):
+    """Raised when every upload slot (running and queued) is taken."""
+
+
+def spool_upload(file_storage, spool_dir=None):
+    """
+    Copy an uploaded file to a temporary path that outlives the request.
+
+    Returns:
+        str: Path of the spooled file; the uploader removes it when done.
+    """
+    suffix = os.path.splitext(file_storage.filename or "")[1].lower()
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=suffix, dir=spool_dir)
+    with os.fdopen(fd, "wb") as f:
+        file_storage.save(f)
+    return path
+
+
+def upload_with_retries(storage, path, retries=3, backoff=1.0):
+    """Upload ``path``, retrying failures with exponential backoff; returns (url, file_id)."""
+    for attempt in range(retries + 1):
+        try:
+            return storage.upload(path)
+        except Exception as e:
+            print(f"Error uploading image (attempt {attempt + 1}/{retries + 1}): {e}")
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+class ImageUploader:
+    """
+    Bounded background pool that processes and uploads product images, then
+    patches the row.
+
+    The product is inserted with ``image_status = 'pending'``. The image is
+    resized into its variants (see images.process_image), each upload is retried
+    with exponential backoff, and the row is then set to ``ready`` with its
+    ``image``/``file_id``/``image_variants``, or to ``failed``. If the product was
+    deleted meanwhile, the uploaded files are removed again. Threads are created lazily per process so
+    a pool inherited across a fork is never shared with the parent.
+    """
+
+    def __init__(self, pool, storage, max_workers=2, max_queue=32, retries=3, backoff=1.0,
+                 on_complete=None):
+        self.pool = pool
+        self.storage = storage
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.on_complete = on_complete
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="image-upload")
+                self._pid = os.getpid()
+            return self._executor
+
+    def submit(self, product_id, path):
+        """
+        Queue the spooled file at ``path`` for upload to product ``product_id``.
+
+        Raises:
+            UploadQueueFull: If the pool and its queue are saturated.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise UploadQueueFull()
+        try:
+            future = self._get_executor().submit(self._process, product_id, path)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _upload(self, path):
+        return upload_with_retries(self.storage, path, self.retries, self.backoff)
+
+    def _delete(self, file_ids):
+        try:
+            failed = [file_id for file_id, ok in self.storage.delete_many(file_ids).items() if not ok]
+        except Exception as e:
+            failed = list(file_ids)
+            print(f"Error removing uploaded images: {e}")
+        if failed:
+            print(f"Could not remove uploaded images: {failed}")
+
+    def _process(self, product_id, path):
+        out_dir = None
+        uploaded = []
+        try:
+            try:
+                out_dir, variants = process_image(path)
+
+                def upload(variant_path):
+                    result = self._upload(variant_path)
+                    uploaded.append(result[1])
+                    return result
+
+                stored = upload_variants(upload, variants)
+            except Exception as e:
+                print(f"Error processing image for product {product_id}: {e}")
+                # Don't leave a partial set of variants behind
+                self._delete(uploaded)
+                self._set_status(product_id, FAILED)
+                return FAILED
+
+            image_url, file_id = primary_image(stored)
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''UPDATE productlist
+                                  SET image = %s, file_id = %s, image_variants = %s, image_status = %s
+                                  WHERE id = %s''', (image_url, file_id, json.dumps(stored), READY, product_id))
+                updated = cursor.rowcount
+                conn.commit()
+                cursor.close()
+
+            if not updated:
+                # Deleted while the upload was running; don't leave the files behind
+                print(f"Product {product_id} no longer exists, removing its uploaded images")
+                self._delete(variant_file_ids(stored))
+            return READY
+        except Exception as e:
+            print(f"Error finishing image upload for product {product_id}: {e}")
+            return FAILED
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            if out_dir is not None:
+                remove_variants(out_dir)
+            if self.on_complete is not None:
+                self.on_complete(product_id)
+
+    def _set_status(self, product_id, status):
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("UPDATE productlist SET image_status = %s WHERE id = %s", (status, product_id))
+                conn.commit()
+                cursor.close()
+        except Exception as e:
+            print(f"Error marking product {product_id} image as {status}: {e}")
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=wait)
+            self._executor = None
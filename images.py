@@ -0,0 +1,177 @@
+from PIL import Image, ImageOps
+import tempfile
+import shutil
+import json
+import os
+
+# Variant name -> longest edge in pixels, largest first. Images are never upscaled.
+VARIANTS = (
+    ("full", 1600),
+    ("card", 480),
+    ("thumb", 160),
+)
+
+# Format -> (file extension, Pillow save options)
+FORMATS = {
+    "webp": (".webp", {"quality": 80, "method": 4}),
+    "jpeg": (".jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# Variant and format used for the legacy single `image` URL
+PRIMARY = ("full", "jpeg")
+
+
+class ImageProcessingError(ValueError):
+    """Raised when an upload cannot be decoded as an image."""
+
+
+def _flatten(image):
+    # JPEG has no alpha channel; composite transparent images onto white
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def check_image(path):
+    """
+    Cheaply confirm ``path`` is an image Pillow can decode (reads the header only).
+
+    Raises:
+        ImageProcessingError: If it isn't.
+    """
+    try:
+        with Image.open(path) as image:
+            return image.format
+    except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+        raise ImageProcessingError(f"Unreadable image: {e}")
+
+
+def process_image(path, out_dir=None):
+    """
+    Decode an uploaded image once and write every variant in every format.
+
+    EXIF orientation is applied to the pixels and all metadata is dropped.
+    Each variant is resized from the previous (larger) one rather than from the
+    original, which keeps the smaller sizes cheap.
+
+    Args:
+        path: Path of the uploaded file.
+        out_dir: Directory for the variant files; a new temp dir if omitted.
+            The caller removes it when done.
+
+    Returns:
+        tuple: (out_dir, variants), where ``variants`` maps variant name to
+        ``{"width", "height", "<format>": path, ...}``.
+
+    Raises:
+        ImageProcessingError: If the file is not a readable image.
+    """
+    try:
+        with Image.open(path) as source:
+            # Let the JPEG decoder downscale by a power of two while decoding
+            # when the original is far larger than the biggest variant
+            ratio = VARIANTS[0][1] / max(source.size)
+            if ratio < 1:
+                source.draft("RGB", (int(source.width * ratio) + 1, int(source.height * ratio) + 1))
+            source.load()
+            image = ImageOps.exif_transpose(source)
+    except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+        raise ImageProcessingError(f"Unreadable image: {e}")
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+
+    out_dir = out_dir or tempfile.mkdtemp(prefix="variants-")
+    variants = {}
+    current = image
+    for name, edge in VARIANTS:
+        if max(current.size) > edge:
+            current = current.copy()
+            current.thumbnail((edge, edge), Image.LANCZOS)
+        entry = {"width": current.width, "height": current.height}
+        flat = None
+        for fmt, (ext, options) in FORMATS.items():
+            target = os.path.join(out_dir, f"{name}{ext}")
+            if fmt == "jpeg":
+                flat = flat or _flatten(current)
+                flat.save(target, "JPEG", **options)
+            else:
+                current.save(target, fmt.upper(), **options)
+            entry[fmt] = target
+        variants[name] = entry
+    return out_dir, variants
+
+
+def upload_variants(upload, variants):
+    """
+    Upload processed variants and replace each local path with ``{url, file_id}``.
+
+    Args:
+        upload: Callable taking a file path and returning ``(url, file_id)``.
+        variants: The variants returned by process_image.
+
+    Returns:
+        dict: The stored variants, ready to be saved as ``image_variants``.
+    """
+    stored = {}
+    for name, entry in variants.items():
+        stored[name] = {"width": entry["width"], "height": entry["height"]}
+        for fmt in FORMATS:
+            url, file_id = upload(entry[fmt])
+            stored[name][fmt] = {"url": url, "file_id": file_id}
+    return stored
+
+
+def primary_image(stored):
+    entry = stored[PRIMARY[0]][PRIMARY[1]]
+    return entry["url"], entry["file_id"]
+
+
+def variant_file_ids(variants):
+    """Every stored file id in an ``image_variants`` value (JSON text or dict)."""
+    if not variants:
+        return []
+    if isinstance(variants, (str, bytes)):
+        variants = json.loads(variants)
+    return [
+        entry[fmt]["file_id"]
+        for entry in variants.values()
+        for fmt in FORMATS
+        if fmt in entry
+    ]
+
+
+def srcset(variants, fallback=None):
+    """
+    Build a ``srcset``-ready structure from an ``image_variants`` value.
+
+    Returns:
+        dict: ``{"src", "width", "height", "srcset": {"webp": "...", "jpeg": "..."}}``
+        for use in a ``<picture>`` element, or None when the product has no
+        variants (images uploaded before processing existed); ``fallback`` is
+        then used as ``src`` if given.
+    """
+    if not variants:
+        return {"src": fallback, "srcset": None} if fallback else None
+    if isinstance(variants, (str, bytes)):
+        variants = json.loads(variants)
+    full = variants[PRIMARY[0]]
+    # Small originals produce variants of equal width; list each width once
+    ordered = sorted({entry["width"]: entry for entry in variants.values()}.values(),
+                     key=lambda entry: entry["width"])
+    return {
+        "src": variants.get("card", full)["jpeg"]["url"],
+        "width": full["width"],
+        "height": full["height"],
+        "srcset": {
+            fmt: ", ".join(f"{entry[fmt]['url']} {entry['width']}w" for entry in ordered)
+            for fmt in FORMATS
+        },
+    }
+
+
+def remove_variants(out_dir):
+    shutil.rmtree(out_dir, ignore_errors=True)
@@ -0,0 +1,70 @@
+from cachetools import LRUCache
+import threading
+import hashlib
+import json
+import os
+
+
+class InvoiceCache:
+    """
+    Content-addressed cache of rendered invoice PDFs.
+
+    Entries are keyed on a stable hash of the normalized invoice data, held in a
+    size-bounded LRU in memory and optionally written through to a local directory
+    so they survive worker restarts.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, disk_dir=None, version=""):
+        self.version = version
+        self.disk_dir = disk_dir
+        self._memory = LRUCache(maxsize=max_bytes, getsizeof=len)
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def key_for(self, invoice_data):
+        """Return the hex digest identifying ``invoice_data``."""
+        payload = json.dumps(invoice_data, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(f"{self.version}:{payload}".encode('utf-8')).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pdf")
+
+    def get(self, key):
+        """Return the cached PDF bytes for ``key``, or None."""
+        with self._lock:
+            pdf = self._memory.get(key)
+        if pdf is not None or not self.disk_dir:
+            return pdf
+
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                pdf = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Error reading cached invoice {key}: {e}")
+            return None
+
+        self._remember(key, pdf)
+        return pdf
+
+    def put(self, key, pdf):
+        """Store the PDF bytes for ``key``."""
+        self._remember(key, pdf)
+        if not self.disk_dir:
+            return
+        tmp_path = f"{self._disk_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(pdf)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError as e:
+            print(f"Error writing cached invoice {key}: {e}")
+
+    def _remember(self, key, pdf):
+        # Entries larger than the whole cache are simply not kept in memory
+        if len(pdf) > self._memory.maxsize:
+            return
+        with self._lock:
+            self._memory[key] = pdf
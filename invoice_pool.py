@@ -0,0 +1,117 @@
+from concurrent.futures import ProcessPoolExecutor
+from reciptGen import create_invoice_in_memory, invoice_template
+import multiprocessing
+import threading
+import os
+
+
+class InvoicePoolFull(Exception):
+    """Raised when every render slot (running and queued) is taken."""
+
+
+def _warm_template():
+    invoice_template.load()
+
+
+def _render_invoice(invoice_data):
+    return create_invoice_in_memory(invoice_data).getvalue()
+
+
+class InvoiceRenderPool:
+    """
+    Bounded process pool for CPU-bound invoice rendering.
+
+    At most ``max_workers`` invoices render at once and up to ``max_queue`` more
+    may wait; anything beyond that is rejected immediately with InvoicePoolFull so
+    the caller can shed load instead of tying up its worker. A size of 0 renders
+    inline in the calling process.
+    """
+
+    def __init__(self, max_workers=2, max_queue=8, timeout=30):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue) if max_workers else None
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created lazily and per process, so a pool inherited across a fork
+        # (e.g. a preloaded gunicorn master) is never shared with the parent
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("forkserver"),
+                    initializer=_warm_template,
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def render(self, invoice_data):
+        """
+        Render an invoice in the pool.
+
+        Returns:
+            bytes: The PDF document.
+
+        Raises:
+            InvoicePoolFull: If the pool and its queue are saturated.
+        """
+        if not self.max_workers:
+            return _render_invoice(invoice_data)
+
+        if not self._slots.acquire(blocking=False):
+            raise InvoicePoolFull()
+        try:
+            future = self._get_executor().submit(_render_invoice, invoice_data)
+        except Exception:
+            self._slots.release()
+            raise
+        # The slot stays taken until the render really finishes, even if the
+        # caller stops waiting on a timeout
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result(timeout=self.timeout)
+
+    def reserve(self):
+        """
+        Take one slot for a batch export, which renders its invoices one after another.
+
+        Returns:
+            InvoiceReservation: Renders through the pool on the held slot; call
+            ``release()`` when the export finishes.
+
+        Raises:
+            InvoicePoolFull: If the pool and its queue are saturated.
+        """
+        if self.max_workers and not self._slots.acquire(blocking=False):
+            raise InvoicePoolFull()
+        return InvoiceReservation(self)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class InvoiceReservation:
+    """A render slot held by one batch export for its whole duration."""
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._released = False
+
+    def render(self, invoice_data):
+        """Render an invoice in the pool without taking another slot; returns the PDF bytes."""
+        if not self._pool.max_workers:
+            return _render_invoice(invoice_data)
+        future = self._pool._get_executor().submit(_render_invoice, invoice_data)
+        return future.result(timeout=self._pool.timeout)
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            if self._pool.max_workers:
+                self._pool._slots.release()
@@ -0,0 +1,25 @@
+import base64
+import json
+
+
+class CursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(*values):
+    """Pack the sort-key values of a page's last row into an opaque, URL-safe cursor."""
+    payload = json.dumps([str(v) if v is not None and not isinstance(v, (int, str)) else v for v in values],
+                         separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """Unpack a cursor made by ``encode_cursor``, checking it holds ``size`` values."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise CursorError("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != size:
+        raise CursorError("Invalid cursor.")
+    return values
@@ -0,0 +1,252 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Histograms and counters are kept per process (each gunicorn worker serves its
+own numbers on /metrics). Existing ``stats()`` methods (connection pool,
+outbox, storage) are exported through collectors evaluated at scrape time.
+"""
+from contextlib import contextmanager
+from bisect import bisect_left
+import threading
+import logging
+import json
+import time
+import re
+
+logger = logging.getLogger(__name__)
+
+# Seconds; suits everything from a cached route (~1ms) to a large invoice (~10s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+_QUERY_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+`?(\w+)", re.IGNORECASE)
+
+
+def query_label(sql):
+    """Low-cardinality label for a statement: its verb and first table, e.g. ``SELECT orders``."""
+    sql = sql.lstrip(" \n\t(")
+    verb = sql.split(None, 1)[0].upper() if sql else "UNKNOWN"
+    match = _QUERY_TABLE.search(sql)
+    return f"{verb} {match.group(1)}" if match else verb
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # Per-bucket (non-cumulative) counts, plus sum and count
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels + ("le",), label_values + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, help, labels=()):
+        metric = Counter(name, help, labels)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help, labels, buckets)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """
+        Add a callable run at scrape time that returns
+        ``[(name, type, help, [(labels_dict, value), ...]), ...]``.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} "
+                                 f"{_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "Request latency by route.", ("method", "route", "status"))
+db_query_seconds = registry.histogram(
+    "db_query_duration_seconds", "MySQL statement latency by statement kind and table.", ("query",))
+db_query_rows = registry.histogram(
+    "db_query_rows", "Rows returned or affected per statement.", ("query",), buckets=ROW_BUCKETS)
+db_query_errors = registry.counter(
+    "db_query_errors_total", "MySQL statements that raised.", ("query",))
+storage_seconds = registry.histogram(
+    "storage_operation_duration_seconds", "Storage backend call latency.", ("backend", "operation", "outcome"))
+invoice_render_seconds = registry.histogram(
+    "invoice_render_duration_seconds", "Completed invoice PDF render latency, including queueing.", ("kind",))
+invoice_rejections = registry.counter(
+    "invoice_rejections_total", "Invoice renders turned away because the render pool was full.", ("kind",))
+
+
+def observe_query(sql, elapsed, rows, failed):
+    """db_pool query observer: record one statement."""
+    label = query_label(sql)
+    db_query_seconds.observe(elapsed, label)
+    if failed:
+        db_query_errors.inc(label)
+    elif rows is not None and rows >= 0:
+        db_query_rows.observe(rows, label)
+
+
+def observe_storage(backend, operation, elapsed, failed):
+    """StorageBackend observer: record one outbound storage call."""
+    storage_seconds.observe(elapsed, backend, operation, "error" if failed else "ok")
+
+
+def stats_collector(prefix, help, stats, labels=None):
+    """
+    Turn a flat ``stats()`` dict of numbers into gauge families named
+    ``<prefix>_<key>``; nested dicts are flattened with an extra label.
+    """
+    def collect():
+        families = []
+        for key, value in stats().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                families.append((f"{prefix}_{key}", "gauge", f"{help} ({key}).", [(dict(labels or {}), value)]))
+        return families
+    return collect
+
+
+def storage_collector(storage):
+    """Gauges from StorageBackend.stats(), one series per operation."""
+    def collect():
+        stats = storage.stats()
+        samples = {}
+        for operation, entry in stats["operations"].items():
+            for key, value in entry.items():
+                samples.setdefault(key, []).append(({"backend": stats["backend"], "operation": operation}, value))
+        return [
+            (f"storage_stats_{key}", "gauge", f"Storage backend totals ({key}).", values)
+            for key, values in samples.items()
+        ]
+    return collect
+
+
+def init_app(app, slow_request_seconds=1.0):
+    """
+    Time every request by route template and log slow ones as one JSON line,
+    at WARNING on the ``metrics`` logger.
+    """
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        http_request_seconds.observe(elapsed, request.method, route, response.status_code)
+        if elapsed >= slow_request_seconds:
+            logger.warning(json.dumps({
+                "event": "slow_request",
+                "method": request.method,
+                "route": route,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": round(elapsed * 1000, 1),
+                "remote_addr": request.remote_addr,
+            }))
+        return response
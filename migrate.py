@@ -0,0 +1,263 @@
+"""
+Versioned schema migrations.
+
+Each ``migrations/NNNN_description.sql`` file is applied once, in version order,
+and recorded in ``schema_migrations`` with a checksum of its contents. MySQL
+commits DDL implicitly, so a migration that fails part-way is not rolled back:
+fix the database by hand (or drop what it created) and run again.
+
+Databases created before migrations existed already have some of this schema;
+record those versions with ``mark`` and let ``up`` apply the rest.
+
+Usage:
+    python migrate.py [up]              apply pending migrations
+    python migrate.py status            list migrations and whether they're applied
+    python migrate.py mark 0001 0003    record versions as applied without running them
+    python migrate.py check [--strict]  EXPLAIN the route queries, fail on full table scans
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+_MIGRATION_NAME = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+SCHEMA_MIGRATIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version CHAR(4) NOT NULL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+class MigrationError(Exception):
+    """Raised when a migration can't be applied or the migration history is inconsistent."""
+
+
+def split_sql(text):
+    """Split a SQL script into statements, dropping `--` comment lines."""
+    text = "\n".join(line for line in text.splitlines() if not line.strip().startswith("--"))
+    return [s.strip() for s in re.split(r";\s*(?:\n|$)", text) if s.strip()]
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """
+    Read every migration file in ``directory``.
+
+    Returns:
+        list: ``(version, name, sql)`` tuples sorted by version.
+    """
+    migrations = []
+    seen = set()
+    for filename in sorted(os.listdir(directory)):
+        match = _MIGRATION_NAME.match(filename)
+        if not match:
+            continue
+        version, name = match.groups()
+        if version in seen:
+            raise MigrationError(f"Duplicate migration version {version}")
+        seen.add(version)
+        with open(os.path.join(directory, filename)) as f:
+            migrations.append((version, name, f.read()))
+    return migrations
+
+
+def checksum(sql):
+    return hashlib.sha256(sql.encode("utf-8")).hexdigest()
+
+
+def applied_migrations(conn):
+    """Return ``{version: checksum}`` for the recorded migrations, creating the table if needed."""
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_MIGRATIONS_TABLE)
+    cursor.execute("SELECT version, checksum FROM schema_migrations")
+    applied = dict(cursor.fetchall())
+    cursor.close()
+    return applied
+
+
+def _record(cursor, version, name, sql):
+    cursor.execute("INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                   (version, name, checksum(sql)))
+
+
+def migrate(conn, migrations=None):
+    """
+    Apply every migration not yet recorded in ``schema_migrations``.
+
+    Returns:
+        list: Versions applied by this call.
+    """
+    migrations = load_migrations() if migrations is None else migrations
+    applied = applied_migrations(conn)
+    for version, name, sql in migrations:
+        if version in applied and applied[version] != checksum(sql):
+            print(f"Warning: migration {version}_{name} changed after it was applied")
+
+    done = []
+    cursor = conn.cursor()
+    for version, name, sql in migrations:
+        if version in applied:
+            continue
+        for number, statement in enumerate(split_sql(sql), start=1):
+            try:
+                cursor.execute(statement)
+            except Exception as e:
+                conn.rollback()
+                cursor.close()
+                raise MigrationError(f"Migration {version}_{name} failed at statement {number}: {e}")
+        _record(cursor, version, name, sql)
+        conn.commit()
+        print(f"Applied {version}_{name}")
+        done.append(version)
+    cursor.close()
+    return done
+
+
+def mark_applied(conn, versions, migrations=None):
+    """Record ``versions`` as applied without running them."""
+    migrations = {version: (name, sql) for version, name, sql in (load_migrations() if migrations is None else migrations)}
+    unknown = [version for version in versions if version not in migrations]
+    if unknown:
+        raise MigrationError(f"Unknown migration versions: {', '.join(unknown)}")
+    applied = applied_migrations(conn)
+    cursor = conn.cursor()
+    for version in versions:
+        if version not in applied:
+            _record(cursor, version, *migrations[version])
+    conn.commit()
+    cursor.close()
+
+
+def route_queries():
+    """
+    The per-request queries that must be served from an index, as
+    ``(route, sql, params)`` with representative parameters.
+    """
+    from catalog_query import build_catalog_query
+    from keyset import encode_cursor
+    from order_details import (
+        build_details_query, build_tracking_query, build_invoice_batch_query, build_invoice_batch_count_query,
+    )
+    from order_groups import build_status_query, build_count_query, build_pages_query
+    from order_summary import build_dashboard_query
+
+    catalog_sql, catalog_params = build_catalog_query({'category': 'slides', 'sort': 'price_asc'})[:2]
+    dashboard_sql, dashboard_params = build_dashboard_query({'status': 'Pending', 'limit': '50'})[:2]
+    statuses = ['Pending', 'Processing', 'Shipped', 'Delivered']
+    order_id = 'ORD-00000001'
+    details_cursor = encode_cursor('2024-01-01 00:00:00', order_id)
+    return [
+        ("POST /login", "SELECT id, email, password FROM admins WHERE email = %s", ('admin@example.com',)),
+        ("GET /api/orders", "SELECT product_name, product_size, product_quantity FROM track WHERE order_id = %s",
+         (order_id,)),
+        ("GET /api/orders/metadata", "SELECT status, date_created, estimated_time FROM orders WHERE order_id = %s",
+         (order_id,)),
+        ("GET /api/orders/tracking", *build_tracking_query(order_id)),
+        ("GET /orders", *build_status_query('Pending')),
+        ("GET /orders/grouped (counts)", *build_count_query()),
+        ("GET /orders/grouped (pages)", *build_pages_query(statuses, 20)),
+        ("GET /orders/grouped (next page)", *build_pages_query(statuses[:1], 20, ('2024-01-01 00:00:00', 1000))),
+        ("GET /api/orders/details", *build_details_query({'limit': '50'})[:2]),
+        ("GET /api/orders/details (next page)", *build_details_query({'limit': '50', 'cursor': details_cursor})[:2]),
+        ("GET /api/orders/details (date range)",
+         *build_details_query({'start_date': '2024-01-01', 'end_date': '2024-01-31', 'limit': '50'})[:2]),
+        ("GET /api/products/manage", dashboard_sql, dashboard_params),
+        ("GET /api/catalog", catalog_sql, catalog_params),
+        ("POST /api/products/update_status", "UPDATE orders SET status = %s WHERE order_id = %s",
+         ('Shipped', order_id)),
+        ("POST /api/products/update_batch_status", "UPDATE orders SET status = %s WHERE batch = %s",
+         ('Shipped', 'Batch 1')),
+        ("POST /api/products/update_batch_status (New Batch)", "UPDATE orders SET status = %s WHERE batch IS NULL",
+         ('Shipped',)),
+        ("POST /api/orders/invoice/batch", *build_invoice_batch_query(batch_name='Batch 1')),
+        ("POST /api/orders/invoice/batch (order ids)", *build_invoice_batch_query([order_id, 'ORD-00000002'])),
+        ("POST /api/orders/invoice/batch (pdf count)", *build_invoice_batch_count_query(batch_name='Batch 1')),
+    ]
+
+
+def explain_full_scans(cursor, sql, params):
+    """EXPLAIN ``sql`` and return the plan rows that scan a whole base table."""
+    cursor.execute("EXPLAIN " + sql, params)
+    columns = [column[0] for column in cursor.description]
+    plans = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    # <derivedN>/<subqueryN> rows read materialized results, not tables
+    return [plan for plan in plans if plan.get("type") == "ALL" and not str(plan.get("table", "")).startswith("<")]
+
+
+def check_queries(conn, queries=None, strict=False):
+    """
+    EXPLAIN each route query and report full table scans.
+
+    A scan with no usable index (``possible_keys`` is NULL) always fails. When
+    an index exists but the optimizer still chose a scan, which is normal on
+    near-empty tables, it only fails with ``strict``; run the check against a
+    production-sized database (e.g. benchmarks/seed.py) to rely on it.
+
+    Returns:
+        list: ``(route, table, reason)`` for every failing query.
+    """
+    failures = []
+    cursor = conn.cursor()
+    for route, sql, params in (route_queries() if queries is None else queries):
+        scans = explain_full_scans(cursor, sql, params)
+        for plan in scans:
+            if plan.get("possible_keys"):
+                reason = f"full scan although {plan['possible_keys']} could be used"
+                if not strict:
+                    print(f"WARN {route}: {plan['table']}: {reason}")
+                    continue
+            else:
+                reason = "full scan, no usable index"
+            failures.append((route, plan["table"], reason))
+            print(f"FAIL {route}: {plan['table']}: {reason}")
+        if not scans:
+            print(f"ok   {route}")
+    cursor.close()
+    return failures
+
+
+def main(argv=None):
+    from db_pool import connect_from_env
+
+    parser = argparse.ArgumentParser(description="Schema migrations")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("up")
+    commands.add_parser("status")
+    mark_parser = commands.add_parser("mark")
+    mark_parser.add_argument("versions", nargs="+")
+    check_parser = commands.add_parser("check")
+    check_parser.add_argument("--strict", action="store_true", help="Also fail when the optimizer skips an index")
+    args = parser.parse_args(argv)
+
+    conn = connect_from_env()
+    try:
+        if args.command == "status":
+            applied = applied_migrations(conn)
+            for version, name, sql in load_migrations():
+                state = "applied" if version in applied else "pending"
+                if version in applied and applied[version] != checksum(sql):
+                    state = "applied (changed since)"
+                print(f"{version}_{name:<40} {state}")
+        elif args.command == "mark":
+            mark_applied(conn, args.versions)
+        elif args.command == "check":
+            failures = check_queries(conn, strict=args.strict)
+            if failures:
+                sys.exit(f"{len(failures)} route queries would scan a full table")
+        else:
+            applied = migrate(conn)
+            print(f"Applied {len(applied)} migrations" if applied else "Schema is up to date")
+    except MigrationError as e:
+        sys.exit(str(e))
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+-- The tables the app was originally deployed with. IF NOT EXISTS so databases
+-- created before migrations existed can adopt this history (see migrate.py mark).
+CREATE TABLE IF NOT EXISTS productlist (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    price DECIMAL(12, 2) NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    image VARCHAR(512),
+    size VARCHAR(255),
+    description TEXT,
+    disabledSizes VARCHAR(255),
+    file_id VARCHAR(255)
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    order_id VARCHAR(32) NOT NULL,
+    status VARCHAR(50),
+    batch VARCHAR(255) NULL,
+    date_created DATETIME NOT NULL,
+    estimated_time DATETIME NULL,
+    updated_at DATETIME NULL
+);
+
+CREATE TABLE IF NOT EXISTS track (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    order_id VARCHAR(32) NOT NULL,
+    customer_name VARCHAR(255),
+    customer_email VARCHAR(255),
+    customer_contact VARCHAR(50),
+    product_name VARCHAR(255),
+    product_size VARCHAR(20),
+    product_quantity INT,
+    total_amount DECIMAL(12, 2),
+    status VARCHAR(50)
+);
+
+CREATE TABLE IF NOT EXISTS admins (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    email VARCHAR(255) NOT NULL,
+    password VARCHAR(255) NOT NULL
+);
@@ -0,0 +1,18 @@
+-- Indexes for the per-request lookups; `python migrate.py check` EXPLAINs the
+-- route queries and fails if any of them falls back to a full table scan.
+
+-- Tracking, metadata, invoices, update_status and batch assignment look orders up by order_id
+CREATE UNIQUE INDEX uq_orders_order_id ON orders (order_id);
+
+-- /orders by status; /orders/grouped per-status counts and each status's pages, newest first
+CREATE INDEX idx_orders_status_date ON orders (status, date_created);
+
+-- /api/orders/details pages: ORDER BY date_created DESC, order_id DESC, continued from a
+-- keyset cursor on (date_created, order_id) and optionally bounded by a date range
+CREATE INDEX idx_orders_date_order_id ON orders (date_created, order_id);
+
+-- Every order's line items are fetched by order_id (tracking, invoices, order_summary triggers)
+CREATE INDEX idx_track_order_id ON track (order_id);
+
+-- POST /login
+CREATE UNIQUE INDEX uq_admins_email ON admins (email);
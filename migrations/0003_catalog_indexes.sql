@@ -0,0 +1,5 @@
+-- Indexes backing the keyset-paginated /api/catalog queries.
+-- Each index ends in `id` so "ORDER BY <col>, id LIMIT n" after a cursor is a range scan.
+CREATE INDEX idx_productlist_category_id ON productlist (category, id);
+CREATE INDEX idx_productlist_price_id ON productlist (price, id);
+CREATE INDEX idx_productlist_category_price_id ON productlist (category, price, id);
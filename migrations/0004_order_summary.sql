@@ -0,0 +1,81 @@
+-- Denormalized one-row-per-order projection read by the admin dashboard
+-- (GET /api/products/manage). Kept current by the triggers below, so order and
+-- track writes from any client maintain it. Creating triggers needs the TRIGGER
+-- privilege (and log_bin_trust_function_creators when binary logging is on).
+
+CREATE TABLE order_summary (
+    order_id VARCHAR(32) NOT NULL PRIMARY KEY,
+    status VARCHAR(50),
+    batch VARCHAR(255) NULL,
+    date_created DATETIME,
+    customer_name VARCHAR(255),
+    customer_contact VARCHAR(50),
+    customer_email VARCHAR(255),
+    product_name VARCHAR(255),
+    -- Sort key for "batch IS NULL DESC, batch": unbatched orders first
+    has_batch TINYINT AS (batch IS NOT NULL) STORED,
+    batch_key VARCHAR(255) AS (COALESCE(batch, '')) STORED,
+    KEY idx_order_summary_dashboard (has_batch, batch_key, date_created DESC, order_id DESC),
+    KEY idx_order_summary_status (status, has_batch, batch_key, date_created DESC, order_id DESC)
+);
+
+CREATE TRIGGER trg_orders_summary_insert AFTER INSERT ON orders FOR EACH ROW
+    INSERT INTO order_summary (order_id, status, batch, date_created, customer_name, customer_contact, customer_email, product_name)
+    SELECT NEW.order_id, NEW.status, NEW.batch, NEW.date_created,
+           MAX(t.customer_name), MAX(t.customer_contact), MAX(t.customer_email), MAX(t.product_name)
+    FROM (SELECT 1) one
+    LEFT JOIN track t ON t.order_id = NEW.order_id
+    ON DUPLICATE KEY UPDATE status = VALUES(status), batch = VALUES(batch), date_created = VALUES(date_created);
+
+CREATE TRIGGER trg_orders_summary_update AFTER UPDATE ON orders FOR EACH ROW
+    UPDATE order_summary
+    SET status = NEW.status, batch = NEW.batch, date_created = NEW.date_created
+    WHERE order_id = NEW.order_id;
+
+CREATE TRIGGER trg_orders_summary_delete AFTER DELETE ON orders FOR EACH ROW
+    DELETE FROM order_summary WHERE order_id = OLD.order_id;
+
+-- New track rows fold into the MAX() aggregates without rescanning the order
+CREATE TRIGGER trg_track_summary_insert AFTER INSERT ON track FOR EACH ROW
+    UPDATE order_summary
+    SET customer_name = IF(customer_name IS NULL OR NEW.customer_name > customer_name, NEW.customer_name, customer_name),
+        customer_contact = IF(customer_contact IS NULL OR NEW.customer_contact > customer_contact, NEW.customer_contact, customer_contact),
+        customer_email = IF(customer_email IS NULL OR NEW.customer_email > customer_email, NEW.customer_email, customer_email),
+        product_name = IF(product_name IS NULL OR NEW.product_name > product_name, NEW.product_name, product_name)
+    WHERE order_id = NEW.order_id;
+
+-- Updates and deletes may lower a maximum, so recompute from that order's rows
+CREATE TRIGGER trg_track_summary_update AFTER UPDATE ON track FOR EACH ROW
+    UPDATE order_summary s
+    JOIN (
+        SELECT MAX(customer_name) AS customer_name, MAX(customer_contact) AS customer_contact,
+               MAX(customer_email) AS customer_email, MAX(product_name) AS product_name
+        FROM track WHERE order_id = NEW.order_id
+    ) t
+    SET s.customer_name = t.customer_name, s.customer_contact = t.customer_contact,
+        s.customer_email = t.customer_email, s.product_name = t.product_name
+    WHERE s.order_id = NEW.order_id;
+
+CREATE TRIGGER trg_track_summary_delete AFTER DELETE ON track FOR EACH ROW
+    UPDATE order_summary s
+    JOIN (
+        SELECT MAX(customer_name) AS customer_name, MAX(customer_contact) AS customer_contact,
+               MAX(customer_email) AS customer_email, MAX(product_name) AS product_name
+        FROM track WHERE order_id = OLD.order_id
+    ) t
+    SET s.customer_name = t.customer_name, s.customer_contact = t.customer_contact,
+        s.customer_email = t.customer_email, s.product_name = t.product_name
+    WHERE s.order_id = OLD.order_id;
+
+-- Backfill existing orders
+INSERT INTO order_summary (order_id, status, batch, date_created, customer_name, customer_contact, customer_email, product_name)
+SELECT o.order_id, o.status, o.batch, o.date_created,
+       t.customer_name, t.customer_contact, t.customer_email, t.product_name
+FROM orders o
+LEFT JOIN (
+    SELECT order_id, MAX(customer_name) AS customer_name, MAX(customer_contact) AS customer_contact,
+           MAX(customer_email) AS customer_email, MAX(product_name) AS product_name
+    FROM track
+    GROUP BY order_id
+) t ON o.order_id = t.order_id
+ON DUPLICATE KEY UPDATE status = VALUES(status), batch = VALUES(batch), date_created = VALUES(date_created);
@@ -0,0 +1,16 @@
+-- Batches become first-class rows instead of free-text names scanned across orders.
+-- orders.batch keeps holding the batch name and now references batches.name.
+CREATE TABLE batches (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_batches_name (name)
+);
+
+INSERT IGNORE INTO batches (name)
+SELECT DISTINCT batch FROM orders WHERE batch IS NOT NULL;
+
+CREATE INDEX idx_orders_batch_date ON orders (batch, date_created);
+
+-- No ON UPDATE CASCADE: cascaded changes don't fire the order_summary triggers
+ALTER TABLE orders ADD CONSTRAINT fk_orders_batch FOREIGN KEY (batch) REFERENCES batches (name);
@@ -0,0 +1,12 @@
+-- Transactional outbox for order status changes. Rows are written in the same
+-- transaction as the status UPDATE and drained by outbox.OutboxDispatcher.
+CREATE TABLE outbox (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(64) NOT NULL,
+    order_id VARCHAR(32) NOT NULL,
+    payload JSON NOT NULL,
+    created_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    dispatched_at DATETIME(6) NULL,
+    KEY idx_outbox_pending (dispatched_at, id),
+    KEY idx_outbox_order (order_id, id)
+);
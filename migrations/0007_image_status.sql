@@ -0,0 +1,8 @@
+-- Product images are uploaded in the background (image_uploads.ImageUploader).
+-- New rows start as 'pending' and are patched to 'ready' or 'failed'.
+ALTER TABLE productlist
+    ADD COLUMN image_status ENUM('pending', 'ready', 'failed') NOT NULL DEFAULT 'ready';
+
+ALTER TABLE productlist
+    MODIFY COLUMN image VARCHAR(512) NULL,
+    MODIFY COLUMN file_id VARCHAR(255) NULL;
@@ -0,0 +1,5 @@
+-- Resized WebP/JPEG variants of each product image, written by the background
+-- uploader: {"full"|"card"|"thumb": {"width", "height", "webp": {"url", "file_id"}, "jpeg": {...}}}.
+-- NULL for images uploaded before processing existed.
+ALTER TABLE productlist
+    ADD COLUMN image_variants JSON NULL;
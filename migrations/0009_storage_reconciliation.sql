@@ -0,0 +1,12 @@
+-- Storage deletes that failed after their product rows were deleted.
+-- Retried by product_delete.drain_reconciliation (POST /api/storage/reconcile).
+CREATE TABLE storage_reconciliation (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    file_id VARCHAR(255) NOT NULL,
+    reason VARCHAR(64) NOT NULL,
+    attempts INT NOT NULL DEFAULT 1,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_attempt_at DATETIME NULL,
+    resolved_at DATETIME NULL,
+    KEY idx_storage_reconciliation_pending (resolved_at, id)
+);
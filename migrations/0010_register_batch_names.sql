@@ -0,0 +1,14 @@
+-- orders.batch references batches.name (0005), so an order written with a
+-- batch name that isn't registered (free text from the admin tool or any other
+-- client) would fail the foreign key. These triggers register the name first:
+-- BEFORE triggers run ahead of the foreign key check. Batch names written
+-- between 0005 and this migration were rejected, so the backfill is a no-op
+-- unless the constraint was disabled meanwhile.
+INSERT IGNORE INTO batches (name)
+SELECT DISTINCT batch FROM orders WHERE batch IS NOT NULL;
+
+CREATE TRIGGER trg_orders_register_batch_insert BEFORE INSERT ON orders FOR EACH ROW
+    INSERT IGNORE INTO batches (name) SELECT NEW.batch FROM DUAL WHERE NEW.batch IS NOT NULL;
+
+CREATE TRIGGER trg_orders_register_batch_update BEFORE UPDATE ON orders FOR EACH ROW
+    INSERT IGNORE INTO batches (name) SELECT NEW.batch FROM DUAL WHERE NEW.batch IS NOT NULL AND NOT (NEW.batch <=> OLD.batch);
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+from keyset import decode_cursor, CursorError
+
+
+class OrderDetailsQueryError(ValueError):
+    """Raised for invalid order details query parameters."""
+
+
+def parse_date_param(value, end=False):
+    """Parse an ISO date/datetime query parameter; a bare end date covers that whole day."""
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+def build_details_query(args):
+    """
+    Build the order details query: orders newest first, joined with their `track` rows.
+
+    The orders are limited in a subquery, not the joined rows, so a page never
+    splits an order. Pages continue from a keyset cursor on (date_created,
+    order_id), served from the idx_orders_date_order_id index.
+
+    Args:
+        args: Mapping of query parameters: start_date / end_date (ISO dates, end
+            inclusive), limit and cursor. Without a limit every order is returned.
+
+    Returns:
+        tuple: (sql, params, limit). With a limit the subquery fetches
+        ``limit + 1`` orders so the caller can tell whether another page exists.
+    """
+    where = []
+    params = []
+    try:
+        if args.get('start_date'):
+            where.append("date_created >= %s")
+            params.append(parse_date_param(args['start_date']))
+        if args.get('end_date'):
+            where.append("date_created < %s")
+            params.append(parse_date_param(args['end_date'], end=True))
+        if args.get('cursor'):
+            last_date, last_order_id = decode_cursor(args['cursor'], 2)
+            where.append("(date_created < %s OR (date_created = %s AND order_id < %s))")
+            params.extend([last_date, last_date, last_order_id])
+        limit = int(args['limit']) if args.get('limit') else None
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be positive")
+    except (ValueError, CursorError) as e:
+        raise OrderDetailsQueryError(str(e))
+
+    order_query = "SELECT order_id, status, date_created FROM orders"
+    if where:
+        order_query += " WHERE " + " AND ".join(where)
+    order_query += " ORDER BY date_created DESC, order_id DESC"
+    if limit:
+        order_query += " LIMIT %s"
+        params.append(limit + 1)
+
+    sql = f'''
+        SELECT
+            o.order_id,
+            o.status AS order_status,
+            o.date_created AS order_date,
+            t.product_name,
+            t.product_size,
+            t.total_amount,
+            t.product_quantity,
+            t.status AS product_status,
+            t.customer_name,
+            t.customer_email,
+            t.customer_contact
+        FROM
+            ({order_query}) o
+        LEFT JOIN
+            track t ON o.order_id = t.order_id
+        ORDER BY
+            o.date_created DESC, o.order_id DESC
+    '''
+    return sql, tuple(params), limit
+
+
+def build_tracking_query(order_id):
+    """
+    One order's status, ETA and line items (LEFT JOIN, so an order without
+    `track` rows still comes back), for /api/orders/tracking.
+
+    Returns:
+        tuple: (sql, params).
+    """
+    sql = '''
+        SELECT
+            o.status, o.date_created, o.estimated_time,
+            t.customer_name, t.customer_email, t.customer_contact,
+            t.product_name, t.product_size, t.product_quantity, t.total_amount
+        FROM orders o
+        LEFT JOIN track t ON t.order_id = o.order_id
+        WHERE o.order_id = %s
+    '''
+    return sql, (order_id,)
+
+
+def _invoice_batch_where(order_ids, batch_name):
+    if order_ids:
+        return "o.order_id IN (%s)" % ','.join(['%s'] * len(order_ids)), tuple(order_ids)
+    if batch_name == "New Batch":
+        return "o.batch IS NULL", ()
+    return "o.batch = %s", (batch_name,)
+
+
+def build_invoice_batch_query(order_ids=None, batch_name=None):
+    """
+    Every order and `track` row for a batch invoice export, grouped by order.
+
+    Args:
+        order_ids: Orders to export; takes precedence over ``batch_name``.
+        batch_name: `orders.batch` to export; "New Batch" selects unbatched orders.
+
+    Returns:
+        tuple: (sql, params).
+    """
+    where, params = _invoice_batch_where(order_ids, batch_name)
+    sql = f'''
+        SELECT
+            o.order_id, o.date_created,
+            t.customer_name, t.customer_email, t.customer_contact,
+            t.product_name, t.product_size, t.product_quantity, t.total_amount
+        FROM orders o
+        JOIN track t ON o.order_id = t.order_id
+        WHERE {where}
+        ORDER BY o.order_id
+    '''
+    return sql, params
+
+
+def build_invoice_batch_count_query(order_ids=None, batch_name=None):
+    """Number of orders build_invoice_batch_query would export; returns (sql, params)."""
+    where, params = _invoice_batch_where(order_ids, batch_name)
+    return "SELECT COUNT(*) FROM orders o WHERE " + where, params
@@ -0,0 +1,139 @@
+from keyset import encode_cursor, decode_cursor, CursorError
+
+ORDER_GROUP_COLUMNS = ('id', 'order_id', 'status', 'batch', 'date_created', 'estimated_time')
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class OrderGroupQueryError(ValueError):
+    """Raised for invalid grouped order query parameters."""
+
+
+def group_cursor(row):
+    """Cursor pointing just after ``row``, a tuple in ORDER_GROUP_COLUMNS order."""
+    return encode_cursor(row[4].strftime('%Y-%m-%d %H:%M:%S'), row[0])
+
+
+def parse_group_args(args):
+    """
+    Validate the grouped order listing parameters.
+
+    Args:
+        args: Mapping of query parameters: status (comma-separated, optional),
+            limit (per group) and cursor (a group's ``next_cursor``, only valid
+            with a single status).
+
+    Returns:
+        tuple: (statuses or None for every status, limit, (date_created, id)
+        after which to continue or None).
+    """
+    statuses = None
+    if args.get('status'):
+        statuses = list(dict.fromkeys(s.strip() for s in args['status'].split(',') if s.strip()))
+
+    try:
+        limit = max(1, min(int(args.get('limit') or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+    except ValueError:
+        raise OrderGroupQueryError("Invalid limit.")
+
+    after = None
+    if args.get('cursor'):
+        if not statuses or len(statuses) != 1:
+            raise OrderGroupQueryError("A cursor pages through a single status; pass exactly one status.")
+        try:
+            after = tuple(decode_cursor(args['cursor'], 2))
+        except CursorError as e:
+            raise OrderGroupQueryError(str(e))
+
+    return statuses, limit, after
+
+
+def build_status_query(status):
+    """
+    Every order in one status as full rows, the original /orders listing.
+
+    The columns are those of `SELECT *` on the original table, listed so columns
+    added later don't change the response.
+
+    Returns:
+        tuple: (sql, params).
+    """
+    return ("SELECT id, order_id, status, batch, date_created, estimated_time, updated_at "
+            "FROM orders WHERE status = %s", (status,))
+
+
+def build_count_query(statuses=None):
+    """Per-status order counts, optionally restricted to ``statuses``; served from the (status, date_created) index."""
+    sql = "SELECT status, COUNT(*) FROM orders WHERE status IS NOT NULL"
+    params = ()
+    if statuses:
+        sql += f" AND status IN ({','.join(['%s'] * len(statuses))})"
+        params = tuple(statuses)
+    return sql + " GROUP BY status ORDER BY status", params
+
+
+def build_pages_query(statuses, limit, after=None):
+    """
+    One page of each status group in a single statement: a ``UNION ALL`` of one
+    ``LIMIT`` subquery per status, each a backward range scan of the
+    (status, date_created) index. ``id`` breaks ties on ``date_created``; InnoDB
+    stores it in every secondary index, so the sort needs no filesort.
+
+    Each subquery fetches ``limit + 1`` rows so the caller can tell whether the
+    group has another page.
+
+    Returns:
+        tuple: (sql, params).
+    """
+    parts = []
+    params = []
+    for status in statuses:
+        where = "status = %s"
+        params.append(status)
+        if after:
+            where += " AND (date_created < %s OR (date_created = %s AND id < %s))"
+            params.extend([after[0], after[0], after[1]])
+        parts.append(f"(SELECT {', '.join(ORDER_GROUP_COLUMNS)} FROM orders WHERE {where} "
+                     f"ORDER BY date_created DESC, id DESC LIMIT %s)")
+        params.append(limit + 1)
+    return " UNION ALL ".join(parts), tuple(params)
+
+
+def group_orders(statuses, counts, rows, limit):
+    """
+    Assemble the response groups from the count and page query results.
+
+    Args:
+        statuses: Statuses in response order.
+        counts: ``{status: order count}``.
+        rows: Page query rows in ORDER_GROUP_COLUMNS order.
+        limit: Page size per group.
+
+    Returns:
+        list: One ``{status, count, orders, next_cursor}`` dict per status.
+    """
+    pages = {}
+    for row in rows:
+        pages.setdefault(row[2], []).append(row)
+
+    groups = []
+    for status in statuses:
+        page = pages.get(status, [])
+        next_cursor = group_cursor(page[limit - 1]) if len(page) > limit else None
+        groups.append({
+            "status": status,
+            "count": counts.get(status, 0),
+            "orders": [
+                {
+                    "id": row[0],
+                    "order_id": row[1],
+                    "status": row[2],
+                    "batch": row[3],
+                    "date_created": row[4].strftime('%Y-%m-%d %H:%M:%S'),
+                    "estimated_time": row[5].strftime('%Y-%m-%d %H:%M:%S') if row[5] else None,
+                }
+                for row in page[:limit]
+            ],
+            "next_cursor": next_cursor,
+        })
+    return groups
@@ -0,0 +1,79 @@
+from keyset import encode_cursor, decode_cursor, CursorError
+
+DASHBOARD_COLUMNS = ('order_id', 'status', 'batch', 'customer_name', 'customer_contact',
+                     'product_name', 'date_created', 'customer_email', 'has_batch', 'batch_key')
+MAX_PAGE_SIZE = 500
+
+
+class DashboardQueryError(ValueError):
+    """Raised for invalid dashboard query parameters."""
+
+
+def dashboard_cursor(row):
+    """Cursor pointing just after ``row``, a tuple in DASHBOARD_COLUMNS order."""
+    return encode_cursor(row[8], row[9], row[6].strftime('%Y-%m-%d %H:%M:%S'), row[0])
+
+
+def build_dashboard_query(args):
+    """
+    Build the admin dashboard query over `order_summary`.
+
+    Rows come back unbatched orders first, then by batch name, newest first within
+    a batch, matching the original dashboard ordering; `order_id` breaks ties so
+    keyset pagination is stable.
+
+    Args:
+        args: Mapping of query parameters: status, batch ("New Batch" selects
+            unbatched orders), limit and cursor. Without a limit every row is
+            returned.
+
+    Returns:
+        tuple: (sql, params, limit). With a limit the query fetches ``limit + 1``
+        rows so the caller can tell whether another page exists.
+    """
+    where = []
+    params = []
+
+    if args.get('status'):
+        where.append("status = %s")
+        params.append(args['status'])
+    if args.get('batch') == "New Batch":
+        where.append("has_batch = 0")
+    elif args.get('batch'):
+        where.append("has_batch = 1 AND batch_key = %s")
+        params.append(args['batch'])
+
+    if args.get('cursor'):
+        try:
+            has_batch, batch_key, date_created, order_id = decode_cursor(args['cursor'], 4)
+        except CursorError as e:
+            raise DashboardQueryError(str(e))
+        where.append('''(
+            has_batch > %s
+            OR (has_batch = %s AND batch_key > %s)
+            OR (has_batch = %s AND batch_key = %s AND date_created < %s)
+            OR (has_batch = %s AND batch_key = %s AND date_created = %s AND order_id < %s)
+        )''')
+        params.extend([
+            has_batch,
+            has_batch, batch_key,
+            has_batch, batch_key, date_created,
+            has_batch, batch_key, date_created, order_id,
+        ])
+
+    limit = None
+    if args.get('limit'):
+        try:
+            limit = max(1, min(int(args['limit']), MAX_PAGE_SIZE))
+        except ValueError:
+            raise DashboardQueryError("Invalid limit.")
+
+    sql = f"SELECT {', '.join(DASHBOARD_COLUMNS)} FROM order_summary"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY has_batch, batch_key, date_created DESC, order_id DESC"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit + 1)
+
+    return sql, tuple(params), limit
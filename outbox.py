@@ -0,0 +1,197 @@
+import threading
+import queue
+import json
+import time
+import os
+
+STATUS_CHANGED = "order.status_changed"
+
+
+def record_status_change(cursor, new_status, where, params, source):
+    """
+    Write one outbox event per order whose status is about to change.
+
+    Must run in the same transaction as, and just before, the matching
+    ``UPDATE orders SET status = ... WHERE <where>`` so the events commit (or roll
+    back) with the change and still see the previous status. Orders already in
+    ``new_status`` produce no event.
+
+    Args:
+        cursor: Cursor of the transaction doing the update.
+        new_status: The status being set.
+        where: SQL condition on `orders` selecting the updated rows.
+        params: Parameters for ``where``.
+        source: Name of the route making the change.
+
+    Returns:
+        int: Number of events written.
+    """
+    cursor.execute(f'''
+        INSERT INTO outbox (event_type, order_id, payload)
+        SELECT %s, order_id, JSON_OBJECT(
+            'order_id', order_id,
+            'status', %s,
+            'previous_status', status,
+            'batch', batch,
+            'source', %s
+        )
+        FROM orders
+        WHERE ({where}) AND NOT (status <=> %s)
+    ''', (STATUS_CHANGED, new_status, source, *params, new_status))
+    return cursor.rowcount
+
+
+class FileSink:
+    """Appends events as JSON lines to a local file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, events):
+        lines = "".join(json.dumps(event, default=str) + "\n" for event in events)
+        with self._lock, open(self.path, "a") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class QueueSink:
+    """Puts events on an in-process queue, for tests and local consumers."""
+
+    def __init__(self, maxsize=0):
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def send(self, events):
+        for event in events:
+            self.queue.put(event)
+
+
+def sink_from_config(value):
+    """
+    Build a sink from one ``OUTBOX_SINKS`` entry: ``file:<path>`` or ``queue``.
+    """
+    if value.startswith("file:"):
+        return FileSink(value[len("file:"):])
+    if value == "queue":
+        return QueueSink()
+    raise ValueError(f"Unknown outbox sink: {value}")
+
+
+class OutboxDispatcher:
+    """
+    Background thread draining undispatched outbox rows to sinks in batches.
+
+    Each batch is claimed with ``FOR UPDATE SKIP LOCKED``, so several workers can
+    dispatch concurrently without sending an event twice; rows are marked
+    dispatched only after every sink accepted them (at-least-once delivery).
+    """
+
+    def __init__(self, pool, sinks, batch_size=100, interval=1.0, max_backoff=30.0):
+        self.pool = pool
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {
+            "dispatched": 0,
+            "batches": 0,
+            "failures": 0,
+            "lag_seconds": 0.0,
+            "started_at": None,
+        }
+
+    def ensure_running(self):
+        """Start the thread in this process if it isn't running (e.g. after a fork)."""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._stats["started_at"] = time.time()
+            self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+
+    def _run(self):
+        backoff = self.interval
+        while not self._stop.is_set():
+            try:
+                sent = self.dispatch_batch()
+                backoff = self.interval
+            except Exception as e:
+                print(f"Error dispatching outbox events: {e}")
+                with self._lock:
+                    self._stats["failures"] += 1
+                sent = 0
+                backoff = min(backoff * 2, self.max_backoff)
+            # Keep draining while full batches come back
+            if sent < self.batch_size:
+                self._stop.wait(backoff)
+
+    def dispatch_batch(self):
+        """Send one batch of pending events; returns how many were sent."""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, event_type, order_id, payload, created_at,
+                       TIMESTAMPDIFF(MICROSECOND, created_at, NOW(6))
+                FROM outbox
+                WHERE dispatched_at IS NULL
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            ''', (self.batch_size,))
+            rows = cursor.fetchall()
+            if not rows:
+                conn.rollback()
+                cursor.close()
+                with self._lock:
+                    self._stats["lag_seconds"] = 0.0
+                return 0
+
+            events = [
+                {
+                    "id": row[0],
+                    "type": row[1],
+                    "order_id": row[2],
+                    "payload": json.loads(row[3]) if isinstance(row[3], (str, bytes)) else row[3],
+                    "created_at": row[4].isoformat(),
+                }
+                for row in rows
+            ]
+            for sink in self.sinks:
+                sink.send(events)
+
+            ids = [row[0] for row in rows]
+            cursor.execute(
+                "UPDATE outbox SET dispatched_at = NOW(6) WHERE id IN (%s)" % ','.join(['%s'] * len(ids)),
+                ids
+            )
+            conn.commit()
+            cursor.close()
+
+        with self._lock:
+            self._stats["dispatched"] += len(rows)
+            self._stats["batches"] += 1
+            # Age of the oldest event in the batch, measured on the database clock
+            self._stats["lag_seconds"] = (rows[0][5] or 0) / 1e6
+        return len(rows)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        started_at = stats.pop("started_at")
+        uptime = time.time() - started_at if started_at else 0
+        stats["throughput_per_second"] = stats["dispatched"] / uptime if uptime else 0.0
+        return stats
@@ -0,0 +1,119 @@
+from images import variant_file_ids
+import time
+
+CHUNK_SIZE = 1000
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def delete_products(cursor, product_ids, chunk_size=CHUNK_SIZE):
+    """
+    Delete products with one locking SELECT and one DELETE per chunk of IDs.
+
+    The caller owns the transaction and commits; storage is untouched, so the
+    images can be removed once the rows are gone for good.
+
+    Returns:
+        tuple: (deleted product IDs, missing product IDs, file IDs of the
+        deleted products' images and variants).
+    """
+    product_ids = list(dict.fromkeys(int(product_id) for product_id in product_ids))
+    deleted = []
+    file_ids = []
+    for chunk in _chunks(product_ids, chunk_size):
+        placeholders = ','.join(['%s'] * len(chunk))
+        cursor.execute(f"SELECT id, file_id, image_variants FROM productlist WHERE id IN ({placeholders}) FOR UPDATE",
+                       chunk)
+        rows = cursor.fetchall()
+        if not rows:
+            continue
+        for product_id, file_id, variants in rows:
+            deleted.append(product_id)
+            file_ids.extend(variant_file_ids(variants) or [file_id])
+        found = [row[0] for row in rows]
+        cursor.execute(f"DELETE FROM productlist WHERE id IN ({','.join(['%s'] * len(found))})", found)
+
+    found = set(deleted)
+    missing = [product_id for product_id in product_ids if product_id not in found]
+    return deleted, missing, [file_id for file_id in file_ids if file_id]
+
+
+def delete_files(storage, file_ids, retries=3, backoff=0.5):
+    """
+    Delete files from storage, retrying the ones that fail with exponential backoff.
+
+    ``storage.delete_many`` batches the IDs as the backend allows (100 per call
+    for Cloudinary).
+
+    Returns:
+        tuple: (number deleted, file IDs still not deleted).
+    """
+    pending = list(dict.fromkeys(file_ids))
+    deleted = 0
+    for attempt in range(retries + 1):
+        if not pending:
+            break
+        if attempt:
+            time.sleep(backoff * 2 ** (attempt - 1))
+        try:
+            results = storage.delete_many(pending)
+        except Exception as e:
+            print(f"Error deleting images (attempt {attempt + 1}/{retries + 1}): {e}")
+            continue
+        deleted += sum(1 for ok in results.values() if ok)
+        pending = [file_id for file_id in pending if not results.get(file_id)]
+    return deleted, pending
+
+
+def queue_for_reconciliation(cursor, file_ids, reason):
+    """Record storage deletes that didn't go through, for drain_reconciliation to retry."""
+    if file_ids:
+        cursor.executemany(
+            "INSERT INTO storage_reconciliation (file_id, reason) VALUES (%s, %s)",
+            [(file_id, reason) for file_id in file_ids]
+        )
+
+
+def drain_reconciliation(conn, storage, limit=500):
+    """
+    Retry up to ``limit`` queued storage deletes.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so concurrent runs don't
+    overlap. Successful deletes are marked resolved; failures have their
+    attempt count bumped and stay queued.
+
+    Returns:
+        dict: Counts of resolved and still failing entries.
+    """
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT id, file_id FROM storage_reconciliation
+        WHERE resolved_at IS NULL
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ''', (limit,))
+    rows = cursor.fetchall()
+    if not rows:
+        conn.rollback()
+        cursor.close()
+        return {"resolved": 0, "failed": 0}
+
+    _, failed = delete_files(storage, [row[1] for row in rows], retries=0)
+    failed = set(failed)
+    resolved_ids = [row[0] for row in rows if row[1] not in failed]
+    failed_ids = [row[0] for row in rows if row[1] in failed]
+    if resolved_ids:
+        cursor.execute(
+            "UPDATE storage_reconciliation SET resolved_at = NOW(), attempts = attempts + 1 WHERE id IN (%s)"
+            % ','.join(['%s'] * len(resolved_ids)), resolved_ids)
+    if failed_ids:
+        cursor.execute(
+            "UPDATE storage_reconciliation SET attempts = attempts + 1, last_attempt_at = NOW() WHERE id IN (%s)"
+            % ','.join(['%s'] * len(failed_ids)), failed_ids)
+    conn.commit()
+    cursor.close()
+    return {"resolved": len(resolved_ids), "failed": len(failed_ids)}
@@ -0,0 +1,290 @@
+"""
+Bulk product import and export.
+
+Import reads products from CSV or JSONL, with images either in a ZIP archive
+(referenced by member name in the ``image`` column) or already hosted (an
+``http(s)://`` URL). Images are processed and uploaded concurrently by a
+bounded thread pool, one chunk of rows at a time; the rows are then inserted
+in chunks inside a single transaction. Rows that fail validation or image
+processing are reported and skipped, the rest are imported.
+
+Usage:
+    python product_import.py import products.csv [--images images.zip] [--workers 8]
+    python product_import.py export products.jsonl
+"""
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from images import process_image, upload_variants, primary_image, remove_variants
+from image_uploads import upload_with_retries, READY
+import argparse
+import tempfile
+import shutil
+import json
+import csv
+import io
+import os
+
+IMPORT_FIELDS = ('name', 'price', 'category', 'size', 'description', 'disabledSizes', 'image')
+EXPORT_FIELDS = ('id', 'name', 'price', 'category', 'size', 'description', 'disabledSizes',
+                 'image', 'file_id', 'image_status', 'image_variants')
+INSERT_CHUNK_SIZE = 500
+
+INSERT_SQL = '''INSERT INTO productlist
+                (name, price, category, size, description, disabledSizes, image, file_id, image_variants, image_status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'''
+
+
+class ProductImportError(ValueError):
+    """Raised for an import row that can't be imported."""
+
+
+def detect_format(filename, default="csv"):
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    return default
+
+
+def read_rows(stream, fmt):
+    """
+    Yield ``(row_number, row)`` from a binary CSV (with header) or JSONL stream.
+
+    Unparseable JSONL lines are yielded as ProductImportError instances so they
+    show up in the report instead of aborting the import.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(text), start=2):
+            yield row_number, row
+    elif fmt == "jsonl":
+        for row_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError("expected an object")
+            except ValueError as e:
+                yield row_number, ProductImportError(f"Invalid JSON: {e}")
+                continue
+            yield row_number, row
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+
+def validate_row(row):
+    """
+    Check the same required fields as POST /api/products/new.
+
+    Returns:
+        dict: The row restricted to IMPORT_FIELDS, with ``price`` as a float.
+    """
+    if isinstance(row, ProductImportError):
+        raise row
+    cleaned = {field: (str(row[field]).strip() if row.get(field) not in (None, "") else None)
+               for field in IMPORT_FIELDS}
+    missing = [field for field in ('name', 'price', 'category', 'size', 'image') if not cleaned[field]]
+    if missing:
+        raise ProductImportError(f"Missing required fields: {', '.join(missing)}")
+    try:
+        cleaned['price'] = float(cleaned['price'])
+    except ValueError:
+        raise ProductImportError(f"Invalid price: {cleaned['price']}")
+    return cleaned
+
+
+class ProductImporter:
+    """
+    Imports validated rows, uploading their images with ``workers`` threads.
+
+    Args:
+        storage: Storage backend for the images.
+        archive: Open zipfile.ZipFile holding the images, or None.
+        workers: Concurrent image uploads.
+        chunk_size: Rows read and prepared at a time, and rows per ``executemany`` call.
+    """
+
+    def __init__(self, storage, archive=None, workers=8, chunk_size=INSERT_CHUNK_SIZE, retries=3, backoff=1.0):
+        self.storage = storage
+        self.archive = archive
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.backoff = backoff
+
+    def _prepare(self, item):
+        """Validate one row and store its image; returns (row_number, values, file_ids, error)."""
+        row_number, row = item
+        work_dir = None
+        uploaded = []
+        try:
+            product = validate_row(row)
+            image = product['image']
+            if image.startswith(("http://", "https://")):
+                # Already hosted elsewhere; keep the URL as is
+                image_url, file_id, stored = image, None, None
+            else:
+                if self.archive is None:
+                    raise ProductImportError(f"Image {image} not found: no image archive given")
+                try:
+                    info = self.archive.getinfo(image)
+                except KeyError:
+                    raise ProductImportError(f"Image {image} not found in the archive")
+
+                work_dir = tempfile.mkdtemp(prefix="import-")
+                path = os.path.join(work_dir, "source" + os.path.splitext(image)[1].lower())
+                with self.archive.open(info) as source, open(path, "wb") as target:
+                    shutil.copyfileobj(source, target)
+                _, variants = process_image(path, work_dir)
+
+                def upload(variant_path):
+                    result = upload_with_retries(self.storage, variant_path, self.retries, self.backoff)
+                    uploaded.append(result[1])
+                    return result
+
+                stored = upload_variants(upload, variants)
+                image_url, file_id = primary_image(stored)
+
+            values = (
+                product['name'], product['price'], product['category'], product['size'],
+                product['description'], product['disabledSizes'], image_url, file_id,
+                json.dumps(stored) if stored else None, READY,
+            )
+            return row_number, values, uploaded, None
+        except Exception as e:
+            if uploaded:
+                self.storage.delete_many(uploaded)
+            return row_number, None, [], str(e)
+        finally:
+            if work_dir is not None:
+                remove_variants(work_dir)
+
+    def run(self, conn, rows):
+        """
+        Import ``rows`` (``(row_number, row)`` pairs) over the connection ``conn``.
+
+        All inserts commit together; if the database rejects them, the
+        transaction is rolled back, the uploaded images are deleted and the
+        error is raised.
+
+        Returns:
+            dict: total, imported, failed and per-row ``errors``.
+        """
+        prepared = []
+        errors = []
+        total = 0
+        rows = iter(rows)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="import") as executor:
+            # executor.map submits its whole input up front, so hand it one
+            # chunk of rows at a time rather than the entire upload
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                for row_number, values, uploaded, error in executor.map(self._prepare, chunk):
+                    total += 1
+                    if error:
+                        errors.append({"row": row_number, "error": error})
+                    else:
+                        prepared.append((values, uploaded))
+
+        try:
+            cursor = conn.cursor()
+            for start in range(0, len(prepared), self.chunk_size):
+                chunk = prepared[start:start + self.chunk_size]
+                cursor.executemany(INSERT_SQL, [values for values, _ in chunk])
+            conn.commit()
+            cursor.close()
+        except Exception:
+            conn.rollback()
+            self.storage.delete_many([file_id for _, uploaded in prepared for file_id in uploaded])
+            raise
+
+        return {
+            "total": total,
+            "imported": len(prepared),
+            "failed": len(errors),
+            "errors": errors,
+        }
+
+
+def export_rows(cursor, fmt, flush_every=500):
+    """
+    Stream an executed ``SELECT <EXPORT_FIELDS> FROM productlist`` as CSV or JSONL.
+
+    Yields:
+        str: Chunks of roughly ``flush_every`` rows each.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(EXPORT_FIELDS)
+    count = 0
+    for row in cursor:
+        if writer:
+            writer.writerow(row)
+        else:
+            record = dict(zip(EXPORT_FIELDS, row))
+            if isinstance(record['image_variants'], (str, bytes)):
+                record['image_variants'] = json.loads(record['image_variants'])
+            buffer.write(json.dumps(record, default=str) + "\n")
+        count += 1
+        if count % flush_every == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+EXPORT_SQL = f"SELECT {', '.join(EXPORT_FIELDS)} FROM productlist ORDER BY id"
+
+
+def main(argv=None):
+    import zipfile
+    import time
+    from MySQLdb.cursors import SSCursor
+    from db_pool import connect_from_env
+    from storage import storage_from_config
+
+    parser = argparse.ArgumentParser(description="Bulk product import/export")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--images", help="ZIP archive of the images named in the image column")
+    import_parser.add_argument("--format", choices=("csv", "jsonl"))
+    import_parser.add_argument("--workers", type=int, default=8)
+    export_parser = commands.add_parser("export")
+    export_parser.add_argument("file")
+    export_parser.add_argument("--format", choices=("csv", "jsonl"))
+    args = parser.parse_args(argv)
+
+    conn = connect_from_env()
+    try:
+        if args.command == "import":
+            archive = zipfile.ZipFile(args.images) if args.images else None
+            importer = ProductImporter(storage_from_config(), archive, workers=args.workers)
+            start = time.perf_counter()
+            with open(args.file, "rb") as f:
+                report = importer.run(conn, read_rows(f, args.format or detect_format(args.file)))
+            for error in report["errors"]:
+                print(f"row {error['row']}: {error['error']}")
+            print(f"Imported {report['imported']} of {report['total']} products "
+                  f"in {time.perf_counter() - start:.1f}s ({report['failed']} failed)")
+            if archive:
+                archive.close()
+        else:
+            cursor = conn.cursor(SSCursor)
+            cursor.execute(EXPORT_SQL)
+            with open(args.file, "w", newline="") as f:
+                for chunk in export_rows(cursor, args.format or detect_format(args.file)):
+                    f.write(chunk)
+            cursor.close()
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
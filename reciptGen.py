@@ -1,40 +1,205 @@
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfdoc
 from reportlab.lib import colors
 from reportlab.lib.utils import ImageReader
 from textwrap import wrap
-from io import BytesIO
+from io import BytesIO, RawIOBase
+import threading
+import zipfile
+import copy
+import os
 
-def create_invoice_in_memory(data):
-    pdf_buffer = BytesIO()  # Create an in-memory buffer
-    c = canvas.Canvas(pdf_buffer, pagesize=letter)
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logo.png")
+
+# Bump whenever the rendered layout changes so cached invoices are not reused
+INVOICE_LAYOUT_VERSION = "5"
+
+
+class InvoiceTemplate:
+    """
+    Static layer of the invoice, built once per process and stamped onto every invoice.
+
+    The logo is decoded and compressed into PDF image XObjects a single time. Each
+    document then registers a shallow copy of those objects (the compressed stream
+    is shared) and draws the static elements through named forms, so a request only
+    pays for the variable fields.
+    """
+
+    PAGE_FORM = "invoice_page"
+    DETAILS_FORM = "invoice_details"
+    TABLE_HEADER_FORM = "invoice_table_header"
+    FOOTER_FORM = "invoice_footer"
+    LOGO_NAME = "invoice_logo"
+
+    def __init__(self, logo_path=LOGO_PATH):
+        self.logo_path = logo_path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._logo = None
+        self._logo_mask = None
+
+    def load(self):
+        """Decode the logo into reusable image XObjects (no-op once loaded)."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                logo = pdfdoc.PDFImageXObject(self.LOGO_NAME, ImageReader(self.logo_path), mask='auto')
+                logo_mask = getattr(logo, '_smask', None)
+                if logo_mask is not None:
+                    del logo._smask
+                    logo_mask.name = self.LOGO_NAME + "_mask"
+                    logo.smask = pdfdoc.PDFObjectReference(pdfdoc.xObjectName(logo_mask.name))
+                self._logo, self._logo_mask = logo, logo_mask
+            except Exception as e:
+                print(f"Invoice logo not found. Ensure the logo file is in the specified path: {e}")
+            self._loaded = True
 
-    # Add watermark (faint and centered)
-    logo_path = "logo.png"  # Replace with the actual path to your logo file
-    try:
-        watermark_logo = ImageReader(logo_path)
+    def _register_logo(self, c):
+        # Image XObjects are bound to a single document once referenced, so every
+        # canvas gets its own copy; the encoded image data itself is not copied.
+        # ReportLab has no public API for sharing a decoded image between
+        # documents: this and load() use internals of the version pinned in
+        # requirements.txt, checked by tests/test_reciptGen.py.
+        doc = c._doc
+        if doc.hasForm(self.LOGO_NAME):
+            return
+        doc.addForm(self.LOGO_NAME, copy.copy(self._logo))
+        if self._logo_mask is not None:
+            doc.Reference(copy.copy(self._logo_mask), pdfdoc.xObjectName(self._logo_mask.name))
+
+    def _draw_logo(self, c, x, y, width, height):
         c.saveState()
-        c.setFillAlpha(0.1)  # Make the watermark faint
-        c.drawImage(watermark_logo, 150, 300, width=300, height=300, mask='auto')
+        c.translate(x, y)
+        c.scale(width, height)
+        c.doForm(self.LOGO_NAME)
         c.restoreState()
-    except:
-        print("Watermark logo not found. Ensure the logo file is in the specified path.")
 
-    # Add main logo at the top-left
-    try:
-        main_logo = ImageReader(logo_path)
-        c.drawImage(main_logo, 50, 720, width=100, height=50, mask='auto')
-    except:
-        print("Main logo not found. Ensure the logo file is in the specified path.")
+    def prepare(self, c):
+        """Define the static forms on canvas ``c``; must run before any page content."""
+        self.load()
+        if c.hasForm(self.PAGE_FORM):
+            return
+
+        if self._logo is not None:
+            self._register_logo(c)
+
+        c.beginForm(self.PAGE_FORM)
+        if self._logo is not None:
+            # Add main logo at the top-left
+            self._draw_logo(c, 50, 720, 100, 50)
+
+        # Title
+        c.setFont("Helvetica-Bold", 20)
+        c.drawString(200, 750, "INVOICE")
+        c.endForm()
 
-    # Title
-    c.setFont("Helvetica-Bold", 20)
-    c.drawString(200, 750, "INVOICE")
+        # Customer and Delivery Details headers (first page only)
+        c.beginForm(self.DETAILS_FORM)
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(50, 700, "Customer Details")
+        c.drawString(300, 700, "Delivery Details")
+        c.endForm()
 
-    # Customer and Delivery Details
+        # Table header, drawn relative to y=0 and translated into place
+        c.beginForm(self.TABLE_HEADER_FORM)
+        c.setFillColor(colors.darkblue)
+        c.rect(50, 0, 500, 20, stroke=0, fill=1)
+        c.setFillColor(colors.white)
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(55, 5, "NO.")
+        c.drawString(100, 5, "ITEM")
+        c.drawString(250, 5, "SIZE")
+        c.drawString(350, 5, "UNIT PRICE")
+        c.drawString(450, 5, "TOTAL")
+        c.endForm()
+
+        # Footer. Forms are clipped to the page box, so the bottom line sits at
+        # y=2 to keep its descenders inside it; stamp at the baseline minus 2.
+        c.beginForm(self.FOOTER_FORM)
+        c.setFont("Helvetica", 8)
+        c.drawString(50, 17, "Thank you for choosing D'FOOTPRINT!")
+        c.drawString(50, 2, "We appreciate your support and look forward to serving you again. Walk with style, always!")
+        c.endForm()
+
+    def stamp_page(self, c):
+        """Draw the watermark, logo and title of a page."""
+        if self._logo is not None:
+            # Add watermark (faint and centered). Forms carry no ExtGState of
+            # their own, so the alpha is applied here and the image reused.
+            c.saveState()
+            c.setFillAlpha(0.1)  # Make the watermark faint
+            self._draw_logo(c, 150, 300, 300, 300)
+            c.restoreState()
+        self.stamp(c, self.PAGE_FORM)
+
+    def stamp(self, c, form_name, y=0):
+        """Draw one of the static forms with its origin shifted to ``y``."""
+        c.saveState()
+        c.translate(0, y)
+        c.doForm(form_name)
+        c.restoreState()
+
+
+# Shared by every invoice rendered in this process
+invoice_template = InvoiceTemplate()
+
+
+# Pagination limits: the lowest y a table row may be drawn at, and the lowest y
+# after the last row that still leaves room for the totals block and footer.
+# The totals and footer take TOTALS_HEIGHT below that y; the footer's bottom
+# line must stay clear of the "Page N" label at PAGE_LABEL_Y.
+ROW_HEIGHT = 20
+ROWS_BOTTOM = 80
+PAGE_LABEL_Y = 40
+TOTALS_HEIGHT = 115
+TOTALS_BOTTOM = PAGE_LABEL_Y + 15 + TOTALS_HEIGHT
+CONTINUED_TABLE_TOP = 670
+
+
+def _end_page(c, y, page_number, carried):
+    """Close a page that continues on the next one."""
+    c.setStrokeColor(colors.black)
+    c.line(50, y + 10, 550, y + 10)
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(300, y - 10, "Subtotal carried forward:")
+    c.drawString(450, y - 10, f" NGN{carried:.2f}")
+    c.setFont("Helvetica", 8)
+    c.drawString(50, PAGE_LABEL_Y, f"Page {page_number} - continued on next page")
+    c.showPage()
+
+
+def _start_continued_page(c, data, template, carried, with_table=True):
+    """Open a continuation page and return the y of its first row."""
+    template.stamp_page(c)
     c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, 700, "Customer Details")
-    c.drawString(300, 700, "Delivery Details")
+    c.drawString(50, 700, f"Order ID: {data['id']} (continued)")
+    c.setFont("Helvetica", 10)
+    c.drawString(300, 700, "Subtotal brought forward:")
+    c.drawString(450, 700, f" NGN{carried:.2f}")
+    y = CONTINUED_TABLE_TOP
+    if with_table:
+        template.stamp(c, template.TABLE_HEADER_FORM, y)
+        y -= 30
+    return y
+
+
+def draw_invoice(c, data, template=None):
+    """
+    Draw one invoice onto canvas ``c`` (already prepared by the template).
+
+    Item rows flow onto as many pages as needed. Every continuation page repeats
+    the table header and carries the running subtotal; the totals block and
+    footer appear on the last page only.
+    """
+    template = template or invoice_template
+
+    # Logos, watermark, title and section headers
+    template.stamp_page(c)
+    template.stamp(c, template.DETAILS_FORM)
 
     # Customer Details
     c.setFont("Helvetica", 10)
@@ -43,20 +208,21 @@ def create_invoice_in_memory(data):
     c.drawString(50, 650, f"Phone: {data['number']}")
     c.drawString(50, 635, f"Date: {data['date']}")
 
-    # Delivery Details
-    c.setFont("Helvetica", 10)
-    c.drawString(300, 680, f"Delivery Company: {data['Delivery Company']}")
-    c.drawString(300, 665, f"State: {data['State']}")
-    c.drawString(300, 650, f"Location: {data['Location']}")
-
-    # Handle long pickup address
-    c.setFont("Helvetica", 10)
-    address_lines = wrap(data['Pickup Address'], width=50)
-    c.drawString(300, 635, "Pickup Address:")
+    # Delivery Details (orders loaded from the database have none recorded)
     y = 620
-    for line in address_lines:
-        c.drawString(300, y, line)
-        y -= 15
+    if 'Delivery Company' in data:
+        c.drawString(300, 680, f"Delivery Company: {data['Delivery Company']}")
+        c.drawString(300, 665, f"State: {data['State']}")
+        c.drawString(300, 650, f"Location: {data['Location']}")
+
+        # Handle long pickup address
+        address_lines = wrap(data['Pickup Address'], width=50)
+        c.drawString(300, 635, "Pickup Address:")
+        for line in address_lines:
+            c.drawString(300, y, line)
+            y -= 15
+    else:
+        c.drawString(300, 680, "Not recorded")
 
     # Order Information
     c.setFont("Helvetica-Bold", 12)
@@ -70,30 +236,36 @@ def create_invoice_in_memory(data):
     y -= 50
 
     # Table Header
-    c.setFillColor(colors.darkblue)
-    c.rect(50, y, 500, 20, stroke=0, fill=1)
-    c.setFillColor(colors.white)
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(55, y + 5, "NO.")
-    c.drawString(100, y + 5, "ITEM")
-    c.drawString(250, y + 5, "SIZE")
-    c.drawString(350, y + 5, "UNIT PRICE")
-    c.drawString(450, y + 5, "TOTAL")
+    template.stamp(c, template.TABLE_HEADER_FORM, y)
 
     # Table Data
-    c.setFont("Helvetica", 10)
     y -= 30
+    page_number = 1
+    carried = 0.0
     for i, item in enumerate(data['items'], start=1):
+        if y < ROWS_BOTTOM:
+            _end_page(c, y, page_number, carried)
+            page_number += 1
+            y = _start_continued_page(c, data, template, carried)
+
         # Alternate row colors for readability
         c.setFillColor(colors.whitesmoke if i % 2 == 0 else colors.lightgrey)
         c.rect(50, y, 500, 20, stroke=0, fill=1)
         c.setFillColor(colors.black)
+        c.setFont("Helvetica", 10)
         c.drawString(55, y + 5, str(i))
         c.drawString(100, y + 5, item['name'])
         c.drawString(250, y + 5, item['size'])
         c.drawString(350, y + 5, f" NGN{item['unit_price'] }")
         c.drawString(450, y + 5, f" NGN{item['total'] }")
-        y -= 20
+        carried += float(item['total'])
+        y -= ROW_HEIGHT
+
+    # Move the totals to a fresh page if they would not fit under the last row
+    if y < TOTALS_BOTTOM:
+        _end_page(c, y, page_number, carried)
+        page_number += 1
+        y = _start_continued_page(c, data, template, carried, with_table=False)
 
     # Line Separator
     c.line(50, y + 10, 550, y + 10)
@@ -103,9 +275,10 @@ def create_invoice_in_memory(data):
     c.setFont("Helvetica-Bold", 10)
     c.drawString(350, y, "Subtotal:")
     c.drawString(450, y, f" NGN{data['subtotal'] }")
-    y -= 15
-    c.drawString(350, y, "Tax (10%):")
-    c.drawString(450, y, f" NGN{data['tax'] }")
+    if data.get('tax') is not None:
+        y -= 15
+        c.drawString(350, y, "Tax (10%):")
+        c.drawString(450, y, f" NGN{data['tax'] }")
     y -= 15
     c.setFont("Helvetica-Bold", 12)
     c.drawString(350, y, "Total:")
@@ -113,11 +286,91 @@ def create_invoice_in_memory(data):
 
     # Footer
     y -= 40
-    c.setFont("Helvetica", 8)
-    c.drawString(50, y, "Thank you for choosing D'FOOTPRINT!")
-    c.drawString(50, y - 15, "We appreciate your support and look forward to serving you again. Walk with style, always!")
+    template.stamp(c, template.FOOTER_FORM, y - 17)
+    if page_number > 1:
+        c.setFont("Helvetica", 8)
+        c.drawString(50, PAGE_LABEL_Y, f"Page {page_number}")
+    c.showPage()
+
+
+def create_invoice_in_memory(data, template=None):
+    template = template or invoice_template
+    pdf_buffer = BytesIO()  # Create an in-memory buffer
+    c = canvas.Canvas(pdf_buffer, pagesize=letter)
+    template.prepare(c)
+    draw_invoice(c, data, template)
 
     # Save the PDF to the buffer
     c.save()
     pdf_buffer.seek(0)  # Reset buffer pointer to the beginning
-    return pdf_buffer
\ No newline at end of file
+    return pdf_buffer
+
+
+def write_invoices_pdf(invoices, fileobj, template=None):
+    """
+    Render several invoices into one multi-page PDF written to ``fileobj``.
+
+    ReportLab keeps every finished page of the document until ``save()``, so
+    the memory this takes still grows with the number of invoices; callers
+    cap the batch size.
+
+    Args:
+        invoices: Iterable of invoice data dicts, consumed lazily.
+        fileobj: Writable binary file the PDF is saved to.
+    """
+    template = template or invoice_template
+    c = canvas.Canvas(fileobj, pagesize=letter)
+    template.prepare(c)
+    for data in invoices:
+        draw_invoice(c, data, template)
+    c.save()
+
+
+class _ChunkWriter(RawIOBase):
+    """Unseekable sink that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_invoice_zip(invoices, template=None, render=None):
+    """
+    Stream a ZIP of per-order invoice PDFs.
+
+    Each invoice is rendered, written to the archive and yielded before the next
+    one is read, so only a single PDF is held in memory at a time.
+
+    Args:
+        invoices: Iterable of invoice data dicts, consumed lazily.
+        render: Callable turning invoice data into PDF bytes, e.g. a render
+            pool's; defaults to rendering here with ``template``.
+
+    Yields:
+        bytes: Successive chunks of the ZIP archive.
+    """
+    writer = _ChunkWriter()
+    with zipfile.ZipFile(writer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for data in invoices:
+            if render is None:
+                pdf = create_invoice_in_memory(data, template).getvalue()
+            else:
+                pdf = render(data)
+            archive.writestr(f"Invoice_{data['id']}.pdf", pdf)
+            chunk = writer.drain()
+            if chunk:
+                yield chunk
+    chunk = writer.drain()
+    if chunk:
+        yield chunk
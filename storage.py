@@ -0,0 +1,463 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+import mimetypes
+import threading
+import shutil
+import time
+import uuid
+import os
+
+# Cloudinary renders variants on the fly; variant name -> longest edge in pixels
+CLOUDINARY_VARIANTS = {
+    "thumb": 160,
+    "card": 480,
+    "full": 1600,
+}
+
+
+def _parse_timestamp(value):
+    if not value:
+        return 0.0
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+
+
+class StorageError(Exception):
+    """Raised when a storage backend rejects or fails an operation."""
+
+
+class StorageBackend(ABC):
+    """
+    Base class for image storage backends.
+
+    Subclasses implement the abstract ``_upload``, ``_delete_many``,
+    ``_list_pages`` and ``url_for``, and ``_new_client`` if they hold a client;
+    the public methods time every call so each backend reports its own latency
+    via stats(), and to ``observer(backend, operation, seconds, failed)`` when
+    one is set.
+    Clients are created lazily per process, so a backend inherited across a fork
+    never shares a connection pool with its parent.
+    """
+
+    name = "base"
+
+    def __init__(self, folder="dfootprint", timeout=30):
+        self.folder = folder
+        self.timeout = timeout
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+        self._client = None
+        self._client_pid = None
+        self._client_lock = threading.Lock()
+        self.observer = None
+
+    def _new_client(self):
+        return None
+
+    @abstractmethod
+    def _upload(self, path):
+        """Store the file at ``path``; returns ``(url, file_id)``."""
+
+    @abstractmethod
+    def _delete_many(self, file_ids):
+        """Delete ``file_ids`` (unique, non-empty); returns ``{file_id: deleted}``."""
+
+    @abstractmethod
+    def _list_pages(self, page_size):
+        """Generator of pages of ``(file_id, created_at)`` tuples under ``folder``."""
+
+    @abstractmethod
+    def url_for(self, file_id, variant=None):
+        """Public URL of ``file_id``, optionally of one of its named variants."""
+
+    @property
+    def client(self):
+        if self._client is None or self._client_pid != os.getpid():
+            with self._client_lock:
+                if self._client is None or self._client_pid != os.getpid():
+                    self._client = self._new_client()
+                    self._client_pid = os.getpid()
+        return self._client
+
+    def reinit(self):
+        """Drop the client so the next call builds a fresh one; call after a fork."""
+        with self._client_lock:
+            self._client = None
+            self._client_pid = None
+
+    def _new_file_id(self, path):
+        return f"{self.folder}/{uuid.uuid4().hex}{os.path.splitext(path)[1].lower()}"
+
+    def _timed(self, operation, func, *args):
+        start = time.perf_counter()
+        failed = False
+        try:
+            return func(*args)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                entry = self._stats.setdefault(operation, {
+                    "count": 0, "errors": 0, "seconds_total": 0.0, "seconds_max": 0.0,
+                })
+                entry["count"] += 1
+                entry["errors"] += failed
+                entry["seconds_total"] += elapsed
+                entry["seconds_max"] = max(entry["seconds_max"], elapsed)
+            if self.observer is not None:
+                self.observer(self.name, operation, elapsed, failed)
+
+    def upload(self, path):
+        """
+        Store the file at ``path``.
+
+        Returns:
+            tuple: (url, file_id).
+
+        Raises:
+            StorageError: If the backend did not store the file.
+        """
+        url, file_id = self._timed("upload", self._upload, path)
+        if not url or not file_id:
+            raise StorageError(f"{self.name} returned no URL for {path}")
+        return url, file_id
+
+    def delete(self, file_id):
+        """Delete one file; returns True if it is gone (including already missing)."""
+        return self.delete_many([file_id]).get(file_id, True)
+
+    def delete_many(self, file_ids):
+        """
+        Delete several files in as few calls as the backend allows.
+
+        Returns:
+            dict: file_id -> True if deleted (or already missing), False otherwise.
+        """
+        file_ids = [file_id for file_id in dict.fromkeys(file_ids) if file_id]
+        if not file_ids:
+            return {}
+        return self._timed("delete", self._delete_many, file_ids)
+
+    def list_files(self, page_size=500):
+        """
+        Page through every file in the backend's folder.
+
+        Yields:
+            list: Pages of ``(file_id, created_at)`` tuples, ``created_at`` being
+            a Unix timestamp. Each page is fetched (and timed) lazily.
+        """
+        pages = self._list_pages(page_size)
+        while True:
+            page = self._timed("list", next, pages, None)
+            if page is None:
+                return
+            yield page
+
+    def stats(self):
+        with self._stats_lock:
+            stats = {operation: dict(entry) for operation, entry in self._stats.items()}
+        for entry in stats.values():
+            entry["seconds_mean"] = entry["seconds_total"] / entry["count"] if entry["count"] else 0.0
+        return {"backend": self.name, "operations": stats}
+
+
+class CloudinaryStorage(StorageBackend):
+    """Uploads to a Cloudinary folder; ``file_id`` is the public_id."""
+
+    name = "cloudinary"
+    DELETE_BATCH = 100  # Admin API limit per delete_resources call
+
+    def __init__(self, folder="dfootprint", timeout=30, cloud_name=None, api_key=None, api_secret=None):
+        super().__init__(folder, timeout)
+        import cloudinary
+
+        config = {"cloud_name": cloud_name, "api_key": api_key, "api_secret": api_secret}
+        config = {key: value for key, value in config.items() if value}
+        if config:
+            cloudinary.config(secure=True, **config)
+
+    def _upload(self, path):
+        from cloudinary.uploader import upload as cloudinary_upload
+
+        response = cloudinary_upload(path, folder=self.folder, timeout=self.timeout)
+        return response.get("secure_url"), response.get("public_id")
+
+    def _delete_many(self, file_ids):
+        from cloudinary.api import delete_resources
+
+        results = {}
+        for start in range(0, len(file_ids), self.DELETE_BATCH):
+            chunk = file_ids[start:start + self.DELETE_BATCH]
+            try:
+                deleted = delete_resources(chunk, timeout=self.timeout).get("deleted", {})
+            except Exception as e:
+                print(f"Error deleting from Cloudinary: {e}")
+                deleted = {}
+            for file_id in chunk:
+                results[file_id] = deleted.get(file_id) in ("deleted", "not_found")
+        return results
+
+    def url_for(self, file_id, variant=None):
+        from cloudinary.utils import cloudinary_url
+
+        options = {"secure": True}
+        if variant:
+            options.update(width=CLOUDINARY_VARIANTS[variant], crop="limit", fetch_format="auto", quality="auto")
+        return cloudinary_url(file_id, **options)[0]
+
+    def _list_pages(self, page_size):
+        from cloudinary.api import resources
+
+        next_cursor = None
+        while True:
+            options = {"type": "upload", "prefix": self.folder + "/", "max_results": min(page_size, 500),
+                       "timeout": self.timeout}
+            if next_cursor:
+                options["next_cursor"] = next_cursor
+            response = resources(**options)
+            yield [
+                (resource["public_id"], _parse_timestamp(resource.get("created_at")))
+                for resource in response.get("resources", [])
+            ]
+            next_cursor = response.get("next_cursor")
+            if not next_cursor:
+                return
+
+
+class S3Storage(StorageBackend):
+    """
+    Uploads to an S3-compatible bucket (AWS S3, Backblaze B2, MinIO).
+
+    Requires boto3, an optional dependency left out of requirements.txt: install
+    it on deployments using s3 or b2. storage_from_config checks for it at
+    startup. One client, with its own connection pool, is reused for every call
+    in a process.
+    """
+
+    name = "s3"
+    DELETE_BATCH = 1000  # DeleteObjects limit
+
+    def __init__(self, bucket, folder="dfootprint", timeout=30, endpoint_url=None, region=None,
+                 access_key_id=None, secret_access_key=None, public_url=None, max_connections=10):
+        super().__init__(folder, timeout)
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.max_connections = max_connections
+        if public_url:
+            self.public_url = public_url.rstrip("/")
+        elif endpoint_url:
+            self.public_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.public_url = f"https://{bucket}.s3.amazonaws.com"
+
+    def _new_client(self):
+        import boto3
+        from botocore.config import Config
+
+        return boto3.session.Session().client(
+            "s3",
+            endpoint_url=self.endpoint_url,
+            region_name=self.region,
+            aws_access_key_id=self.access_key_id,
+            aws_secret_access_key=self.secret_access_key,
+            config=Config(
+                connect_timeout=self.timeout,
+                read_timeout=self.timeout,
+                max_pool_connections=self.max_connections,
+                retries={"max_attempts": 3, "mode": "standard"},
+            ),
+        )
+
+    def _upload(self, path):
+        file_id = self._new_file_id(path)
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.client.upload_file(path, self.bucket, file_id, ExtraArgs={"ContentType": content_type})
+        return self.url_for(file_id), file_id
+
+    def _delete_many(self, file_ids):
+        results = {}
+        for start in range(0, len(file_ids), self.DELETE_BATCH):
+            chunk = file_ids[start:start + self.DELETE_BATCH]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": file_id} for file_id in chunk], "Quiet": True},
+                )
+                # Quiet mode only reports failures; deleting a missing key succeeds
+                failed = {error["Key"] for error in response.get("Errors", [])}
+            except Exception as e:
+                print(f"Error deleting from {self.bucket}: {e}")
+                failed = set(chunk)
+            for file_id in chunk:
+                results[file_id] = file_id not in failed
+        return results
+
+    def url_for(self, file_id, variant=None):
+        # Variants are stored as separate objects, each with its own file_id
+        return f"{self.public_url}/{file_id}"
+
+    def _list_pages(self, page_size):
+        paginator = self.client.get_paginator("list_objects_v2")
+        for response in paginator.paginate(Bucket=self.bucket, Prefix=self.folder + "/",
+                                           PaginationConfig={"PageSize": min(page_size, 1000)}):
+            yield [(item["Key"], item["LastModified"].timestamp()) for item in response.get("Contents", [])]
+
+
+class LocalStorage(StorageBackend):
+    """
+    Stores files under a local directory, for development and offline testing.
+
+    ``base_url`` is prefixed to the stored name to build the public URL, so a
+    static file server (or ``file://``) can serve the directory.
+    """
+
+    name = "local"
+
+    def __init__(self, root, base_url=None, folder="dfootprint", timeout=30):
+        super().__init__(folder, timeout)
+        self.root = root
+        self.base_url = (base_url or "file://" + os.path.abspath(root)).rstrip("/")
+
+    def _path(self, file_id):
+        path = os.path.abspath(os.path.join(self.root, file_id))
+        if not path.startswith(os.path.abspath(self.root) + os.sep):
+            raise StorageError(f"Invalid file id: {file_id}")
+        return path
+
+    def _upload(self, path):
+        file_id = self._new_file_id(path)
+        target = self._path(file_id)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(path, target)
+        return self.url_for(file_id), file_id
+
+    def _delete_many(self, file_ids):
+        results = {}
+        for file_id in file_ids:
+            try:
+                os.remove(self._path(file_id))
+                results[file_id] = True
+            except FileNotFoundError:
+                results[file_id] = True
+            except (OSError, StorageError) as e:
+                print(f"Error deleting {file_id}: {e}")
+                results[file_id] = False
+        return results
+
+    def url_for(self, file_id, variant=None):
+        return f"{self.base_url}/{file_id}"
+
+    def _list_pages(self, page_size):
+        base = os.path.abspath(self.root)
+        page = []
+        for directory, _, names in os.walk(os.path.join(base, self.folder)):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    created_at = os.stat(path).st_mtime
+                except FileNotFoundError:
+                    continue
+                page.append((os.path.relpath(path, base).replace(os.sep, "/"), created_at))
+                if len(page) == page_size:
+                    yield page
+                    page = []
+        if page:
+            yield page
+
+
+class FakeStorage(StorageBackend):
+    """
+    Stores nothing and answers after a fixed delay, standing in for a remote
+    backend in benchmarks and load tests. Listing returns what was uploaded.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency=0.0, base_url="https://fake.storage.local", folder="dfootprint", timeout=30):
+        super().__init__(folder, timeout)
+        self.latency = latency
+        self.base_url = base_url.rstrip("/")
+        self._files = {}
+        self._files_lock = threading.Lock()
+
+    def _upload(self, path):
+        time.sleep(self.latency)
+        file_id = self._new_file_id(path)
+        with self._files_lock:
+            self._files[file_id] = time.time()
+        return self.url_for(file_id), file_id
+
+    def _delete_many(self, file_ids):
+        time.sleep(self.latency)
+        with self._files_lock:
+            for file_id in file_ids:
+                self._files.pop(file_id, None)
+        return {file_id: True for file_id in file_ids}
+
+    def url_for(self, file_id, variant=None):
+        return f"{self.base_url}/{file_id}"
+
+    def _list_pages(self, page_size):
+        with self._files_lock:
+            files = list(self._files.items())
+        for start in range(0, len(files), page_size):
+            time.sleep(self.latency)
+            yield files[start:start + page_size]
+
+
+def storage_from_config():
+    """
+    Build the storage backend named by ``STORAGE_BACKEND``: cloudinary (default),
+    s3, b2, local or fake. ``STORAGE_TIMEOUT`` bounds every network call in seconds.
+    """
+    backend = os.getenv("STORAGE_BACKEND", "cloudinary")
+    folder = os.getenv("STORAGE_FOLDER", "dfootprint")
+    timeout = float(os.getenv("STORAGE_TIMEOUT", 30))
+
+    if backend == "cloudinary":
+        return CloudinaryStorage(
+            folder=folder,
+            timeout=timeout,
+            cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+            api_key=os.getenv("CLOUDINARY_API_KEY"),
+            api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+        )
+    if backend in ("s3", "b2"):
+        try:
+            import boto3  # noqa: F401
+        except ImportError:
+            raise StorageError(f"STORAGE_BACKEND={backend} needs boto3, which is not installed: pip install boto3")
+    if backend == "b2":
+        # Backblaze B2 through its S3-compatible API
+        return S3Storage(
+            os.getenv("B2_BUCKET"),
+            folder=folder,
+            timeout=timeout,
+            endpoint_url=os.getenv("B2_ENDPOINT"),
+            access_key_id=os.getenv("B2_KEY_ID"),
+            secret_access_key=os.getenv("B2_APPLICATION_KEY"),
+            public_url=os.getenv("B2_PUBLIC_URL"),
+        )
+    if backend == "s3":
+        return S3Storage(
+            os.getenv("S3_BUCKET"),
+            folder=folder,
+            timeout=timeout,
+            endpoint_url=os.getenv("S3_ENDPOINT_URL"),
+            region=os.getenv("S3_REGION"),
+            public_url=os.getenv("S3_PUBLIC_URL"),
+        )
+    if backend == "local":
+        return LocalStorage(
+            os.getenv("STORAGE_LOCAL_ROOT", "uploads"),
+            base_url=os.getenv("STORAGE_LOCAL_BASE_URL"),
+            folder=folder,
+            timeout=timeout,
+        )
+    if backend == "fake":
+        return FakeStorage(latency=float(os.getenv("STORAGE_FAKE_LATENCY_MS", 0)) / 1000, folder=folder)
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,157 @@
+"""
+Orphaned-image garbage collector.
+
+Finds files in the storage folder that no product references (neither as
+``productlist.file_id`` nor inside ``image_variants``) and deletes them in
+batches. The referenced IDs are held as a sorted array of 8-byte hashes (8
+bytes per product image, searched with bisect), and the storage listing is
+streamed page by page, so memory stays small however large either side gets. Files younger than ``min_age`` are skipped: an upload in flight is stored
+before its row is written.
+
+Usage:
+    python storage_gc.py [--apply] [--min-age 86400] [--batch-size 100] [--rate 2]
+"""
+from images import variant_file_ids
+from bisect import bisect_left
+from array import array
+import argparse
+import hashlib
+import time
+
+
+def file_id_digest(file_id):
+    """64-bit hash used to hold referenced file IDs compactly."""
+    return int.from_bytes(hashlib.blake2b(file_id.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class ReferencedIds:
+    """Sorted, de-duplicated array of file ID digests supporting ``in``."""
+
+    def __init__(self, digests):
+        self._digests = array("Q", sorted(set(digests)))
+
+    def __contains__(self, digest):
+        index = bisect_left(self._digests, digest)
+        return index < len(self._digests) and self._digests[index] == digest
+
+    def __len__(self):
+        return len(self._digests)
+
+
+def load_referenced(conn, page_size=5000):
+    """
+    Hash every file ID referenced by productlist, paging through it by id.
+
+    Returns:
+        ReferencedIds: Digests of the referenced file IDs.
+    """
+    referenced = array("Q")
+    last_id = 0
+    cursor = conn.cursor()
+    while True:
+        cursor.execute('''
+            SELECT id, file_id, image_variants FROM productlist
+            WHERE id > %s
+            ORDER BY id
+            LIMIT %s
+        ''', (last_id, page_size))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        for _, file_id, variants in rows:
+            if file_id:
+                referenced.append(file_id_digest(file_id))
+            for variant_id in variant_file_ids(variants):
+                referenced.append(file_id_digest(variant_id))
+        last_id = rows[-1][0]
+    cursor.close()
+    return ReferencedIds(referenced)
+
+
+def collect_orphans(storage, referenced, dry_run=True, min_age=86400, batch_size=100, rate=2.0,
+                    page_size=500, now=None):
+    """
+    Delete (or, in dry-run mode, only count) unreferenced files.
+
+    Args:
+        storage: Storage backend to scan.
+        referenced: ReferencedIds from load_referenced.
+        dry_run: Report orphans without deleting them.
+        min_age: Seconds a file must exist before it can be collected.
+        batch_size: File IDs per delete_many call.
+        rate: Maximum delete calls per second (0 for no limit).
+
+    Returns:
+        dict: Counts of scanned, referenced, too-new, orphaned, deleted and
+        failed files, plus a sample of orphan IDs.
+    """
+    cutoff = (now or time.time()) - min_age
+    report = {"scanned": 0, "referenced": 0, "too_new": 0, "orphans": 0, "deleted": 0, "failed": 0,
+              "sample": []}
+    pending = []
+    last_call = 0.0
+
+    def flush():
+        nonlocal last_call
+        if rate:
+            wait = last_call + 1.0 / rate - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+        last_call = time.monotonic()
+        results = storage.delete_many(pending)
+        deleted = sum(1 for ok in results.values() if ok)
+        report["deleted"] += deleted
+        report["failed"] += len(pending) - deleted
+        pending.clear()
+
+    for page in storage.list_files(page_size):
+        for file_id, created_at in page:
+            report["scanned"] += 1
+            if file_id_digest(file_id) in referenced:
+                report["referenced"] += 1
+                continue
+            if created_at > cutoff:
+                report["too_new"] += 1
+                continue
+            report["orphans"] += 1
+            if len(report["sample"]) < 20:
+                report["sample"].append(file_id)
+            if not dry_run:
+                pending.append(file_id)
+                if len(pending) == batch_size:
+                    flush()
+    if pending:
+        flush()
+    return report
+
+
+def main(argv=None):
+    from db_pool import connect_from_env
+    from storage import storage_from_config
+
+    parser = argparse.ArgumentParser(description="Delete stored images no product references")
+    parser.add_argument("--apply", action="store_true", help="delete orphans (default is a dry run)")
+    parser.add_argument("--min-age", type=float, default=86400, help="seconds before a file may be collected")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=2.0, help="delete calls per second, 0 for unlimited")
+    args = parser.parse_args(argv)
+
+    conn = connect_from_env()
+    try:
+        referenced = load_referenced(conn)
+    finally:
+        conn.close()
+
+    storage = storage_from_config()
+    start = time.perf_counter()
+    report = collect_orphans(storage, referenced, dry_run=not args.apply, min_age=args.min_age,
+                             batch_size=args.batch_size, rate=args.rate)
+    for file_id in report.pop("sample"):
+        print(f"orphan: {file_id}")
+    print(("" if args.apply else "[dry run] ") +
+          ", ".join(f"{key}={value}" for key, value in report.items()) +
+          f" in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeCursor:
+    """Records statements and answers them from the FakeDB's canned results."""
+
+    def __init__(self, db):
+        self.db = db
+        self.rowcount = 0
+        self.description = None
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        params = tuple(params or ())
+        # MySQLdb interpolates with ``sql % params``; fail the same way it does
+        sql % params
+        sql = " ".join(sql.split())
+        self.db.statements.append((sql, params))
+        rows = self.db.result_for(sql, params)
+        self._rows = list(rows)
+        self.rowcount = len(self._rows) if sql.upper().startswith("SELECT") else max(1, len(self._rows))
+        return self.rowcount
+
+    def executemany(self, sql, seq):
+        for params in seq:
+            self.execute(sql, params)
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def __iter__(self):
+        while self._rows:
+            yield self._rows.pop(0)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self, *args):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        self.db.committed.extend(self.db.statements[len(self.db.committed) + len(self.db.rolled_back):])
+
+    def rollback(self):
+        self.db.rolled_back.extend(self.db.statements[len(self.db.committed) + len(self.db.rolled_back):])
+
+
+class FakeDB:
+    """
+    In-memory stand-in for ``mysql`` in route tests.
+
+    ``results`` maps a regular expression to the rows a matching statement
+    returns; statements are split into ``committed`` and ``rolled_back`` as the
+    route commits or rolls back.
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.committed = []
+        self.rolled_back = []
+        self.results = {}
+        self.connection = FakeConnection(self)
+
+    def result_for(self, sql, params):
+        for pattern, rows in self.results.items():
+            if re.search(pattern, sql):
+                return rows(sql, params) if callable(rows) else rows
+        return []
+
+    def committed_matching(self, pattern):
+        return [(sql, params) for sql, params in self.committed if re.search(pattern, sql)]
+
+
+@pytest.fixture
+def app_module(monkeypatch):
+    pytest.importorskip("MySQLdb")
+    pytest.importorskip("flask_jwt_extended")
+    monkeypatch.setenv("MYSQL_PORT", os.getenv("MYSQL_PORT", "3306"))
+    monkeypatch.setenv("JWT_SECRET_KEY", os.getenv("JWT_SECRET_KEY", "test-secret"))
+    import app
+    return app
+
+
+@pytest.fixture
+def fake_db(app_module, monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(app_module, "mysql", db)
+    return db
+
+
+@pytest.fixture
+def client(app_module, fake_db):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app_module):
+    from flask_jwt_extended import create_access_token
+
+    with app_module.app.app_context():
+        token = create_access_token(identity="admin@example.com")
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,132 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+import auth
+from auth import AdminCache, LoginLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_account_limit_blocks_then_expires(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(auth.time, "monotonic", clock.monotonic)
+    limiter = LoginLimiter(account_limit=3, account_window=60)
+
+    for _ in range(2):
+        limiter.record_failure("10.0.0.1", "admin@example.com")
+    assert limiter.retry_after("10.0.0.1", "admin@example.com") == 0
+
+    limiter.record_failure("10.0.0.1", "admin@example.com")
+    assert limiter.retry_after("10.0.0.2", "admin@example.com") == 61
+
+    clock.now += 30
+    assert limiter.retry_after("10.0.0.2", "admin@example.com") == 31
+
+    clock.now += 30
+    assert limiter.retry_after("10.0.0.2", "admin@example.com") == 0
+
+
+def test_account_key_ignores_case():
+    limiter = LoginLimiter(account_limit=2)
+    limiter.record_failure("10.0.0.1", "Admin@Example.com")
+    limiter.record_failure("10.0.0.2", "admin@example.com")
+    assert limiter.retry_after("10.0.0.3", "ADMIN@example.com") > 0
+
+    limiter.reset("Admin@example.COM")
+    assert limiter.retry_after("10.0.0.3", "admin@example.com") == 0
+
+
+def test_ip_limit_spans_accounts():
+    limiter = LoginLimiter(ip_limit=3, account_limit=100)
+    for i in range(3):
+        limiter.record_failure("10.0.0.1", f"user{i}@example.com")
+    assert limiter.retry_after("10.0.0.1", "new@example.com") > 0
+    assert limiter.retry_after("10.0.0.2", "new@example.com") == 0
+
+
+def test_reset_keeps_ip_counter():
+    limiter = LoginLimiter(ip_limit=2, account_limit=2)
+    limiter.record_failure("10.0.0.1", "admin@example.com")
+    limiter.record_failure("10.0.0.1", "admin@example.com")
+    limiter.reset("admin@example.com")
+    assert limiter.retry_after("10.0.0.1", "other@example.com") > 0
+
+
+def test_counters_stay_bounded():
+    limiter = LoginLimiter(maxsize=10)
+    for i in range(100):
+        limiter.record_failure(f"10.0.{i // 256}.{i % 256}", f"user{i}@example.com")
+    assert all(len(counters) <= 10 for _, _, counters in limiter._limits.values())
+
+
+def test_admin_cache_loads_once_per_email_case_insensitively():
+    cache = AdminCache()
+    calls = []
+
+    def loader(email):
+        calls.append(email)
+        return (1, "admin@example.com", "hash")
+
+    assert cache.get("Admin@Example.com", loader) == (1, "admin@example.com", "hash")
+    assert cache.get("admin@example.com", loader) == (1, "admin@example.com", "hash")
+    assert calls == ["Admin@Example.com"]
+
+    cache.put("ADMIN@example.com", (1, "admin@example.com", "rehashed"))
+    assert cache.get("admin@example.com", loader)[2] == "rehashed"
+
+    cache.invalidate("admin@EXAMPLE.com")
+    cache.get("admin@example.com", loader)
+    assert len(calls) == 2
+
+
+def test_admin_cache_remembers_unknown_emails():
+    cache = AdminCache()
+    calls = []
+
+    def loader(email):
+        calls.append(email)
+        return None
+
+    assert cache.get("nobody@example.com", loader) is None
+    assert cache.get("nobody@example.com", loader) is None
+    assert len(calls) == 1
+
+
+@pytest.fixture
+def login_app(app_module, fake_db, monkeypatch):
+    method = "pbkdf2:sha256:1000"
+    monkeypatch.setattr(app_module, "PASSWORD_HASH_METHOD", method)
+    monkeypatch.setattr(app_module, "login_limiter", LoginLimiter(ip_limit=100, account_limit=3))
+    monkeypatch.setattr(app_module, "admin_cache", AdminCache())
+    fake_db.results[r"FROM admins WHERE email"] = [
+        (1, "admin@example.com", generate_password_hash("right", method=method))]
+    return app_module.app.test_client()
+
+
+def login(client, password):
+    return client.post('/login', json={"email": "admin@example.com", "password": password})
+
+
+def test_login_locks_after_repeated_failures(login_app):
+    for _ in range(3):
+        assert login(login_app, "wrong").status_code == 401
+
+    response = login(login_app, "right")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_successful_login_resets_the_account_counter(login_app):
+    for _ in range(2):
+        assert login(login_app, "wrong").status_code == 401
+    assert "token" in login(login_app, "right").get_json()
+
+    for _ in range(2):
+        assert login(login_app, "wrong").status_code == 401
+    assert login(login_app, "right").status_code == 200
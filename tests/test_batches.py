@@ -0,0 +1,105 @@
+import re
+
+import pytest
+
+from batches import assign_orders, move_orders, BatchError, UNBATCHED
+
+
+class OrdersCursor:
+    """Just enough of a cursor over an in-memory ``{order_id: batch}`` table for batches.py."""
+
+    def __init__(self, orders):
+        self.orders = dict(orders)
+        self.batches = {batch for batch in self.orders.values() if batch}
+        self.statements = []
+        self.rowcount = 0
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        sql % tuple(params)
+        sql = " ".join(sql.split())
+        self.statements.append(sql)
+        if sql.startswith("INSERT IGNORE INTO batches"):
+            self.batches.add(params[0])
+        elif sql.startswith("SELECT order_id, batch FROM orders WHERE order_id IN"):
+            self._rows = [(order_id, self.orders[order_id]) for order_id in params if order_id in self.orders]
+        elif re.match(r"UPDATE orders SET batch = %s WHERE order_id IN", sql):
+            self._update(params[0], lambda order_id, batch: order_id in params[1:])
+        elif sql == "UPDATE orders SET batch = %s WHERE batch IS NULL":
+            self._update(params[0], lambda order_id, batch: batch is None)
+        elif sql == "UPDATE orders SET batch = %s WHERE batch = %s":
+            self._update(params[0], lambda order_id, batch: batch == params[1])
+        else:
+            raise AssertionError(f"unexpected statement: {sql}")
+
+    def _update(self, target, matches):
+        # orders.batch is a foreign key to batches.name
+        assert target is None or target in self.batches
+        changed = [order_id for order_id, batch in self.orders.items() if matches(order_id, batch)]
+        for order_id in changed:
+            self.orders[order_id] = target
+        self.rowcount = len(changed)
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+
+def updates(cursor):
+    return [sql for sql in cursor.statements if sql.startswith("UPDATE")]
+
+
+def test_assign_registers_the_batch_and_updates_in_chunks():
+    cursor = OrdersCursor({f"ORD-{i}": None for i in range(5)})
+    result = assign_orders(cursor, "Batch 1", [f"ORD-{i}" for i in range(5)] + ["ORD-404"], chunk_size=2)
+
+    assert result == {"assigned": 5, "unchanged": 0, "not_found": ["ORD-404"]}
+    assert "Batch 1" in cursor.batches
+    assert set(cursor.orders.values()) == {"Batch 1"}
+    assert len(updates(cursor)) == 3
+
+
+def test_assign_is_idempotent():
+    cursor = OrdersCursor({"ORD-1": "Batch 1", "ORD-2": None})
+    result = assign_orders(cursor, "Batch 1", ["ORD-1", "ORD-2", "ORD-2"])
+
+    assert result == {"assigned": 1, "unchanged": 1, "not_found": []}
+    assert updates(cursor) == ["UPDATE orders SET batch = %s WHERE order_id IN (%s)"]
+
+
+def test_assign_to_unbatched_clears_the_batch():
+    cursor = OrdersCursor({"ORD-1": "Batch 1"})
+    assert assign_orders(cursor, UNBATCHED, ["ORD-1"])["assigned"] == 1
+    assert cursor.orders["ORD-1"] is None
+    assert UNBATCHED not in cursor.batches
+
+
+def test_move_selected_orders_only_from_the_source():
+    cursor = OrdersCursor({"ORD-1": "Batch 1", "ORD-2": "Batch 2", "ORD-3": "Batch 1"})
+    result = move_orders(cursor, "Batch 1", "Batch 3", ["ORD-1", "ORD-2", "ORD-404"])
+
+    assert result == {"moved": 1, "not_found": ["ORD-404"], "not_in_source": ["ORD-2"]}
+    assert cursor.orders == {"ORD-1": "Batch 3", "ORD-2": "Batch 2", "ORD-3": "Batch 1"}
+
+
+def test_move_whole_batch_in_one_statement():
+    cursor = OrdersCursor({"ORD-1": None, "ORD-2": None, "ORD-3": "Batch 1"})
+    assert move_orders(cursor, UNBATCHED, "Batch 2") == {"moved": 2}
+    assert updates(cursor) == ["UPDATE orders SET batch = %s WHERE batch IS NULL"]
+
+    assert move_orders(cursor, "Batch 2", UNBATCHED) == {"moved": 2}
+    assert cursor.orders == {"ORD-1": None, "ORD-2": None, "ORD-3": "Batch 1"}
+
+
+@pytest.mark.parametrize("batch", ["Batch 1", UNBATCHED])
+def test_move_rejects_the_same_batch(batch):
+    with pytest.raises(BatchError):
+        move_orders(OrdersCursor({}), batch, batch)
+
+
+def test_create_batch_rejects_the_unbatched_name(client, fake_db):
+    response = client.post('/api/products/create_batch', json={"batch_name": UNBATCHED, "product_ids": ["ORD-1"]})
+
+    assert response.status_code == 400
+    assert "move_batch" in response.get_json()["message"]
+    assert fake_db.statements == []
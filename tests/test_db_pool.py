@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("MySQLdb")
+
+from db_pool import ConnectionPool, PoolTimeout, _PooledConnection
+
+
+class FakeConnection:
+    def rollback(self):
+        pass
+
+    def ping(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakePool(ConnectionPool):
+    def _open(self):
+        with self._cond:
+            self._stats["created"] += 1
+        return _PooledConnection(FakeConnection())
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def test_reuses_released_connections():
+    pool = FakePool(max_size=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    assert pool.stats()["created"] == 1
+
+
+def test_times_out_when_exhausted():
+    pool = FakePool(max_size=1, wait_timeout=0.05)
+    pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_new_caller_is_not_stranded_behind_a_woken_waiter():
+    # Two quick releases while one thread waits, then a new caller: one
+    # connection is left idle, so nobody should sit out the wait timeout
+    for _ in range(20):
+        pool = FakePool(max_size=2, wait_timeout=3.0)
+        held = [pool.acquire(), pool.acquire()]
+        borrowed = []
+        waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire()))
+        waiter.start()
+        wait_for(lambda: pool._waiting == 1)
+
+        pool.release(held[0])
+        pool.release(held[1])
+        start = time.monotonic()
+        borrowed.append(pool.acquire())
+        waiter.join(timeout=5)
+
+        assert len(borrowed) == 2
+        assert time.monotonic() - start < 1.0
+        assert pool.stats()["timeouts"] == 0
+
+
+def test_waiters_are_all_served_as_connections_return():
+    pool = FakePool(max_size=2, wait_timeout=3.0)
+    held = [pool.acquire(), pool.acquire()]
+    borrowed = []
+    lock = threading.Lock()
+
+    def borrow():
+        pooled = pool.acquire()
+        with lock:
+            borrowed.append(pooled)
+
+    waiters = [threading.Thread(target=borrow) for _ in range(2)]
+    for waiter in waiters:
+        waiter.start()
+    wait_for(lambda: pool._waiting == 2)
+
+    start = time.monotonic()
+    for pooled in held:
+        pool.release(pooled)
+    for waiter in waiters:
+        waiter.join(timeout=5)
+
+    assert len(borrowed) == 2
+    assert time.monotonic() - start < 1.0
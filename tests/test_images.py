@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from images import (
+    process_image, upload_variants, primary_image, variant_file_ids, srcset, remove_variants, check_image,
+    ImageProcessingError,
+)
+
+
+@pytest.fixture
+def variants_dir(tmp_path):
+    out_dir = tmp_path / "variants"
+    out_dir.mkdir()
+    return str(out_dir)
+
+
+def save_image(tmp_path, size, mode="RGB", name="upload.png"):
+    path = tmp_path / name
+    Image.new(mode, size, (200, 10, 10, 128) if mode == "RGBA" else (200, 10, 10)).save(path)
+    return str(path)
+
+
+def fake_upload(path):
+    name = path.rsplit("/", 1)[-1]
+    return f"https://cdn.example.com/{name}", f"products/{name}"
+
+
+def test_process_image_writes_every_variant_and_format(tmp_path, variants_dir):
+    out_dir, variants = process_image(save_image(tmp_path, (3200, 1600)), variants_dir)
+
+    assert out_dir == variants_dir
+    assert {name: (entry["width"], entry["height"]) for name, entry in variants.items()} == {
+        "full": (1600, 800), "card": (480, 240), "thumb": (160, 80),
+    }
+    for entry in variants.values():
+        with Image.open(entry["webp"]) as webp:
+            assert webp.format == "WEBP"
+        with Image.open(entry["jpeg"]) as jpeg:
+            assert jpeg.format == "JPEG"
+            assert jpeg.size == (entry["width"], entry["height"])
+
+
+def test_small_images_are_not_upscaled(tmp_path, variants_dir):
+    _, variants = process_image(save_image(tmp_path, (300, 200)), variants_dir)
+    assert (variants["full"]["width"], variants["card"]["width"], variants["thumb"]["width"]) == (300, 300, 160)
+
+
+def test_transparent_images_are_flattened_for_jpeg(tmp_path, variants_dir):
+    _, variants = process_image(save_image(tmp_path, (100, 100), mode="RGBA"), variants_dir)
+    with Image.open(variants["thumb"]["jpeg"]) as jpeg:
+        assert jpeg.mode == "RGB"
+
+
+def test_unreadable_upload_is_rejected(tmp_path):
+    path = tmp_path / "upload.png"
+    path.write_bytes(b"not an image")
+    with pytest.raises(ImageProcessingError):
+        check_image(str(path))
+    with pytest.raises(ImageProcessingError):
+        process_image(str(path), str(tmp_path))
+
+
+def test_stored_variants_and_srcset(tmp_path, variants_dir):
+    out_dir, variants = process_image(save_image(tmp_path, (2000, 1000)), variants_dir)
+    stored = upload_variants(fake_upload, variants)
+    remove_variants(out_dir)
+
+    assert primary_image(stored) == ("https://cdn.example.com/full.jpg", "products/full.jpg")
+    assert sorted(variant_file_ids(json.dumps(stored))) == sorted(
+        f"products/{name}{ext}" for name in ("full", "card", "thumb") for ext in (".webp", ".jpg"))
+
+    images = srcset(json.dumps(stored))
+    assert images["src"] == "https://cdn.example.com/card.jpg"
+    assert (images["width"], images["height"]) == (1600, 800)
+    assert images["srcset"]["webp"] == ("https://cdn.example.com/thumb.webp 160w, "
+                                        "https://cdn.example.com/card.webp 480w, "
+                                        "https://cdn.example.com/full.webp 1600w")
+
+
+def test_srcset_without_variants():
+    assert srcset(None) is None
+    assert srcset("", fallback="https://cdn.example.com/old.jpg") == {
+        "src": "https://cdn.example.com/old.jpg", "srcset": None,
+    }
+    assert variant_file_ids(None) == []
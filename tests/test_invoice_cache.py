@@ -0,0 +1,36 @@
+import os
+
+from invoice_cache import InvoiceCache
+
+
+def test_key_is_stable_and_versioned():
+    cache = InvoiceCache(version="4")
+    data = {'id': 'ORD-1', 'items': [{'name': 'Slide', 'total': '10.00'}], 'total': '10.00'}
+    reordered = {'total': '10.00', 'items': [{'total': '10.00', 'name': 'Slide'}], 'id': 'ORD-1'}
+
+    assert cache.key_for(data) == cache.key_for(reordered)
+    assert cache.key_for(data) != cache.key_for(dict(data, total='11.00'))
+    assert cache.key_for(data) != InvoiceCache(version="5").key_for(data)
+
+
+def test_memory_is_bounded_by_bytes():
+    cache = InvoiceCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"12345")
+
+    assert cache.get("a") == b"12345"
+    assert cache.get("b") is None
+    # Larger than the whole cache: not kept
+    cache.put("d", b"x" * 11)
+    assert cache.get("d") is None
+
+
+def test_disk_entries_survive_a_new_cache(tmp_path):
+    InvoiceCache(disk_dir=str(tmp_path)).put("abc", b"%PDF-1.4")
+    assert os.listdir(tmp_path) == ["abc.pdf"]
+
+    fresh = InvoiceCache(disk_dir=str(tmp_path))
+    assert fresh.get("abc") == b"%PDF-1.4"
+    assert fresh.get("missing") is None
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("reportlab")
+
+from invoice_pool import InvoiceRenderPool, InvoicePoolFull
+
+INVOICE = {
+    'date': '2024-01-01 10:00:00', 'id': 'ORD-1', 'name': 'Ada Obi', 'email': 'ada@example.com',
+    'number': '08000000000', 'items': [{'name': 'Slide', 'size': '42', 'unit_price': '10.00', 'total': '10.00'}],
+    'subtotal': '10.00', 'tax': None, 'total': '10.00',
+}
+
+
+def test_size_zero_renders_inline():
+    pool = InvoiceRenderPool(max_workers=0)
+    assert pool.render(INVOICE).startswith(b"%PDF-")
+    reservation = pool.reserve()
+    assert reservation.render(INVOICE).startswith(b"%PDF-")
+    reservation.release()
+
+
+def test_full_pool_rejects_renders_and_reservations():
+    pool = InvoiceRenderPool(max_workers=1, max_queue=1)
+    first, second = pool.reserve(), pool.reserve()
+    with pytest.raises(InvoicePoolFull):
+        pool.reserve()
+    with pytest.raises(InvoicePoolFull):
+        pool.render(INVOICE)
+
+    first.release()
+    first.release()  # Releasing twice must not free a second slot
+    third = pool.reserve()
+    with pytest.raises(InvoicePoolFull):
+        pool.reserve()
+    second.release()
+    third.release()
+
+
+def test_renders_in_worker_process():
+    pool = InvoiceRenderPool(max_workers=1, max_queue=1, timeout=60)
+    try:
+        assert pool.render(INVOICE).startswith(b"%PDF-")
+        reservation = pool.reserve()
+        assert reservation.render(INVOICE).startswith(b"%PDF-")
+        reservation.release()
+    finally:
+        pool.shutdown()
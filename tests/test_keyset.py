@@ -0,0 +1,39 @@
+import base64
+from datetime import datetime
+
+import pytest
+
+from keyset import encode_cursor, decode_cursor, CursorError
+
+
+def test_round_trip():
+    cursor = encode_cursor(1, "Batch 1", "2024-01-01 10:00:00", "ORD-1")
+    assert decode_cursor(cursor, 4) == [1, "Batch 1", "2024-01-01 10:00:00", "ORD-1"]
+
+
+def test_cursor_is_url_safe_and_unpadded():
+    cursor = encode_cursor("??>>", "~~~")
+    assert "=" not in cursor
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+def test_non_json_values_are_stringified():
+    cursor = encode_cursor(datetime(2024, 1, 1, 10, 0), None)
+    assert decode_cursor(cursor, 2) == ["2024-01-01 10:00:00", None]
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "!!!", encode_cursor(1, 2)[:-2]])
+def test_garbage_is_rejected(cursor):
+    with pytest.raises(CursorError):
+        decode_cursor(cursor, 2)
+
+
+def test_wrong_size_is_rejected():
+    with pytest.raises(CursorError):
+        decode_cursor(encode_cursor(1, 2, 3), 2)
+
+
+def test_non_list_payload_is_rejected():
+    cursor = base64.urlsafe_b64encode(b'{"a":1}').decode('ascii')
+    with pytest.raises(CursorError):
+        decode_cursor(cursor, 1)
@@ -0,0 +1,43 @@
+import json
+import logging
+
+import pytest
+from flask import Flask
+
+import metrics
+
+
+def test_slow_requests_are_logged_as_warnings(caplog):
+    app = Flask(__name__)
+    metrics.init_app(app, slow_request_seconds=0)
+
+    @app.route('/items/<int:item_id>')
+    def item(item_id):
+        return "ok"
+
+    with caplog.at_level(logging.WARNING, logger="metrics"):
+        app.test_client().get('/items/7')
+
+    [record] = caplog.records
+    assert record.levelno == logging.WARNING
+    event = json.loads(record.getMessage())
+    assert (event["event"], event["route"], event["path"]) == ("slow_request", "/items/<int:item_id>", "/items/7")
+
+
+def test_metrics_route_is_off_without_a_token(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "METRICS_TOKEN", None)
+    assert client.get('/metrics').status_code == 404
+
+
+@pytest.mark.parametrize("header, status", [
+    (None, 401), ("Bearer wrong", 401), ("scrape-secret", 401), ("Bearer scrape-secret", 200),
+])
+def test_metrics_route_needs_the_token(client, app_module, monkeypatch, header, status):
+    monkeypatch.setattr(app_module, "METRICS_TOKEN", "scrape-secret")
+    headers = {"Authorization": header} if header else {}
+
+    response = client.get('/metrics', headers=headers)
+
+    assert response.status_code == status
+    if status == 200:
+        assert b"http_request_duration_seconds" in response.data
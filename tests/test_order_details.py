@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import pytest
+
+from keyset import encode_cursor
+from order_details import (
+    build_details_query, build_invoice_batch_query, build_invoice_batch_count_query, OrderDetailsQueryError,
+)
+
+
+def test_unbounded_query_has_no_limit():
+    sql, params, limit = build_details_query({})
+    assert "LIMIT" not in sql
+    assert params == ()
+    assert limit is None
+
+
+def test_limit_fetches_one_extra_order():
+    sql, params, limit = build_details_query({'limit': '50'})
+    assert "ORDER BY date_created DESC, order_id DESC LIMIT %s) o" in sql
+    assert params == (51,)
+    assert limit == 50
+
+
+def test_cursor_and_date_range():
+    cursor = encode_cursor('2024-01-15 08:00:00', 'ORD-9')
+    sql, params, _ = build_details_query(
+        {'start_date': '2024-01-01', 'end_date': '2024-01-31', 'cursor': cursor, 'limit': '10'})
+    assert sql.count("%s") == len(params)
+    # A bare end date includes that whole day
+    assert params == (datetime(2024, 1, 1), datetime(2024, 2, 1),
+                      '2024-01-15 08:00:00', '2024-01-15 08:00:00', 'ORD-9', 11)
+
+
+@pytest.mark.parametrize("args", [{'limit': '0'}, {'limit': 'x'}, {'start_date': 'yesterday'},
+                                  {'cursor': 'junk'}, {'cursor': encode_cursor(1, 2, 3)}])
+def test_invalid_parameters(args):
+    with pytest.raises(OrderDetailsQueryError):
+        build_details_query(args)
+
+
+def test_invoice_batch_queries_select_the_same_orders():
+    by_ids = build_invoice_batch_query(['ORD-1', 'ORD-2'], 'Batch 1')
+    assert "o.order_id IN (%s,%s)" in by_ids[0] and by_ids[1] == ('ORD-1', 'ORD-2')
+    assert build_invoice_batch_query(batch_name='New Batch')[1] == ()
+    assert "o.batch IS NULL" in build_invoice_batch_query(batch_name='New Batch')[0]
+
+    sql, params = build_invoice_batch_count_query(batch_name='Batch 1')
+    assert sql == "SELECT COUNT(*) FROM orders o WHERE o.batch = %s"
+    assert params == build_invoice_batch_query(batch_name='Batch 1')[1]
+
+
+def normalized(sql):
+    return " ".join(sql.split())
+
+
+def test_routes_run_the_queries_migrate_checks(client, fake_db):
+    import migrate
+
+    fake_db.results[r"^SELECT COUNT\(\*\)"] = [(0,)]
+    checked = {route: normalized(sql) for route, sql, _ in migrate.route_queries()}
+
+    client.get('/api/orders/tracking?order_id=ORD-00000001')
+    client.get('/api/orders/details?limit=50')
+    client.post('/api/orders/invoice/batch', json={"batch_name": "Batch 1", "format": "pdf"}).get_data()
+    executed = [sql for sql, _ in fake_db.statements]
+
+    assert checked["GET /api/orders/tracking"] in executed
+    assert checked["GET /api/orders/details"] in executed
+    assert checked["POST /api/orders/invoice/batch"] in executed
+    assert checked["POST /api/orders/invoice/batch (pdf count)"] in executed
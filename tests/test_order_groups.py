@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+
+from keyset import decode_cursor, encode_cursor
+from order_groups import (
+    parse_group_args, build_count_query, build_pages_query, group_orders, OrderGroupQueryError, MAX_PAGE_SIZE,
+)
+
+
+def order_row(id, status, minute):
+    return (id, f"ORD-{id}", status, None, datetime(2024, 1, 1, 10, minute), None)
+
+
+def test_parse_defaults():
+    assert parse_group_args({}) == (None, 20, None)
+
+
+def test_parse_dedupes_statuses_and_clamps_limit():
+    statuses, limit, after = parse_group_args({'status': 'Pending, Shipped,,Pending', 'limit': '1000'})
+    assert statuses == ['Pending', 'Shipped']
+    assert limit == MAX_PAGE_SIZE
+    assert after is None
+
+
+def test_parse_cursor_needs_single_status():
+    cursor = encode_cursor('2024-01-01 10:00:00', 7)
+    assert parse_group_args({'status': 'Pending', 'cursor': cursor})[2] == ('2024-01-01 10:00:00', 7)
+    with pytest.raises(OrderGroupQueryError):
+        parse_group_args({'status': 'Pending,Shipped', 'cursor': cursor})
+    with pytest.raises(OrderGroupQueryError):
+        parse_group_args({'cursor': cursor})
+
+
+@pytest.mark.parametrize("args", [{'limit': 'ten'}, {'status': 'Pending', 'cursor': 'junk'}])
+def test_parse_rejects_bad_values(args):
+    with pytest.raises(OrderGroupQueryError):
+        parse_group_args(args)
+
+
+def test_count_query_filters_statuses():
+    sql, params = build_count_query(['Pending', 'Shipped'])
+    assert "status IN (%s,%s)" in sql
+    assert params == ('Pending', 'Shipped')
+    assert build_count_query()[1] == ()
+
+
+def test_pages_query_has_one_subquery_per_status():
+    sql, params = build_pages_query(['Pending', 'Shipped'], 20)
+    assert sql.count("UNION ALL") == 1
+    assert sql.count("%s") == len(params)
+    assert params == ('Pending', 21, 'Shipped', 21)
+
+
+def test_pages_query_continues_after_cursor():
+    sql, params = build_pages_query(['Pending'], 20, ('2024-01-01 10:00:00', 7))
+    assert "id < %s" in sql
+    assert params == ('Pending', '2024-01-01 10:00:00', '2024-01-01 10:00:00', 7, 21)
+
+
+def test_group_orders_pages_and_cursors():
+    rows = [order_row(5, 'Pending', 5), order_row(4, 'Pending', 4), order_row(3, 'Pending', 3),
+            order_row(9, 'Shipped', 9)]
+    groups = group_orders(['Pending', 'Shipped', 'Delivered'], {'Pending': 7, 'Shipped': 1}, rows, 2)
+
+    pending, shipped, delivered = groups
+    assert [order['id'] for order in pending['orders']] == [5, 4]
+    assert pending['count'] == 7
+    assert decode_cursor(pending['next_cursor'], 2) == ['2024-01-01 10:04:00', 4]
+    assert shipped['next_cursor'] is None
+    assert shipped['orders'][0]['date_created'] == '2024-01-01 10:09:00'
+    assert delivered == {'status': 'Delivered', 'count': 0, 'orders': [], 'next_cursor': None}
+
+
+def test_orders_route_keeps_the_row_list(client, fake_db):
+    fake_db.results[r"FROM orders WHERE status = %s$"] = [
+        (1, "ORD-1", "Pending", None, datetime(2024, 1, 1, 10, 0), None, None)]
+
+    response = client.get('/orders?status=Pending')
+
+    assert response.status_code == 200
+    assert response.get_json() == [[1, "ORD-1", "Pending", None, "Mon, 01 Jan 2024 10:00:00 GMT", None, None]]
+    assert fake_db.statements[0][1] == ("Pending",)
+
+
+def test_grouped_orders_route(client, fake_db):
+    fake_db.results[r"COUNT\(\*\)"] = [("Pending", 1)]
+    fake_db.results[r"UNION ALL|LIMIT %s\)$"] = [order_row(1, "Pending", 0)]
+
+    response = client.get('/orders/grouped')
+
+    assert response.status_code == 200
+    [group] = response.get_json()["groups"]
+    assert (group["status"], group["count"], group["next_cursor"]) == ("Pending", 1, None)
+    assert group["orders"][0]["order_id"] == "ORD-1"
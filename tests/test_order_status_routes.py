@@ -0,0 +1,40 @@
+def test_manage_products_updates_status_with_outbox_events(client, fake_db):
+    response = client.post('/api/products/manage', json={"product_ids": ["ORD-1", "ORD-2"], "status": "Shipped"})
+
+    assert response.status_code == 200
+    [(outbox_sql, outbox_params)] = fake_db.committed_matching(r"^INSERT INTO outbox")
+    assert "order_id IN (%s,%s)" in outbox_sql
+    assert outbox_params[-3:] == ("ORD-1", "ORD-2", "Shipped")
+    [(update_sql, update_params)] = fake_db.committed_matching(r"^UPDATE orders SET status")
+    assert update_sql == "UPDATE orders SET status = %s WHERE order_id IN (%s,%s)"
+    assert update_params == ("Shipped", "ORD-1", "ORD-2")
+    # The events are read from the rows before they change
+    assert fake_db.committed.index((outbox_sql, outbox_params)) < fake_db.committed.index((update_sql, update_params))
+
+
+def test_manage_products_requires_ids_and_status(client, fake_db):
+    response = client.post('/api/products/manage', json={"product_ids": [], "status": "Shipped"})
+    assert response.status_code == 400
+    assert fake_db.statements == []
+
+
+def test_update_order_writes_outbox_event(client, fake_db, auth_headers):
+    response = client.put('/update-order/7', json={"status": "Delivered"}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(fake_db.committed_matching(r"^INSERT INTO outbox .* WHERE \(id = %s\)")) == 1
+    [(_, params)] = fake_db.committed_matching(r"^UPDATE orders SET status = %s, updated_at = %s WHERE id = %s")
+    assert params[0] == "Delivered" and params[2] == "7"
+
+
+def test_update_order_rolls_back_on_error(client, fake_db, auth_headers):
+    def fail(sql, params):
+        raise RuntimeError("lock wait timeout")
+    fake_db.results[r"^UPDATE orders"] = fail
+
+    response = client.put('/update-order/7', json={"status": "Delivered"}, headers=auth_headers)
+
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "lock wait timeout"}
+    assert fake_db.committed == []
+    assert len(fake_db.rolled_back) == 2
@@ -0,0 +1,98 @@
+import io
+import zipfile
+
+import pytest
+from PIL import Image
+
+from product_import import ProductImporter, read_rows
+from storage import FakeStorage
+
+CSV = b"""name,price,category,size,image
+Mug,9.5,Kitchen,M,mug.png
+Poster,cheap,Decor,L,https://example.com/poster.jpg
+Lamp,30,Decor,S,https://example.com/lamp.jpg
+"""
+
+
+class FakeConnection:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.inserted = []
+        self.committed = False
+        self.rolled_back = False
+
+    def cursor(self):
+        return self
+
+    def executemany(self, sql, rows):
+        if self.fail:
+            raise RuntimeError("duplicate entry")
+        self.inserted.extend(rows)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def archive():
+    image = io.BytesIO()
+    Image.new("RGB", (40, 30), (200, 10, 10)).save(image, "PNG")
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("mug.png", image.getvalue())
+    with zipfile.ZipFile(buffer) as zf:
+        yield zf
+
+
+def test_import_reports_bad_rows_and_inserts_the_rest(archive):
+    storage = FakeStorage()
+    conn = FakeConnection()
+
+    report = ProductImporter(storage, archive, workers=2, chunk_size=2).run(conn, read_rows(io.BytesIO(CSV), "csv"))
+
+    assert report == {"total": 3, "imported": 2, "failed": 1,
+                      "errors": [{"row": 3, "error": "Invalid price: cheap"}]}
+    assert [row[0] for row in conn.inserted] == ["Mug", "Lamp"]
+    assert conn.committed
+
+
+def test_database_failure_rolls_back_and_deletes_the_uploads(archive):
+    storage = FakeStorage()
+    conn = FakeConnection(fail=True)
+
+    with pytest.raises(RuntimeError):
+        ProductImporter(storage, archive, workers=2).run(conn, read_rows(io.BytesIO(CSV), "csv"))
+
+    assert conn.rolled_back and not conn.committed
+    assert storage.stats()["operations"]["upload"]["count"] > 0
+    assert list(storage.list_files()) == []
+
+
+def test_rows_are_read_one_chunk_at_a_time():
+    read = []
+
+    def rows():
+        for i in range(10):
+            read.append(i)
+            yield i, {"name": f"P{i}", "price": "1", "category": "C", "size": "S",
+                      "image": "https://example.com/p.jpg"}
+
+    importer = ProductImporter(FakeStorage(), workers=4, chunk_size=3)
+    prepare = importer._prepare
+    in_flight = []
+
+    def tracking_prepare(item):
+        in_flight.append(len(read) - item[0])
+        return prepare(item)
+
+    importer._prepare = tracking_prepare
+    report = importer.run(FakeConnection(), rows())
+
+    assert report["imported"] == 10
+    assert max(in_flight) <= 3
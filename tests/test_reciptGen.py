@@ -0,0 +1,93 @@
+import io
+import re
+import zipfile
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from reciptGen import (
+    InvoiceTemplate, create_invoice_in_memory, write_invoices_pdf, stream_invoice_zip, invoice_template,
+)
+
+
+def invoice(order_id="ORD-1", items=1, **overrides):
+    data = {
+        'date': '2024-01-01 10:00:00',
+        'id': order_id,
+        'name': 'Ada Obi',
+        'email': 'ada@example.com',
+        'number': '08000000000',
+        'Delivery Company': 'GIG',
+        'State': 'Lagos',
+        'Location': 'Ikeja',
+        'Pickup Address': '12 Allen Avenue, Ikeja',
+        'items': [{'name': f'Slide {i}', 'size': '42', 'unit_price': '1000.00', 'total': '1000.00'}
+                  for i in range(items)],
+        'subtotal': f"{1000 * items:.2f}",
+        'tax': f"{100 * items:.2f}",
+        'total': f"{1100 * items:.2f}",
+    }
+    data.update(overrides)
+    return data
+
+
+def page_count(pdf):
+    # Single-level page tree: the only /Count is the root Pages node's
+    return int(re.search(rb"/Count (\d+)", pdf).group(1))
+
+
+def image_xobjects(pdf):
+    return len(re.findall(rb"/Subtype /Image", pdf))
+
+
+def test_single_item_invoice_is_one_page_with_the_logo():
+    pdf = create_invoice_in_memory(invoice()).getvalue()
+    assert pdf.startswith(b"%PDF-")
+    assert page_count(pdf) == 1
+    # The logo (and its alpha mask, if any) is embedded once and drawn through a form
+    assert image_xobjects(pdf) in (1, 2)
+
+
+def test_long_invoice_flows_onto_more_pages():
+    pdf = create_invoice_in_memory(invoice(items=60)).getvalue()
+    assert page_count(pdf) == 3
+    assert image_xobjects(pdf) in (1, 2)
+
+
+def test_batch_pdf_shares_the_logo_across_invoices():
+    pdf_file = io.BytesIO()
+    write_invoices_pdf([invoice("ORD-1"), invoice("ORD-2", items=30), invoice("ORD-3", tax=None)], pdf_file)
+    pdf = pdf_file.getvalue()
+    assert page_count(pdf) == 4
+    assert image_xobjects(pdf) in (1, 2)
+
+
+def test_invoice_without_delivery_details_or_tax_renders():
+    data = invoice(tax=None)
+    for key in ('Delivery Company', 'State', 'Location', 'Pickup Address'):
+        del data[key]
+    assert page_count(create_invoice_in_memory(data).getvalue()) == 1
+
+
+def test_zip_holds_one_pdf_per_invoice():
+    archive = b"".join(stream_invoice_zip([invoice("ORD-1"), invoice("ORD-2", items=40)]))
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        assert zf.namelist() == ["Invoice_ORD-1.pdf", "Invoice_ORD-2.pdf"]
+        assert page_count(zf.read("Invoice_ORD-2.pdf")) == 2
+
+
+def test_missing_logo_still_renders(tmp_path):
+    template = InvoiceTemplate(logo_path=str(tmp_path / "missing.png"))
+    pdf = create_invoice_in_memory(invoice(), template).getvalue()
+    assert page_count(pdf) == 1
+    assert image_xobjects(pdf) == 0
+
+
+def test_template_renders_the_same_invoice_identically():
+    invoice_template.load()
+    first = create_invoice_in_memory(invoice()).getvalue()
+    second = create_invoice_in_memory(invoice()).getvalue()
+    # Only the creation timestamp and document id may differ
+    strip = re.compile(rb"/(CreationDate|ModDate) \([^)]*\)|/ID\s*\[[^\]]*\]")
+    assert strip.sub(b"", first) == strip.sub(b"", second)
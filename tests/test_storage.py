@@ -0,0 +1,83 @@
+import sys
+
+import pytest
+
+from storage import StorageBackend, StorageError, FakeStorage, LocalStorage, storage_from_config
+
+
+@pytest.fixture
+def upload_file(tmp_path):
+    path = tmp_path / "photo.JPG"
+    path.write_bytes(b"jpeg")
+    return str(path)
+
+
+def test_backend_must_implement_the_whole_interface():
+    class Partial(StorageBackend):
+        def _upload(self, path):
+            return "url", "id"
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_fake_storage_upload_list_delete(upload_file):
+    storage = FakeStorage(folder="products")
+    url, file_id = storage.upload(upload_file)
+
+    assert file_id.startswith("products/") and file_id.endswith(".jpg")
+    assert url == f"https://fake.storage.local/{file_id}"
+    assert [file_id for page in storage.list_files() for file_id, _ in page] == [file_id]
+
+    assert storage.delete_many([file_id, file_id, None]) == {file_id: True}
+    assert storage.delete("products/missing.jpg") is True
+    assert list(storage.list_files()) == []
+
+    stats = storage.stats()["operations"]
+    assert stats["upload"]["count"] == 1
+    assert stats["delete"]["count"] == 2
+
+
+def test_fake_storage_lists_in_pages(upload_file):
+    storage = FakeStorage()
+    for _ in range(5):
+        storage.upload(upload_file)
+    assert [len(page) for page in storage.list_files(page_size=2)] == [2, 2, 1]
+
+
+def test_observer_sees_every_call(upload_file):
+    storage = FakeStorage()
+    calls = []
+    storage.observer = lambda backend, operation, seconds, failed: calls.append((backend, operation, failed))
+    storage.upload(upload_file)
+    assert calls == [("fake", "upload", False)]
+
+
+def test_local_storage_round_trip(tmp_path, upload_file):
+    storage = LocalStorage(str(tmp_path / "bucket"), base_url="http://static.local/")
+    url, file_id = storage.upload(upload_file)
+
+    assert url == f"http://static.local/{file_id}"
+    assert (tmp_path / "bucket" / file_id).read_bytes() == b"jpeg"
+    assert [file_id for page in storage.list_files() for file_id, _ in page] == [file_id]
+    assert storage.delete(file_id) is True
+    assert not (tmp_path / "bucket" / file_id).exists()
+
+
+def test_local_storage_rejects_paths_outside_its_root(tmp_path):
+    storage = LocalStorage(str(tmp_path / "bucket"))
+    assert storage.delete_many(["../outside.jpg"]) == {"../outside.jpg": False}
+
+
+@pytest.mark.parametrize("backend", ["s3", "b2"])
+def test_s3_backends_need_boto3(monkeypatch, backend):
+    monkeypatch.setenv("STORAGE_BACKEND", backend)
+    monkeypatch.setitem(sys.modules, "boto3", None)
+    with pytest.raises(StorageError, match="boto3"):
+        storage_from_config()
+
+
+def test_unknown_backend(monkeypatch):
+    monkeypatch.setenv("STORAGE_BACKEND", "ftp")
+    with pytest.raises(ValueError):
+        storage_from_config()
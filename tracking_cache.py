@@ -0,0 +1,38 @@
+from cachetools import TTLCache
+import threading
+import hashlib
+
+
+class TrackingCache:
+    """
+    Short-TTL cache of serialized order tracking responses, keyed by order ID.
+
+    Status-update routes invalidate the orders they touch; the TTL bounds how
+    stale other workers' copies can get. Unknown order IDs are cached too, so
+    repeated polling of a bad ID doesn't reach the database either.
+    """
+
+    def __init__(self, maxsize=10000, ttl=10):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, order_id):
+        """Return the cached ``(body, etag)``, ``(None, None)`` for a cached miss, or None."""
+        with self._lock:
+            return self._cache.get(order_id)
+
+    def put(self, order_id, body):
+        """Cache ``body`` (bytes, or None for an unknown order) and return its entry."""
+        entry = (body, hashlib.sha1(body).hexdigest() if body is not None else None)
+        with self._lock:
+            self._cache[order_id] = entry
+        return entry
+
+    def invalidate(self, order_ids):
+        with self._lock:
+            for order_id in order_ids:
+                self._cache.pop(order_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()